@@ -0,0 +1,103 @@
+"""拠点数を変化させて, グラフの保持に使用するメモリ量とレーン集合の検索時間をcsvファイルに書き込む
+
+`Graph` と `ArrayGraph` で同じグラフを保持し, `tracemalloc` で計測したメモリ量を比較する.
+`ArrayGraph` は索引を作成する前の列配列のみの状態で計測する.
+また, 最適化モデルの構築で多用される, レーン集合に対する所属判定の時間も計測する
+
+書き込む内容:
+    * 拠点数
+    * レーン数
+    * グラフのクラス名
+    * 使用メモリ量(バイト)
+    * レーン数あたりの使用メモリ量(バイト)
+    * レーン数あたりのレーン集合への所属判定時間(ナノ秒)
+"""
+import os
+import csv
+import time
+import tracemalloc
+
+from tqdm import tqdm
+
+from .utils.config_util import read_config
+from .input_data.graph import Graph
+from .input_data.array_graph import ArrayGraph
+from .input_data.input_data_maker import InputDataMaker
+from .logger.logger import setup_logger
+
+
+path_data = read_config().get("PATH_DATA")
+
+# 計算結果を書き込むcsvファイル名
+file_name = f"{path_data}result/calc_memory_of_graph.csv"
+
+# 拠点数の入力の設定
+lst_num_base = [
+    10, 20, 50,
+    100,
+    200,
+    # 500
+]
+
+columns = [
+    "n", "m", "graph_class", "memory", "memory_by_lane",
+    "time_membership_by_lane_ns"
+]
+
+
+def measure_memory(func):
+    """関数を実行し, 出力と実行後に確保されたままのメモリ量を出力"""
+    tracemalloc.start()
+    output = func()
+    memory, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return output, memory
+
+
+def measure_membership(aGraph) -> float:
+    """全てのレーンについてレーン集合への所属判定を行い, レーンあたりの秒数を出力"""
+    set_lane = aGraph.lanes()
+    lst_lane = list(set_lane)
+    start = time.perf_counter()
+    for lane in lst_lane:
+        _ = lane in set_lane
+    return (time.perf_counter() - start) / len(lst_lane)
+
+
+def main():
+    # set up
+    logger = setup_logger(os.path.basename(__file__)[:-3])
+    # logging の際に表示する文字列
+    name_running = "Calculation of memory of graph"
+    logger.info(f"{name_running} start.")
+
+    with open(file_name, "w") as f:
+        writer = csv.writer(f, lineterminator='\n')
+        writer.writerow(columns)
+
+        for num_base in tqdm(lst_num_base):
+            logger.info(f"Num base is {num_base}:")
+            aGraph, memory_graph = measure_memory(
+                lambda: InputDataMaker(num_base).run(Graph())
+            )
+            anArrayGraph, memory_array_graph = measure_memory(
+                lambda: ArrayGraph.from_graph(aGraph)
+            )
+            num_lane = len(aGraph.lanes())
+
+            for graph, memory in (
+                (aGraph, memory_graph), (anArrayGraph, memory_array_graph)
+            ):
+                name_class = graph.__class__.__name__
+                logger.info(f"Memory of {name_class} : {memory}B")
+                writer.writerow([
+                    num_base, num_lane, name_class,
+                    memory, round(memory / num_lane, 1),
+                    round(measure_membership(graph) * 1e9, 1)
+                ])
+
+    logger.info(f"{name_running} end.")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,124 @@
+"""拠点数を変化させてモデル構築にかかる時間をcsvファイルに書き込む
+
+求解は行わず, 定数・決定変数・目的関数・制約の設定時間のみ計測する.
+レーン数あたりの構築時間も書き込むため, 拠点数を増やした際に構築時間が
+レーン数にほぼ比例しているか確認できる.
+また, モデルを構築する planner ごとに計測し, 構築方法による時間の違いを比較する
+
+書き込む内容:
+    * 拠点数
+    * レーン数
+    * planner のクラス名
+    * 定数の設定時間
+    * 決定変数の設定時間
+    * 目的関数の設定時間
+    * 制約の設定時間
+    * 構築時間の合計
+    * レーン数あたりの構築時間(マイクロ秒)
+
+構築手順(決定変数, 目的関数, 制約のメソッド)ごとの実行時間と,
+追加された制約・変数の数は別のcsvファイルに書き込む
+"""
+import os
+import csv
+import time
+import itertools
+
+from tqdm import tqdm
+
+from .utils.config_util import read_config
+from .input_data.graph import Graph
+from .logistics_planner.logistics_planner import LogisticsPlanner
+from .logistics_planner.batch_logistics_planner import BatchLogisticsPlanner
+from .input_data.input_data_maker import InputDataMaker
+from .logger.logger import setup_logger
+
+
+path_data = read_config().get("PATH_DATA")
+
+# 計算結果を書き込むcsvファイル名
+file_name = f"{path_data}result/calc_time_building_model.csv"
+file_name_by_step = f"{path_data}result/calc_time_building_model_by_step.csv"
+
+# 拠点数の入力の設定
+lst_num_base = [
+    100,
+    200,
+    500
+]
+
+# モデルを構築する planner の設定
+lst_planner_class = [LogisticsPlanner, BatchLogisticsPlanner]
+
+columns = [
+    "n", "m", "planner",
+    "time_setting_constants", "time_setting_variables",
+    "time_setting_objective", "time_setting_constraints",
+    "time_building", "time_building_by_lane_us"
+]
+columns_by_step = [
+    "n", "m", "planner", "step", "kind", "time_step", "num_rows", "num_columns"
+]
+
+
+def measure(func) -> float:
+    """関数を実行し, かかった秒数を出力"""
+    start = time.perf_counter()
+    func()
+    return time.perf_counter() - start
+
+
+def main():
+    # set up
+    logger = setup_logger(os.path.basename(__file__)[:-3])
+    # logging の際に表示する文字列
+    name_running = "Calculation of building model time"
+    logger.info(f"{name_running} start.")
+
+    with open(file_name, "w") as f, open(file_name_by_step, "w") as f_step:
+        writer = csv.writer(f, lineterminator='\n')
+        writer.writerow(columns)
+        writer_by_step = csv.writer(f_step, lineterminator='\n')
+        writer_by_step.writerow(columns_by_step)
+
+        for num_base, planner_class in tqdm(
+            list(itertools.product(lst_num_base, lst_planner_class))
+        ):
+            name_planner = planner_class.__name__
+            logger.info(f"Num base is {num_base}, planner is {name_planner}:")
+            # `set_constants` でグラフに物量が追加されるため, planner ごとに作成する
+            aGraph = InputDataMaker(num_base).run(Graph())
+            num_lane = len(aGraph.lanes())
+
+            anOptimizer = planner_class()
+            elapsed_constants = measure(
+                lambda: anOptimizer.set_constants(aGraph)
+            )
+            elapsed_variables = measure(anOptimizer.set_decision_variables)
+            elapsed_objective = measure(anOptimizer.set_objective_function)
+            elapsed_constraints = measure(anOptimizer.set_constraints)
+            elapsed_building = (
+                elapsed_constants + elapsed_variables
+                + elapsed_objective + elapsed_constraints
+            )
+            logger.info(f"Time of building model : {elapsed_building:.2f}s")
+
+            writer.writerow([
+                num_base, num_lane, name_planner,
+                round(elapsed_constants, 2), round(elapsed_variables, 2),
+                round(elapsed_objective, 2), round(elapsed_constraints, 2),
+                round(elapsed_building, 2),
+                round(elapsed_building / num_lane * 1e6, 2)
+            ])
+            for record in anOptimizer.build_step_records:
+                writer_by_step.writerow([
+                    num_base, num_lane, name_planner,
+                    record.name, record.kind, round(record.elapsed_time, 4),
+                    record.num_rows, record.num_columns
+                ])
+
+    logger.info(f"{name_running} end.")
+
+
+if __name__ == "__main__":
+    main()
@@ -1,6 +1,9 @@
-"""拠点数を変化させて最適性と計算時間をcsvファイルに書き込む
+"""拠点数とレーンの張り方を変化させて最適性と計算時間をcsvファイルに書き込む
+
+完全グラフに加え, 実際のネットワークに近い疎な張り方でも拠点数に対する計算時間の増え方を測る
 
 書き込む内容:
+    * レーンの張り方
     * 拠点数
     * レーン数
     * 入力の作成にかかった時間
@@ -13,13 +16,17 @@
 import os
 import csv
 import time
+import itertools
 
 from tqdm import tqdm
 
 from .utils.config_util import read_config
 from .input_data.graph import Graph
-from .optimizer.logistics_planner import LogisticsPlanner
-from .input_data.input_data_maker import InputDataMaker
+from .logistics_planner.logistics_planner import LogisticsPlanner
+from .input_data.input_data_maker import (
+    ArrayInputDataMaker, topology_complete, topology_knn, topology_hub,
+    topology_echelon
+)
 from .logger.logger import setup_logger
 
 
@@ -37,9 +44,16 @@ lst_num_base = [
     # 500
 ]
 
+# レーンの張り方の設定
+lst_topology = [
+    topology_complete, topology_knn, topology_hub, topology_echelon
+]
+
 
 def write_result_to_csv(
+    topology: str,
     num_base: int,
+    num_lane: int,
     time_making_input: float,
     time_setting_constants: float,
     time_setting_objective: float,
@@ -50,13 +64,10 @@ def write_result_to_csv(
 ):
     """計算結果をcsvファイルに追記する"""
     with open(file_name, "a") as f:
-        # レーン数の取得
-        num_lane = num_base**2
-
         # 改行コード（\n）を指定
         writer = csv.writer(f, lineterminator='\n')
         columns = [
-            num_base, num_lane,
+            topology, num_base, num_lane,
             time_making_input, time_setting_constants,
             time_setting_variables, time_setting_objective,
             time_setting_constraints, time_optimization,
@@ -80,7 +91,7 @@ def main():
         # 改行コード（\n）を指定
         writer = csv.writer(f, lineterminator='\n')
         writer.writerow([
-            "n", "m",
+            "topology", "n", "m",
             "time_making_input", "time_setting_constants",
             "time_setting_variables", "time_setting_objective",
             "time_setting_constraints", "time_optimization",
@@ -88,11 +99,15 @@ def main():
         ])
 
     # 各拠点数に対して入力を作成し, 最適化
-    for num_base in tqdm(lst_num_base):
-        logger.info(f"Num base is {num_base}:")
+    for topology, num_base in tqdm(
+        list(itertools.product(lst_topology, lst_num_base))
+    ):
+        logger.info(f"Topology is {topology}, num base is {num_base}:")
         # 拠点・レーンの作成
         start = time.time()
-        aGraph = InputDataMaker(num_base).run(Graph())
+        aGraph = ArrayInputDataMaker(num_base, topology=topology).run(
+            Graph()
+        )
         elapsed_making_input = round(time.time() - start, 2)
         logger.info(f"Time of making input : {elapsed_making_input}s")
 
@@ -133,7 +148,8 @@ def main():
 
         # 結果を書き込み
         write_result_to_csv(
-            num_base, elapsed_making_input, elapsed_setting_constants,
+            topology, num_base, len(aGraph.lanes()),
+            elapsed_making_input, elapsed_setting_constants,
             elapsed_setting_variables, elapsed_setting_variables,
             elapsed_setting_constraint, elapsed_optimization,
             anOptimizer.result_status
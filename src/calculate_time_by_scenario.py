@@ -0,0 +1,236 @@
+"""拠点数・乱数の種・レーンの張り方・ソルバー・パラメータの組・解き方ごとに, 計算時間をcsvファイルに書き込む
+
+組の1つをシナリオとし, 入力の作成から求解までをプロセスプールで並列に実行する.
+1つのマシンで大きなパラメータの組み合わせを夜間にまとめて計算することを想定している
+
+Example:
+    $ python -m src.calculate_time_by_scenario 4 2
+        4プロセスで, 各プロセスのソルバーは2スレッドで計算する
+
+    引数を省略した場合, スレッド数は1, プロセス数は CPU 数をスレッド数で割った値とする
+
+書き込む内容:
+    * レーンの張り方
+    * 拠点数
+    * 乱数の種
+    * ソルバー名
+    * パラメータの組の名前
+    * 解き方. 1つのモデルとして解くか, Benders 分解で解くか
+    * レーン数
+    * 入力の作成時間
+    * 構築時間
+    * 求解時間
+    * ギャップが `target_gap` 以下になるまでの時間. 達しなければ空
+    * 最適性
+    * 目的関数値
+
+Note:
+    * 結果はシナリオの計算が終わった順に書き込むため, 途中で止めてもそれまでの結果は残る
+    * ソルバーのログは全てのプロセスで同じ `logs/{ソルバー名}.log` に追記される
+    * Benders 分解は CPLEX でのみ解けるため, HiGHS との組み合わせは計算しない
+"""
+import os
+import sys
+import csv
+import time
+import dataclasses
+import itertools
+from concurrent.futures import ProcessPoolExecutor, as_completed
+
+from tqdm import tqdm
+
+from .utils.config_util import read_config
+from .input_data.graph import Graph
+from .input_data.input_data_maker import (
+    ArrayInputDataMaker, topology_complete, topology_knn
+)
+from .optimizer.optimization_parameters import OptimizationParameters
+from .optimizer.solver_backend import solver_cplex, solver_highs
+from .logistics_planner.logistics_planner import LogisticsPlanner
+from .logistics_planner.batch_logistics_planner import BatchLogisticsPlanner
+from .calculate_time_by_solver import measure, build
+from .logger.logger import setup_logger
+
+
+path_data = read_config().get("PATH_DATA")
+
+# 計算結果を書き込むcsvファイル名
+file_name = f"{path_data}result/calc_time_by_scenario.csv"
+
+# シナリオの設定. 全ての組み合わせを計算する
+lst_num_base = [10, 20, 50]
+lst_random_seed = [71, 1, 2]
+lst_topology = [topology_complete, topology_knn]
+lst_solver = [solver_cplex, solver_highs]
+# パラメータの組の名前と, config ファイルのパラメータから上書きする値
+dct_parameters = {
+    "default": {},
+    "gap_1pct": {"MIP_GAP": 1e-2},
+}
+# 解き方. 1つのモデルとして解くか, Benders 分解で解くか
+mode_monolithic = "monolithic"
+mode_benders = "benders"
+lst_mode = [mode_monolithic, mode_benders]
+
+# 到達するまでの時間を比較するギャップ
+target_gap = 1e-2
+
+columns = [
+    "topology", "n", "seed", "solver", "parameters", "mode", "m",
+    "time_making_input", "time_building", "time_solving",
+    "time_to_target_gap", "result_status", "objective_value"
+]
+
+
+@dataclasses.dataclass(frozen=True)
+class Scenario:
+    """1回の計算で使用する入力とソルバー・パラメータの組
+
+    Attributes:
+        num_base: 拠点数
+        random_seed: 入力を作成する際の乱数の種
+        topology: レーンの張り方
+        solver: ソルバー名
+        parameters_name: `dct_parameters` のパラメータの組の名前
+        mode: 解き方. `lst_mode` のいずれか
+    """
+    num_base: int
+    random_seed: int
+    topology: str
+    solver: str
+    parameters_name: str
+    mode: str = mode_monolithic
+
+    def parameters(
+        self, anOptimizeParameters: OptimizationParameters, num_threads: int
+    ) -> OptimizationParameters:
+        """シナリオのソルバー・パラメータの組と, プロセスごとのスレッド数で上書きしたパラメータ"""
+        return dataclasses.replace(
+            anOptimizeParameters, SOLVER=self.solver, NUM_THREADS=num_threads,
+            **dct_parameters[self.parameters_name]
+        )
+
+    def is_valid(self) -> bool:
+        """計算できる組み合わせか否か. Benders 分解は CPLEX でのみ解ける"""
+        return self.mode != mode_benders or self.solver == solver_cplex
+
+    def make_optimizer(
+        self, anOptimizeParameters: OptimizationParameters
+    ) -> LogisticsPlanner:
+        """解き方に応じた planner. 求解中の暫定解と下界の推移を記録する"""
+        anOptimizer = BatchLogisticsPlanner(
+            anOptimizeParameters, is_benders=self.mode == mode_benders
+        )
+        anOptimizer.record_convergence()
+        return anOptimizer
+
+
+def make_scenarios() -> list[Scenario]:
+    """設定した全ての組み合わせのうち, 計算できるシナリオ"""
+    scenarios = (
+        Scenario(*values) for values in itertools.product(
+            lst_num_base, lst_random_seed, lst_topology, lst_solver,
+            dct_parameters, lst_mode
+        )
+    )
+    return [aScenario for aScenario in scenarios if aScenario.is_valid()]
+
+
+def run_scenario(
+    aScenario: Scenario, anOptimizeParameters: OptimizationParameters
+) -> list:
+    """1つのシナリオの入力を作成して求解し, 書き込む1行を出力
+
+    プロセスプールの各プロセスで実行するため, 入力の作成もプロセスの中で行う
+    """
+    start = time.perf_counter()
+    aGraph = ArrayInputDataMaker(
+        aScenario.num_base, random_seed=aScenario.random_seed,
+        topology=aScenario.topology
+    ).run(Graph())
+    elapsed_making_input = time.perf_counter() - start
+    anOptimizer = aScenario.make_optimizer(anOptimizeParameters)
+    elapsed_building = measure(lambda: build(anOptimizer, aGraph))
+    row = [
+        aScenario.topology, aScenario.num_base, aScenario.random_seed,
+        aScenario.solver, aScenario.parameters_name, aScenario.mode,
+        len(aGraph.lanes()),
+        round(elapsed_making_input, 2), round(elapsed_building, 2)
+    ]
+    # CPLEX の Community Edition ではモデルの大きさに上限があり求解できないため,
+    # エラーとなったことを書き込む
+    try:
+        elapsed_solving = measure(anOptimizer.solve)
+    except Exception as e:
+        return row + [None, None, type(e).__name__, None]
+
+    objective_value = None
+    if anOptimizer.is_opt_or_feasible():
+        objective_value = anOptimizer.solution.get_objective_value()
+    time_to_target_gap = anOptimizer.convergence_history.time_to_gap(
+        target_gap
+    )
+    if time_to_target_gap is not None:
+        time_to_target_gap = round(time_to_target_gap, 2)
+    return row + [
+        round(elapsed_solving, 2), time_to_target_gap,
+        anOptimizer.result_status, objective_value
+    ]
+
+
+def main(max_workers: int | None = None, threads_by_worker: int = 1):
+    """全てのシナリオをプロセスプールで計算し, 終わった順に書き込む
+
+    Args:
+        max_workers: プロセス数. None ならば CPU 数をスレッド数で割った値
+        threads_by_worker: 各プロセスのソルバーが使用するスレッド数
+    """
+    # set up
+    logger = setup_logger(os.path.basename(__file__)[:-3])
+    # logging の際に表示する文字列
+    name_running = "Calculation of scenarios in parallel"
+    logger.info(f"{name_running} start.")
+
+    if max_workers is None:
+        max_workers = max((os.cpu_count() or 1) // threads_by_worker, 1)
+    logger.info(
+        f"Num workers is {max_workers}, "
+        f"num threads by worker is {threads_by_worker}"
+    )
+
+    anOptimizeParameters = OptimizationParameters.import_()
+    scenarios = make_scenarios()
+
+    with open(file_name, "w") as f, \
+            ProcessPoolExecutor(max_workers=max_workers) as executor:
+        writer = csv.writer(f, lineterminator='\n')
+        writer.writerow(columns)
+
+        future_to_scenario = {
+            executor.submit(
+                run_scenario, aScenario,
+                aScenario.parameters(anOptimizeParameters, threads_by_worker)
+            ): aScenario
+            for aScenario in scenarios
+        }
+        for future in tqdm(
+            as_completed(future_to_scenario), total=len(scenarios)
+        ):
+            aScenario = future_to_scenario[future]
+            try:
+                row = future.result()
+            except Exception as e:
+                logger.warning(f"Failed {aScenario} : {e!r}")
+                continue
+            logger.info(f"{aScenario} : {row[-2]}")
+            writer.writerow(row)
+            f.flush()
+
+    logger.info(f"{name_running} end.")
+
+
+if __name__ == "__main__":
+    # 標準入力からプロセス数, 各プロセスのスレッド数を取得
+    max_workers = int(sys.argv[1]) if len(sys.argv) > 1 else None
+    threads_by_worker = int(sys.argv[2]) if len(sys.argv) > 2 else 1
+    main(max_workers, threads_by_worker)
@@ -0,0 +1,122 @@
+"""拠点数とソルバーを変化させて, モデルの構築時間と求解時間をcsvファイルに書き込む
+
+拠点数ごとに1つのグラフを作成し, 同じグラフについて各ソルバーで構築・求解して比較する.
+`set_constants` で追加される物量は同じグラフに何度追加しても変わらないため, グラフは使いまわす
+
+書き込む内容:
+    * 拠点数
+    * レーン数
+    * ソルバー名
+    * 構築時間
+    * 求解時間
+    * 最適性
+    * 目的関数値
+"""
+import os
+import csv
+import time
+import dataclasses
+import itertools
+
+from tqdm import tqdm
+
+from .utils.config_util import read_config
+from .input_data.graph import Graph
+from .optimizer.optimization_parameters import OptimizationParameters
+from .optimizer.solver_backend import solver_cplex, solver_highs
+from .logistics_planner.batch_logistics_planner import BatchLogisticsPlanner
+from .input_data.input_data_maker import InputDataMaker
+from .logger.logger import setup_logger
+
+
+path_data = read_config().get("PATH_DATA")
+
+# 計算結果を書き込むcsvファイル名
+file_name = f"{path_data}result/calc_time_by_solver.csv"
+
+# 拠点数の入力の設定
+lst_num_base = [
+    10, 20, 50,
+    # 100,
+]
+
+# 比較するソルバーの設定
+lst_solver = [solver_cplex, solver_highs]
+
+columns = [
+    "n", "m", "solver", "time_building", "time_solving",
+    "result_status", "objective_value"
+]
+
+
+def measure(func) -> float:
+    """関数を実行し, かかった秒数を出力"""
+    start = time.perf_counter()
+    func()
+    return time.perf_counter() - start
+
+
+def build(anOptimizer: BatchLogisticsPlanner, aGraph: Graph):
+    """定数・決定変数・目的関数・制約を設定"""
+    anOptimizer.set_constants(aGraph)
+    anOptimizer.set_decision_variables()
+    anOptimizer.set_objective_function()
+    anOptimizer.set_constraints()
+
+
+def main():
+    # set up
+    logger = setup_logger(os.path.basename(__file__)[:-3])
+    # logging の際に表示する文字列
+    name_running = "Calculation of building and solving time by solver"
+    logger.info(f"{name_running} start.")
+
+    anOptimizeParameters = OptimizationParameters.import_()
+    dct_graph = {
+        num_base: InputDataMaker(num_base).run(Graph())
+        for num_base in lst_num_base
+    }
+
+    with open(file_name, "w") as f:
+        writer = csv.writer(f, lineterminator='\n')
+        writer.writerow(columns)
+
+        for num_base, solver in tqdm(
+            list(itertools.product(lst_num_base, lst_solver))
+        ):
+            logger.info(f"Num base is {num_base}, solver is {solver}:")
+            aGraph = dct_graph[num_base]
+            anOptimizer = BatchLogisticsPlanner(
+                dataclasses.replace(anOptimizeParameters, SOLVER=solver)
+            )
+            elapsed_building = measure(lambda: build(anOptimizer, aGraph))
+            # CPLEX の Community Edition ではモデルの大きさに上限があり求解できないため,
+            # エラーとなったことを書き込んで次に進む
+            try:
+                elapsed_solving = measure(anOptimizer.solve)
+            except Exception as e:
+                logger.warning(f"Failed to solve : {e!r}")
+                writer.writerow([
+                    num_base, len(aGraph.lanes()), solver,
+                    round(elapsed_building, 2), None, type(e).__name__, None
+                ])
+                continue
+            logger.info(
+                f"Time of building : {elapsed_building:.2f}s, "
+                f"solving : {elapsed_solving:.2f}s"
+            )
+
+            objective_value = None
+            if anOptimizer.is_opt_or_feasible():
+                objective_value = anOptimizer.solution.get_objective_value()
+            writer.writerow([
+                num_base, len(aGraph.lanes()), solver,
+                round(elapsed_building, 2), round(elapsed_solving, 2),
+                anOptimizer.result_status, objective_value
+            ])
+
+    logger.info(f"{name_running} end.")
+
+
+if __name__ == "__main__":
+    main()
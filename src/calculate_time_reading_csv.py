@@ -0,0 +1,140 @@
+"""拠点数を変化させて, 入力データの読み込み方法ごとの読み込み速度をcsvファイルに書き込む
+
+乱数で作成したグラフを一時ディレクトリに書き込み, 同じファイルを各方法で読み込んで比較する.
+読み込み方法は以下の通り
+    * row_by_row: 型を推定して読み込み, 1行ずつ要素を作成して `Graph.add` で追加する従来の方法
+    * bulk: 列の型を指定して読み込み, 全ての要素を `Graph.add_many` で1度に追加する `CsvHandler.read`
+    * bulk_pyarrow: `bulk` のパーサに pyarrow を使用する. pyarrow がインストールされている場合のみ
+    * npz: 圧縮した列指向の npz ファイルから `NpzHandler.read` で読み込む
+    * npz_columns: npz ファイルから列の配列のみ読み込み, グラフは作成しない
+    * npy_mmap: 列ごとの npy ファイルをメモリマップし, 要素を作成せずに `ArrayGraph` とする
+
+書き込む内容:
+    * 拠点数
+    * 読み込んだ行数(拠点, 拠点生産量, レーン, コスト変化点の合計)
+    * 読み込み方法
+    * 読み込み時間
+    * 1秒あたりの読み込み行数
+"""
+import os
+import csv
+import time
+import tempfile
+import importlib.util
+
+import pandas as pd
+from tqdm import tqdm
+
+from .utils.config_util import read_config
+from .input_data.graph import Graph, GraphComponent
+from .input_data.array_graph import ArrayGraph
+from .data_access.data_access import CsvHandler, add_csv_postfix
+from .data_access.npz_handler import NpzHandler
+from .data_access.npy_handler import NpyHandler
+from .input_data.input_data_maker import InputDataMaker
+from .logger.logger import setup_logger
+
+
+path_data = read_config().get("PATH_DATA")
+
+# 計算結果を書き込むcsvファイル名
+file_name = f"{path_data}result/calc_time_reading_csv.csv"
+
+# 拠点数の入力の設定
+lst_num_base = [
+    100,
+    200,
+    500,
+]
+
+columns = ["n", "num_rows", "method", "time_reading", "rows_per_second"]
+
+
+class RowByRowCsvHandler(CsvHandler):
+    """比較のため, 1行ずつ要素を作成して追加する従来の読み込み方法"""
+    def read(
+        self, aGraph: GraphComponent, name: str, factory_method,
+        component_type: type | None = None
+    ) -> GraphComponent:
+        filename = add_csv_postfix(name)
+        df = pd.read_csv(f"{self.path_data}{filename}")
+        for _, *values in df.itertuples():
+            aGraph.add(factory_method(*values))
+        return aGraph
+
+
+def read_all(aCsvHandler: CsvHandler) -> Graph:
+    """`write_processed_data` で書き込まれるファイルを全て読み込む"""
+    aGraph = aCsvHandler.read_constants(Graph())
+    return aCsvHandler.read_lane_singular_points(aGraph)
+
+
+def read_all_array_graph(aCsvHandler: CsvHandler) -> ArrayGraph:
+    """`write_processed_data` で書き込まれるファイルを全て `ArrayGraph` に読み込む"""
+    anArrayGraph = aCsvHandler.read_constants(ArrayGraph())
+    return aCsvHandler.read_lane_singular_points(anArrayGraph)
+
+
+def read_all_columns(aCsvHandler: CsvHandler) -> list[dict]:
+    """`write_processed_data` で書き込まれるファイルの列を全て読み込む"""
+    return [
+        aCsvHandler.read_columns(f"processed/{name}")
+        for name in ("bases", "base_supplies", "lanes", "lane_singular_points")
+    ]
+
+
+def main():
+    # set up
+    logger = setup_logger(os.path.basename(__file__)[:-3])
+    # logging の際に表示する文字列
+    name_running = "Calculation of reading csv time"
+    logger.info(f"{name_running} start.")
+
+    # 読み込み方法ごとの, 読み込みを行うインスタンスを作成する関数と読み込む関数
+    dct_method = {
+        "row_by_row": (RowByRowCsvHandler, read_all),
+        "bulk": (CsvHandler, read_all),
+    }
+    if importlib.util.find_spec("pyarrow") is not None:
+        dct_method["bulk_pyarrow"] = (
+            lambda path: CsvHandler(path, engine="pyarrow"), read_all
+        )
+    dct_method["npz"] = (NpzHandler, read_all)
+    dct_method["npz_columns"] = (NpzHandler, read_all_columns)
+    dct_method["npy_mmap"] = (NpyHandler, read_all_array_graph)
+
+    with open(file_name, "w") as f, tempfile.TemporaryDirectory() as dir_tmp:
+        writer = csv.writer(f, lineterminator='\n')
+        writer.writerow(columns)
+
+        path_tmp = f"{dir_tmp}/"
+        os.mkdir(f"{path_tmp}processed")
+        for num_base in tqdm(lst_num_base):
+            aGraph = InputDataMaker(num_base).run(Graph())
+            CsvHandler(path_tmp).write_processed_data(aGraph)
+            NpzHandler(path_tmp).write_processed_data(aGraph)
+            NpyHandler(path_tmp).write_processed_data(aGraph)
+            num_rows = (
+                len(aGraph.bases()) + len(aGraph.base_supplies())
+                + len(aGraph.lanes()) + len(aGraph.lane_singular_points())
+            )
+
+            for method, (make_handler, read) in dct_method.items():
+                aCsvHandler = make_handler(path_tmp)
+                start = time.perf_counter()
+                _ = read(aCsvHandler)
+                elapsed = time.perf_counter() - start
+                logger.info(
+                    f"Num base is {num_base}, method is {method}: "
+                    f"{elapsed:.2f}s, {num_rows / elapsed:.0f} rows/s"
+                )
+                writer.writerow([
+                    num_base, num_rows, method,
+                    round(elapsed, 3), round(num_rows / elapsed)
+                ])
+
+    logger.info(f"{name_running} end.")
+
+
+if __name__ == "__main__":
+    main()
@@ -1,11 +1,35 @@
 """データの読み込み・書き込みに関するモジュール"""
 from __future__ import annotations
+import os
+import gc
 import csv
+import operator
+import itertools
+import dataclasses
+from collections.abc import Iterable, Iterator
 
+import numpy as np
 import pandas as pd
 from tqdm import tqdm
 
-from src.input_data.graph import GraphComponent
+from src.input_data.graph import (
+    GraphComponent, Base, BaseSupply, Lane, LaneSingularPoint, Flow
+)
+
+# グラフの要素の属性の型と, csvファイルを読み込む際の列の型
+dtype_by_annotation = {"int": "int64", "float": "float64", "str": "string"}
+# 最適化の結果として連続値が書き込まれるため, 属性の型によらず小数として読み込む列
+dtype_by_field = {
+    BaseSupply: {"quantity": "float64"},
+    Flow: {"quantity": "float64"},
+}
+# 処理済みのデータとして書き込む要素のクラスと, ファイル名
+processed_names = {
+    Base: "bases",
+    BaseSupply: "base_supplies",
+    Lane: "lanes",
+    LaneSingularPoint: "lane_singular_points",
+}
 
 
 def add_csv_postfix(filename: str):
@@ -15,72 +39,224 @@ def add_csv_postfix(filename: str):
     return filename
 
 
+def column_dtypes(component_type: type) -> dict[str, str]:
+    """グラフの要素の属性名をキーにした, csvファイルの列の型の辞書
+
+    列名はファイルによって属性名と異なるため, 列の順番が属性の順番と一致していることを前提とする
+    """
+    output = {
+        field.name: dtype_by_annotation[field.type]
+        for field in dataclasses.fields(component_type)
+    }
+    output.update(dtype_by_field.get(component_type, {}))
+    return output
+
+
+def chunked(iterable: Iterable, size: int) -> Iterator[list]:
+    """`size` 個ずつのリストに分けて出力"""
+    iterator = iter(iterable)
+    while chunk := list(itertools.islice(iterator, size)):
+        yield chunk
+
+
+def resolve_component_type(
+    graph_components: Iterable[GraphComponent], component_type: type | None
+) -> tuple[type, Iterator[GraphComponent]]:
+    """書き込む要素のクラスと, 先頭から全ての要素を出力するイテレータ
+
+    クラスが指定されていなければ最初の要素のクラスとする
+
+    Raises:
+        ValueError: クラスが指定されておらず, 要素が空の場合
+    """
+    iterator = iter(graph_components)
+    if component_type is not None:
+        return component_type, iterator
+    first = next(iterator, None)
+    if first is None:
+        raise ValueError("component_type is required to write no components")
+    return type(first), itertools.chain([first], iterator)
+
+
+def to_column_arrays(
+    graph_components: Iterable[GraphComponent],
+    component_type: type | None = None, dtype: dict[str, str] | None = None,
+    chunk_size: int = 100_000
+) -> dict[str, np.ndarray]:
+    """同じ型のグラフの要素を, 属性名をキーにした列の配列の辞書に変換
+
+    `chunk_size` 個ずつ配列に変換してからつなげるため, ジェネレータを渡せば
+    要素のインスタンスを全てメモリに保持せずに変換できる
+
+    Args:
+        graph_components: 変換するグラフの要素
+        component_type: 要素のクラス. 要素が空の場合は必須
+        dtype: 属性名をキーにした列の型. None ならば `column_dtypes` の型
+        chunk_size: 1度に配列に変換する要素の数
+    """
+    component_type, graph_components = resolve_component_type(
+        graph_components, component_type
+    )
+    if dtype is None:
+        dtype = column_dtypes(component_type)
+    fields = [field.name for field in dataclasses.fields(component_type)]
+    arrays = {name: [np.empty(0, dtype=dtype[name])] for name in fields}
+    for chunk in chunked(graph_components, chunk_size):
+        for name in fields:
+            arrays[name].append(np.array(
+                [getattr(gp, name) for gp in chunk], dtype=dtype[name]
+            ))
+    return {name: np.concatenate(arrays[name]) for name in fields}
+
+
 class CsvHandler:
-    """csv ファイルの読み込み・書き込みをつかさどるクラス"""
-    def __init__(self, path_data: str):
+    """csv ファイルの読み込み・書き込みをつかさどるクラス
+
+    Attributes:
+        chunk_size: 書き込む際に1度に取り出す要素の数
+    """
+    chunk_size: int = 100_000
+
+    def __init__(
+        self, path_data: str, engine: str | None = None,
+        is_progress: bool = False
+    ):
         """初期化
 
         Attributes:
             path_data: csvファイルを読み込む際のパス
+            engine: `pd.read_csv` のパーサ. "pyarrow" を指定すると, pyarrow が
+                インストールされていれば複数スレッドで読み込む. None ならば pandas の既定
+            is_progress: 読み込み・書き込みの進捗を表示するか否か
         """
         self.path_data = path_data
+        self.engine = engine
+        self.is_progress = is_progress
+
+    def file_path(self, name: str) -> str:
+        """パスまで含めた読み込み・書き込み先のファイル名"""
+        return f"{self.path_data}{add_csv_postfix(name)}"
+
+    def read_csv_options(self) -> dict:
+        """`pd.read_csv` に共通して渡すオプション
+
+        Note:
+            * 書き込んだ最適化の結果を初期解として読み込んだ際に値が変わらないよう,
+                pandas の既定のパーサでは小数を往復で一致する精度で読み込む.
+                pyarrow のパーサはこのオプションを受け付けない
+        """
+        if self.engine == "pyarrow":
+            return {"engine": self.engine}
+        return {"engine": self.engine, "float_precision": "round_trip"}
+
+    def add_columns(
+        self, aGraph: GraphComponent, columns: list[list], factory_method
+    ) -> GraphComponent:
+        """列ごとの値のリストから全ての行の要素を作成し, `add_many` で1度に追加する"""
+        rows = zip(*columns)
+        if self.is_progress:
+            rows = tqdm(rows, total=len(columns[0]) if columns else 0)
+        aGraph.add_many(itertools.starmap(factory_method, rows))
+        return aGraph
+
+    def read_columns(
+        self, name: str, component_type: type,
+        columns: list[str] | None = None
+    ) -> dict[str, np.ndarray]:
+        """指定した列のみ読み込み, 属性名をキーにした列の値の辞書を出力
+
+        Args:
+            name: パスまで含めた読み込み先ファイル名
+            component_type: 対象のグラフ要素のクラス. 列名は属性名とする
+            columns: 読み込む列の属性名. None ならば全ての列
+        """
+        dtype = column_dtypes(component_type)
+        df = pd.read_csv(
+            self.file_path(name), header=0, names=list(dtype), dtype=dtype,
+            usecols=columns, **self.read_csv_options()
+        )
+        return {
+            column: df[column].to_numpy()
+            for column in (df.columns if columns is None else columns)
+        }
 
     def read(
-        self, aGraph: GraphComponent, name: str, factory_method
+        self, aGraph: GraphComponent, name: str, factory_method,
+        component_type: type | None = None
     ) -> GraphComponent:
         """csvファイルの読み込み
 
+        列ごとに値を取り出して全ての行の要素を作成し, `add_many` で1度に追加する
+
         Args:
             aGraph: グラフ情報が格納されたインスタンス.
                 このインスタンスに読み込んだデータを追加
             name: パスまで含めた読み込み先ファイル名
             factory_method: 対象のグラフ要素を作成するファクトリメソッド
+            component_type: 対象のグラフ要素のクラス. 指定すれば属性の型で列の型を固定し,
+                型の推定を省く
 
         Returns:
             GraphComponent: グラフの要素となるクラスインスタンス.
                 出力が想定されるのは, `Graph` class 以外のサブクラス
+
+        Note:
+            * 要素を大量に作成すると循環参照のガベージコレクションが何度も走り,
+                読み込みにかかる時間の半分近くを占めるため, 読み込みが終わるまで止めておく
         """
-        filename = add_csv_postfix(name)
-        df = pd.read_csv(f"{self.path_data}{filename}")
-        # index を抜いて値を抽出
-        for _, *values in tqdm(df.itertuples()):
-            aGraph.add(factory_method(*values))
-        return aGraph
+        kwargs = {}
+        if component_type is not None:
+            dtype = column_dtypes(component_type)
+            kwargs = {"header": 0, "names": list(dtype), "dtype": dtype}
+        is_gc_enabled = gc.isenabled()
+        gc.disable()
+        try:
+            df = pd.read_csv(
+                self.file_path(name), **self.read_csv_options(), **kwargs
+            )
+            # 列ごとに Python の値のリストへ変換してから, 行ごとの値の組にする
+            columns = [df[column].tolist() for column in df.columns]
+            return self.add_columns(aGraph, columns, factory_method)
+        finally:
+            if is_gc_enabled:
+                gc.enable()
 
     def read_bases(
         self, aGraph: GraphComponent,
         name: str = "processed/bases.csv",
     ) -> GraphComponent:
         """拠点に関するデータの読み込み"""
-        return self.read(aGraph, name, aGraph.base)
+        return self.read(aGraph, name, aGraph.base, Base)
 
     def read_base_supplies(
         self, aGraph: GraphComponent,
         name: str = "processed/base_supplies.csv",
     ) -> GraphComponent:
         """拠点の生産量に関するデータの読み込み"""
-        return self.read(aGraph, name, aGraph.base_supply)
+        return self.read(aGraph, name, aGraph.base_supply, BaseSupply)
 
     def read_lanes(
         self, aGraph: GraphComponent,
         name: str = "processed/lanes.csv",
     ) -> GraphComponent:
         """レーンに関するデータの読み込み"""
-        return self.read(aGraph, name, aGraph.lane)
+        return self.read(aGraph, name, aGraph.lane, Lane)
 
     def read_lane_singular_points(
         self, aGraph: GraphComponent,
         name: str = "processed/lane_singular_points.csv",
     ) -> GraphComponent:
         """レーンに紐づくコスト変化点に関するデータの読み込み"""
-        return self.read(aGraph, name, aGraph.lane_singular_point)
+        return self.read(
+            aGraph, name, aGraph.lane_singular_point, LaneSingularPoint
+        )
 
     def read_flows(
         self, aGraph: GraphComponent,
         name: str = "processed/flows.csv",
     ) -> GraphComponent:
         """物量の流れとコストに関するデータの読み込み"""
-        return self.read(aGraph, name, aGraph.flow)
+        return self.read(aGraph, name, aGraph.flow, Flow)
 
     def read_constants(self, aGraph: GraphComponent) -> GraphComponent:
         """読み込みが無くて実行不能になったことがあったため, 今後そうならないようまとめておく"""
@@ -89,32 +265,91 @@ class CsvHandler:
         aGraph = self.read_lanes(aGraph)
         return aGraph
 
+    def read_opt_solution(
+        self, aGraph: GraphComponent, path_file: str = "result/"
+    ) -> GraphComponent:
+        """`write_opt_solution` で書き込んだ最適化の結果の読み込み
+
+        次の最適化の初期解(MIP start)として使用することを想定している
+
+        Args:
+            aGraph: 読み込んだ結果を追加するインスタンス
+            path_file: 結果が書き込まれているディレクトリ
+        """
+        aGraph = self.read_bases(aGraph, f"{path_file}sol_bases")
+        aGraph = self.read_base_supplies(
+            aGraph, f"{path_file}sol_base_supplies"
+        )
+        aGraph = self.read_lanes(aGraph, f"{path_file}sol_lanes")
+        aGraph = self.read_flows(aGraph, f"{path_file}sol_flows")
+        return aGraph
+
     def write(
-        self, lst_graph_component: list, name: str,
-        is_truncate: bool = True
+        self, graph_components: Iterable[GraphComponent], name: str,
+        is_truncate: bool = True, component_type: type | None = None
     ):
         """csvファイルに書き込みを行う
 
+        要素は `chunk_size` 行ずつ取り出して書き込むため, ジェネレータを渡せば
+        全ての要素をメモリに保持せずに書き込める
+
         Args:
-            lst_graph_component: 書き込む対象となるグラフのうち, 書き込むものに絞ったインスタンスリスト
+            graph_components: 書き込む対象となるグラフのうち, 書き込むものに絞ったインスタンス
                 拠点, レーン, 物量とコストで分かれる
             name: 書き込む際の名前. ディレクトリも指定する際は入れておく
-            is_truncate: 書き込む際に中身を綺麗にするか否か
+            is_truncate: 書き込む際に中身を綺麗にするか否か.
+                綺麗にしない場合, 既にファイルがあれば列名は書き込まない
+            component_type: 書き込む要素のクラス. 列名を決めるため, 要素が空の場合は必須
         """
-        filename = add_csv_postfix(name)
+        component_type, graph_components = resolve_component_type(
+            graph_components, component_type
+        )
+        path = self.file_path(name)
+        is_header = is_truncate or not os.path.exists(path)
         if is_truncate:
             mode = "w"
         else:
             mode = "a"
-        with open(f"{self.path_data}{filename}", mode) as f:
+        with open(path, mode) as f:
             # 改行コード（\n）を指定
             writer = csv.writer(f, lineterminator='\n')
-            # 最初の要素から必要な列名を取得し, 書き込み
-            columns = lst_graph_component[0].__dict__.keys()
-            writer.writerow(columns)
+            # 要素のクラスから必要な列名を取得し, 書き込み
+            columns = [
+                field.name for field in dataclasses.fields(component_type)
+            ]
+            if is_header:
+                writer.writerow(columns)
             # 残りの要素の書き込み
-            for gp in tqdm(lst_graph_component):
-                writer.writerow(gp.to_tuple())
+            if self.is_progress:
+                graph_components = tqdm(graph_components)
+            rows = map(operator.attrgetter(*columns), graph_components)
+            for chunk in chunked(rows, self.chunk_size):
+                writer.writerows(chunk)
+
+    def write_columns(
+        self, columns: dict[str, np.ndarray], name: str,
+        is_truncate: bool = True, component_type: type | None = None
+    ):
+        """属性名をキーにした列の配列を, 要素のインスタンスを作成せずに書き込む
+
+        Args:
+            columns: 属性名をキーにした列の配列
+            name: 書き込む際の名前. ディレクトリも指定する際は入れておく
+            is_truncate: 書き込む際に中身を綺麗にするか否か.
+                綺麗にしない場合, 既にファイルがあれば列名は書き込まない
+            component_type: 書き込む要素のクラス. 指定すれば列の順番を属性の順番にそろえる
+        """
+        if component_type is not None:
+            columns = {
+                field.name: columns[field.name]
+                for field in dataclasses.fields(component_type)
+            }
+        path = self.file_path(name)
+        is_header = is_truncate or not os.path.exists(path)
+        pd.DataFrame(columns).to_csv(
+            path, mode="w" if is_truncate else "a", header=is_header,
+            index=False, lineterminator="\n", chunksize=self.chunk_size
+        )
 
     def write_processed_data(self, aGraph: GraphComponent):
         """作成された処理済みのデータを出力する
@@ -125,33 +360,61 @@ class CsvHandler:
             aGraph: 最適化の結果出力されるサブグラフ.
                 拠点, レーンの情報が書き出される
         """
-        path_file = "processed/"
-        # 拠点情報
-        self.write(aGraph.sorted_bases(), f"{path_file}bases")
-        # 拠点の生産情報
-        self.write(aGraph.sorted_base_supplies(), f"{path_file}base_supplies")
-        # レーン情報
-        self.write(aGraph.sorted_lanes(), f"{path_file}lanes")
-        # レーンのコスト変化点情報
-        self.write(
-            aGraph.sorted_lane_singular_points(),
-            f"{path_file}lane_singular_points"
-        )
+        sorted_components = {
+            Base: aGraph.sorted_bases,
+            BaseSupply: aGraph.sorted_base_supplies,
+            Lane: aGraph.sorted_lanes,
+            LaneSingularPoint: aGraph.sorted_lane_singular_points,
+        }
+        for component_type, name in processed_names.items():
+            self.write(
+                sorted_components[component_type](), f"processed/{name}",
+                component_type=component_type
+            )
+
+    def write_processed_columns(
+        self, columns_by_type: dict[type, dict[str, np.ndarray]]
+    ):
+        """列の配列として作成された処理済みのデータを出力する
+
+        `ArrayInputDataMaker.make_columns` の出力をそのまま渡せば,
+        要素のインスタンスを作成せずに `write_processed_data` と同じファイルに書き込む
+
+        Args:
+            columns_by_type: 要素のクラスをキーにした, 属性名をキーにした列の配列の辞書
+        """
+        for component_type, name in processed_names.items():
+            self.write_columns(
+                columns_by_type[component_type], f"processed/{name}",
+                component_type=component_type
+            )
 
-    def write_opt_solution(self, aGraph: GraphComponent):
+    def write_opt_solution(
+        self, aGraph: GraphComponent, flows: Iterable[Flow] | None = None
+    ):
         """最適化の結果を出力する
 
         Args:
             aGraph: 最適化の結果出力されるサブグラフ.
                 拠点, レーン, 物量とコストの情報が書き出される
+            flows: 流れた物量. 指定すれば `aGraph` の物量の代わりに書き込む.
+                `LogisticsPlanner.result_flows` を渡せば, 物量をグラフに追加せずに書き込める
         """
         path_file = "result/"
         # 開設した拠点
-        self.write(aGraph.sorted_bases(), f"{path_file}sol_bases")
+        self.write(
+            aGraph.sorted_bases(), f"{path_file}sol_bases", component_type=Base
+        )
         # 生産した物量
         filename = f"{path_file}sol_base_supplies"
-        self.write(aGraph.sorted_base_supplies(), filename)
+        self.write(
+            aGraph.sorted_base_supplies(), filename, component_type=BaseSupply
+        )
         # 開設したレーン
-        self.write(aGraph.sorted_lanes(), f"{path_file}sol_lanes")
+        self.write(
+            aGraph.sorted_lanes(), f"{path_file}sol_lanes", component_type=Lane
+        )
         # 流れた物量
-        self.write(aGraph.sorted_flows(), f"{path_file}sol_flows")
+        if flows is None:
+            flows = aGraph.sorted_flows()
+        self.write(flows, f"{path_file}sol_flows", component_type=Flow)
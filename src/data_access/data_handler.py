@@ -0,0 +1,33 @@
+"""データの保存形式に応じて, 読み込み・書き込みを行うクラスを作成するモジュール
+
+保存形式は `config_path_and_name.ini` の `DATA_FORMAT` で指定する
+"""
+from .data_access import CsvHandler
+from .npz_handler import NpzHandler
+from .npy_handler import NpyHandler
+
+# 保存形式
+data_format_csv = "csv"
+data_format_npz = "npz"
+data_format_npy = "npy"
+
+handler_class_by_format = {
+    data_format_csv: CsvHandler,
+    data_format_npz: NpzHandler,
+    data_format_npy: NpyHandler,
+}
+
+
+def make_data_handler(
+    path_data: str, data_format: str = data_format_csv, **options
+) -> CsvHandler:
+    """保存形式に対応するデータの読み込み・書き込みを行うインスタンスを作成
+
+    Args:
+        path_data: ファイルを読み込む際のパス
+        data_format: 保存形式
+        options: インスタンスを作成する際に渡すオプション
+    """
+    if data_format not in handler_class_by_format:
+        raise ValueError(f"Unknown data format: {data_format}")
+    return handler_class_by_format[data_format](path_data, **options)
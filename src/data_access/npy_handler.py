@@ -0,0 +1,125 @@
+"""列ごとの npy ファイルをメモリマップして読み込むモジュール
+
+表ごとに1つのディレクトリを作成し, グラフの要素の属性ごとに固定長の npy ファイルとして書き込む.
+読み込みの際はファイルをメモリマップするため, `ArrayGraph` に読み込めば
+行ごとのインスタンスも配列の複製も作成せずに, 必要になったページのみ読み込まれる.
+同じマシン上の複数のプロセスで読み込んだ場合も, OS のページキャッシュを共有する
+"""
+from __future__ import annotations
+import os
+import dataclasses
+from collections.abc import Iterable
+
+import numpy as np
+
+from src.input_data.array_graph import ArrayGraph, ComponentColumns
+from .data_access import (
+    CsvHandler, GraphComponent, resolve_component_type, to_column_arrays
+)
+
+# 拡張子
+suffix_npy = ".npy"
+
+
+class NpyHandler(CsvHandler):
+    """列ごとの npy ファイルの読み込み・書き込みをつかさどるクラス
+
+    ファイル名は `CsvHandler` と同じものから拡張子を除いてディレクトリ名とし,
+    その中に `{属性名}.npy` として書き込む.
+    列の型は `ArrayGraph` の列配列と同じにし, 読み込む際に型の変換による複製が起きないようにする
+    """
+    def file_path(self, name: str) -> str:
+        """表ごとのディレクトリ名"""
+        return f"{self.path_data}{name.removesuffix('.csv')}/"
+
+    def read_columns(
+        self, name: str, component_type: type | None = None,
+        columns: list[str] | None = None
+    ) -> dict[str, np.ndarray]:
+        """指定した列のファイルを読み取り専用でメモリマップする
+
+        Args:
+            component_type: 全ての列を読み込む際に, 列の順番を属性の順番にするために使用する
+        """
+        if columns is None:
+            columns = [
+                field.name for field in dataclasses.fields(component_type)
+            ]
+        path = self.file_path(name)
+        return {
+            column: np.load(f"{path}{column}{suffix_npy}", mmap_mode="r")
+            for column in columns
+        }
+
+    def read(
+        self, aGraph: GraphComponent, name: str, factory_method,
+        component_type: type | None = None
+    ) -> GraphComponent:
+        """npy ファイルの読み込み
+
+        `ArrayGraph` にはメモリマップした配列をそのまま列として追加し, 要素を作成しない.
+        それ以外のグラフには行ごとに要素を作成して追加する
+        """
+        dct_column = self.read_columns(name, component_type)
+        if isinstance(aGraph, ArrayGraph):
+            aGraph.add_columns(component_type, **dct_column)
+            return aGraph
+        columns = [array.tolist() for array in dct_column.values()]
+        return self.add_columns(aGraph, columns, factory_method)
+
+    def write(
+        self, graph_components: Iterable[GraphComponent], name: str,
+        is_truncate: bool = True, component_type: type | None = None
+    ):
+        """属性ごとの配列にまとめて, 列ごとの npy ファイルに書き込む
+
+        Args:
+            graph_components: 書き込む対象となるグラフのうち, 書き込むものに絞ったインスタンス
+            name: 書き込む際の名前. ディレクトリも指定する際は入れておく
+            is_truncate: 書き込む際に中身を綺麗にするか否か.
+                綺麗にしない場合は, 既存の配列の後ろにつなげて書き込み直す
+            component_type: 書き込む要素のクラス. 要素が空の場合は必須
+        """
+        component_type, graph_components = resolve_component_type(
+            graph_components, component_type
+        )
+        arrays = to_column_arrays(graph_components, component_type, {
+            field.name: ComponentColumns.dtype(field.name)
+            for field in dataclasses.fields(component_type)
+        }, chunk_size=self.chunk_size)
+        self.write_columns(arrays, name, is_truncate, component_type)
+
+    def write_columns(
+        self, columns: dict[str, np.ndarray], name: str,
+        is_truncate: bool = True, component_type: type | None = None
+    ):
+        """列の配列を `ArrayGraph` の列と同じ型にして, 列ごとの npy ファイルに書き込む
+
+        Args:
+            component_type: 指定すれば属性の列のみ書き込む
+        """
+        if component_type is not None:
+            columns = {
+                field.name: columns[field.name]
+                for field in dataclasses.fields(component_type)
+            }
+        arrays = {
+            column: np.asarray(array, dtype=ComponentColumns.dtype(column))
+            for column, array in columns.items()
+        }
+        path = self.file_path(name)
+        if not is_truncate and os.path.exists(path):
+            # メモリマップした配列は書き込みの前に複製してからつなげる
+            existing = self.read_columns(name, columns=list(arrays))
+            arrays = {
+                column: np.concatenate([np.array(existing[column]), array])
+                for column, array in arrays.items()
+            }
+        os.makedirs(path, exist_ok=True)
+        for column, array in arrays.items():
+            # 他のプロセスがメモリマップしているファイルを切り詰めないよう,
+            # 別のファイルに書き込んでから置き換える
+            file_name = f"{path}{column}{suffix_npy}"
+            file_name_tmp = f"{path}{column}.tmp{suffix_npy}"
+            np.save(file_name_tmp, array)
+            os.replace(file_name_tmp, file_name)
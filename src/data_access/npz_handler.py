@@ -0,0 +1,99 @@
+"""圧縮した列指向の npz ファイルの読み込み・書き込みに関するモジュール
+
+グラフの要素の属性ごとに1つの配列として, 表ごとに1つの npz ファイルに書き込む.
+csv ファイルと異なり文字列の解析が不要で, 必要な列の配列のみ展開して読み込める
+"""
+from __future__ import annotations
+import os
+from collections.abc import Iterable
+
+import numpy as np
+
+from .data_access import (
+    CsvHandler, GraphComponent, column_dtypes, to_column_arrays
+)
+
+# 拡張子
+suffix_npz = ".npz"
+
+
+class NpzHandler(CsvHandler):
+    """npz ファイルの読み込み・書き込みをつかさどるクラス
+
+    ファイル名は `CsvHandler` と同じものを使用し, 拡張子のみ `.npz` に置き換える.
+    配列名はグラフの要素の属性名とする
+    """
+    def file_path(self, name: str) -> str:
+        name = name.removesuffix(".csv")
+        if not name.endswith(suffix_npz):
+            name += suffix_npz
+        return f"{self.path_data}{name}"
+
+    def read_columns(
+        self, name: str, component_type: type | None = None,
+        columns: list[str] | None = None
+    ) -> dict[str, np.ndarray]:
+        """指定した列の配列のみ展開して読み込む
+
+        Args:
+            component_type: npz ファイルには配列名と型が書き込まれているため, 使用しない
+        """
+        with np.load(self.file_path(name)) as npz:
+            return {
+                column: npz[column]
+                for column in (npz.files if columns is None else columns)
+            }
+
+    def read(
+        self, aGraph: GraphComponent, name: str, factory_method,
+        component_type: type | None = None
+    ) -> GraphComponent:
+        """npz ファイルの読み込み
+
+        書き込んだ順に配列を並べ, 行ごとの値の組として要素を作成する
+        """
+        dct_column = self.read_columns(name)
+        columns = [array.tolist() for array in dct_column.values()]
+        return self.add_columns(aGraph, columns, factory_method)
+
+    def write(
+        self, graph_components: Iterable[GraphComponent], name: str,
+        is_truncate: bool = True, component_type: type | None = None
+    ):
+        """属性ごとの配列にまとめて, 圧縮した npz ファイルに書き込む
+
+        Args:
+            graph_components: 書き込む対象となるグラフのうち, 書き込むものに絞ったインスタンス
+            name: 書き込む際の名前. ディレクトリも指定する際は入れておく
+            is_truncate: 書き込む際に中身を綺麗にするか否か.
+                綺麗にしない場合は, 既存の配列の後ろにつなげて書き込み直す
+            component_type: 書き込む要素のクラス. 要素が空の場合は必須
+        """
+        arrays = to_column_arrays(
+            graph_components, component_type, chunk_size=self.chunk_size
+        )
+        self.write_columns(arrays, name, is_truncate)
+
+    def write_columns(
+        self, columns: dict[str, np.ndarray], name: str,
+        is_truncate: bool = True, component_type: type | None = None
+    ):
+        """列の配列を圧縮した npz ファイルに書き込む
+
+        Args:
+            component_type: 指定すれば `column_dtypes` の型にそろえて書き込む
+        """
+        arrays = dict(columns)
+        if component_type is not None:
+            arrays = {
+                column: np.asarray(columns[column], dtype=dtype)
+                for column, dtype in column_dtypes(component_type).items()
+            }
+        path = self.file_path(name)
+        if not is_truncate and os.path.exists(path):
+            existing = self.read_columns(name)
+            arrays = {
+                column: np.concatenate([existing[column], array])
+                for column, array in arrays.items()
+            }
+        np.savez_compressed(path, **arrays)
@@ -0,0 +1,415 @@
+"""グラフの要素を NumPy の列配列で保持するクラス
+
+拠点, レーンなどの要素をインスタンスごとに保持すると, 拠点数 1000 の完全グラフでは
+レーンだけで約 100 万インスタンスとなり, メモリを大量に消費する.
+そのため要素の型ごとに属性を列配列として保持し, `GraphComponent` と同じ問い合わせ API で
+要素を取得した時にだけ dataclass のインスタンスを作成する
+"""
+from __future__ import annotations
+from collections.abc import Iterable
+import dataclasses
+
+import numpy as np
+
+from .graph import (
+    GraphComponent,
+    Base, BaseSupply, Lane, LaneSingularPoint, Flow
+)
+
+
+# 物量は最適化の結果小数になりうるため浮動小数点数, それ以外は整数で保持する
+dtype_int = np.int32
+dtype_quantity = np.float64
+info_int = np.iinfo(dtype_int)
+quantity_fields = {"quantity"}
+
+
+class ArrayGraphException(Exception):
+    pass
+
+
+class GroupIndex:
+    """キーごとに行番号を引くための索引
+
+    キーで安定ソートした行番号と, ソート済みのキーを保持し,
+    `np.searchsorted` によりキーに対応する行番号を次数に比例する時間で取得する
+    """
+    def __init__(self, keys: np.ndarray):
+        order = np.argsort(keys, kind="stable")
+        self.order = order.astype(dtype_int, copy=False)
+        self.sorted_keys = keys[order]
+
+    def rows(self, key: int) -> np.ndarray:
+        """キーに対応する行番号の配列を出力"""
+        left = np.searchsorted(self.sorted_keys, key, side="left")
+        right = np.searchsorted(self.sorted_keys, key, side="right")
+        return self.order[left:right]
+
+
+class ComponentColumns:
+    """1種類のグラフ要素を列配列で保持するクラス
+
+    Attributes:
+        component_class: 要素を取り出す際に作成する dataclass
+        fields: 列名のタプル. dataclass のフィールド順と一致する
+        columns: 列名をキーにした配列の辞書
+        _pending: `add` で追加されたが, まだ列配列に反映されていない要素の値
+        _view: 作成済みの dataclass インスタンス集合
+        _indexes: 列名をキーにした `GroupIndex` の辞書
+    """
+    def __init__(self, component_class: type):
+        self.component_class = component_class
+        self.fields = tuple(
+            field.name for field in dataclasses.fields(component_class)
+        )
+        self.columns: dict[str, np.ndarray] = {
+            name: np.empty(0, dtype=self.dtype(name)) for name in self.fields
+        }
+        self._pending: list[tuple] = []
+        self._view: set | None = None
+        self._indexes: dict[str, GroupIndex] = {}
+
+    @staticmethod
+    def dtype(name: str) -> type:
+        if name in quantity_fields:
+            return dtype_quantity
+        return dtype_int
+
+    @classmethod
+    def to_array(cls, name: str, values: Iterable) -> np.ndarray:
+        """列の値を保持する型の配列に変換
+
+        Raises:
+            ArrayGraphException: 整数の列で, 保持する型の範囲外の値がある場合.
+                そのまま変換すると値が桁あふれするため
+        """
+        dtype = cls.dtype(name)
+        arr = np.asarray(values)
+        if arr.dtype == dtype:
+            return arr
+        if dtype is dtype_int and arr.size and arr.dtype.kind in "iuf":
+            if arr.min() < info_int.min or arr.max() > info_int.max:
+                raise cls.out_of_range(name)
+        return arr.astype(dtype, copy=False)
+
+    def name_out_of_range(self, values: tuple) -> str | None:
+        """1要素分の値のうち, 整数の列で保持する型の範囲外となる最初の列名"""
+        for name, value in zip(self.fields, values):
+            if self.dtype(name) is dtype_int \
+                    and not info_int.min <= value <= info_int.max:
+                return name
+        return None
+
+    @staticmethod
+    def out_of_range(name: str) -> ArrayGraphException:
+        return ArrayGraphException(
+            f"Values of column '{name}' are out of range of {dtype_int}."
+        )
+
+    def __len__(self) -> int:
+        return len(self.columns[self.fields[0]]) + len(self._pending)
+
+    def _invalidate(self):
+        self._view = None
+        self._indexes = {}
+
+    def append(self, values: tuple):
+        """1要素分の値を追加. 列配列への反映は読み込み時にまとめて行う
+
+        Raises:
+            ArrayGraphException: 整数の列で, 保持する型の範囲外の値がある場合.
+                追加した時点で確認し, 範囲外の要素は保持しない
+        """
+        # 全ての値が範囲内であれば列ごとには確認しない. 物量は小数の列のため範囲外でもよい
+        if min(values) < info_int.min or max(values) > info_int.max:
+            name = self.name_out_of_range(values)
+            if name is not None:
+                raise self.out_of_range(name)
+        self._pending.append(values)
+        self._invalidate()
+
+    def extend(self, columns: dict[str, Iterable]):
+        """列ごとの値をまとめて追加"""
+        missing = set(self.fields) - set(columns)
+        if missing:
+            raise ArrayGraphException(f"Columns are missing: {missing}")
+        self.flush()
+        arrays = {
+            name: self.to_array(name, columns[name]) for name in self.fields
+        }
+        if len({len(arr) for arr in arrays.values()}) > 1:
+            raise ArrayGraphException("Columns have different lengths.")
+        for name in self.fields:
+            # 空の列には配列をそのまま保持し, メモリマップされた配列も複製しない
+            if not len(self.columns[name]):
+                self.columns[name] = arrays[name]
+                continue
+            self.columns[name] = np.concatenate(
+                [self.columns[name], arrays[name]]
+            )
+        self._invalidate()
+
+    def flush(self):
+        """`append` された値を列配列に反映"""
+        if not self._pending:
+            return
+        # 全ての列を変換してから反映し, 途中で失敗しても列の長さを揃えておく
+        arrays = [
+            self.to_array(name, values)
+            for name, values in zip(self.fields, zip(*self._pending))
+        ]
+        self._pending = []
+        for name, arr in zip(self.fields, arrays):
+            self.columns[name] = np.concatenate([self.columns[name], arr])
+
+    def column(self, name: str) -> np.ndarray:
+        self.flush()
+        return self.columns[name]
+
+    def index(self, name: str) -> GroupIndex:
+        """列の値ごとの索引. 初めて使用される際に作成"""
+        self.flush()
+        if name not in self._indexes:
+            self._indexes[name] = GroupIndex(self.columns[name])
+        return self._indexes[name]
+
+    def make(self, rows: np.ndarray | slice) -> list:
+        """指定された行の dataclass インスタンスを作成"""
+        self.flush()
+        lst_values = [self.columns[name][rows].tolist() for name in self.fields]
+        return [self.component_class(*values) for values in zip(*lst_values)]
+
+    def view(self) -> set:
+        """全ての行の dataclass インスタンス集合. 追加されるまでは作成したものを使い回す"""
+        if self._view is None:
+            self._view = set(self.make(slice(None)))
+        return self._view
+
+    def rows_by(self, name: str, key: int) -> np.ndarray:
+        return self.index(name).rows(key)
+
+
+class ArrayGraph(GraphComponent):
+    """グラフの要素を型ごとの列配列で保持する `Graph` の代替クラス
+
+    `Graph` と同じ問い合わせ API を持つため, `LogisticsPlanner` にそのまま入力できる.
+
+    Note:
+        * `bases` などで全要素を取得した場合のみ全行分のインスタンスを作成し,
+            次に要素が追加されるまで使い回す
+        * `lanes_same_start` などの抽出, `search_*` は索引から該当する行のみインスタンスにする
+        * `Graph` と異なり, 同じ要素を複数回追加しても重複は除かない
+    """
+    def __init__(self):
+        """初期化
+
+        Attributes:
+            _columns: 要素の型をキーにした `ComponentColumns` の辞書
+        """
+        self._columns: dict[type, ComponentColumns] = {
+            cls: ComponentColumns(cls)
+            for cls in (Base, BaseSupply, Lane, LaneSingularPoint, Flow)
+        }
+
+    def __repr__(self):
+        str_size = ", ".join(
+            f"{cls.__name__}={len(cols)}" for cls, cols in self._columns.items()
+        )
+        return f"{self.__class__.__name__}({str_size})"
+
+    def columns_of(self, component_class: type) -> ComponentColumns:
+        return self._columns[component_class]
+
+    def column(self, component_class: type, name: str) -> np.ndarray:
+        """要素の型と列名を指定して列配列を取得"""
+        return self._columns[component_class].column(name)
+
+    def add(self, aGraphComponent: GraphComponent):
+        """グラフの構成要素の追加
+
+        サブグラフが追加された場合はその中の要素を全て追加する
+        """
+        columns = self._columns.get(type(aGraphComponent))
+        if columns is not None:
+            columns.append(dataclasses.astuple(aGraphComponent))
+            return
+
+        if isinstance(aGraphComponent, ArrayGraph):
+            for cls, cols in aGraphComponent._columns.items():
+                self.add_columns(cls, **{
+                    name: cols.column(name) for name in cols.fields
+                })
+            return
+
+        # `Graph` などのサブグラフは要素の型ごとに列に変換してまとめて追加
+        components_by_class = {
+            Base: aGraphComponent.bases(),
+            BaseSupply: aGraphComponent.base_supplies(),
+            Lane: aGraphComponent.lanes(),
+            LaneSingularPoint: aGraphComponent.lane_singular_points(),
+            Flow: aGraphComponent.flows(),
+        }
+        for cls, components in components_by_class.items():
+            if not components:
+                continue
+            self.add_columns(cls, **{
+                name: [getattr(gc, name) for gc in components]
+                for name in self._columns[cls].fields
+            })
+
+    @classmethod
+    def from_graph(cls, aGraph: GraphComponent) -> 'ArrayGraph':
+        """`Graph` などのグラフから, 同じ要素を持つ `ArrayGraph` を作成"""
+        output = cls()
+        output.add(aGraph)
+        return output
+
+    def add_columns(self, component_class: type, **columns: Iterable):
+        """要素の型を指定して, 列ごとの値をまとめて追加
+
+        Example:
+            >>> ArrayGraph().add_columns(
+                    Lane, id_=[0], start_base_id=[0], end_base_id=[1],
+                    cost_by_quantity=[1], opening_cost=[1], quantity_upper=[1]
+                )
+        """
+        self._columns[component_class].extend(columns)
+
+    # 要素の取得 ################################################################
+    def bases(self) -> set[Base]:
+        return self._columns[Base].view()
+
+    def base_supplies(self) -> set[BaseSupply]:
+        return self._columns[BaseSupply].view()
+
+    def lanes(self) -> set[Lane]:
+        return self._columns[Lane].view()
+
+    def lane_singular_points(self) -> set[LaneSingularPoint]:
+        return self._columns[LaneSingularPoint].view()
+
+    def flows(self) -> set[Flow]:
+        return self._columns[Flow].view()
+
+    def _search(self, component_class: type, **keys: int) -> GraphComponent:
+        """列の値が全て一致する最初の行のインスタンスを出力. 無ければ KeyError"""
+        columns = self._columns[component_class]
+        (name_first, key_first), *others = keys.items()
+        rows = columns.rows_by(name_first, key_first)
+        for name, key in others:
+            rows = rows[columns.column(name)[rows] == key]
+        if not len(rows):
+            raise KeyError(tuple(keys.values()))
+        return columns.make(rows[:1])[0]
+
+    def _same(self, component_class: type, name: str, key: int) -> set:
+        columns = self._columns[component_class]
+        return set(columns.make(columns.rows_by(name, key)))
+
+    def search_base(self, base_id: int) -> Base:
+        return self._search(Base, id_=base_id)
+
+    def search_lane(self, lane_id: int) -> Lane:
+        return self._search(Lane, id_=lane_id)
+
+    def search_lane_singular_point(
+        self, lane_id: int, singular_point: int
+    ) -> LaneSingularPoint:
+        return self._search(
+            LaneSingularPoint, lane_id=lane_id, singular_point=singular_point
+        )
+
+    def search_flow_by_start(
+        self, lane_id: int, start_singular_point: int
+    ) -> Flow:
+        return self._search(
+            Flow, lane_id=lane_id, start_singular_point=start_singular_point
+        )
+
+    def search_flow_by_end(
+        self, lane_id: int, end_singular_point: int
+    ) -> Flow:
+        return self._search(
+            Flow, lane_id=lane_id, end_singular_point=end_singular_point
+        )
+
+    def base_supplies_same_base(self, base_id: int) -> set[BaseSupply]:
+        return self._same(BaseSupply, "base_id", base_id)
+
+    def lanes_same_start(self, base_id: int) -> set[Lane]:
+        return self._same(Lane, "start_base_id", base_id)
+
+    def lanes_same_end(self, base_id: int) -> set[Lane]:
+        return self._same(Lane, "end_base_id", base_id)
+
+    def lane_singular_points_same_lane(
+        self, lane_id: int
+    ) -> set[LaneSingularPoint]:
+        return self._same(LaneSingularPoint, "lane_id", lane_id)
+
+    def flows_same_lane(self, lane_id: int) -> set[Flow]:
+        return self._same(Flow, "lane_id", lane_id)
+
+    def costs(self):
+        """総コストを列配列から計算"""
+        def prod(cls, name_a, name_b):
+            return np.dot(
+                self.column(cls, name_a).astype(np.float64),
+                self.column(cls, name_b).astype(np.float64)
+            )
+        output = (
+            self.column(Base, "opening_cost").sum(dtype=np.int64)
+            + self.column(Lane, "opening_cost").sum(dtype=np.int64)
+            + prod(BaseSupply, "quantity", "cost_by_quantity")
+            + prod(Flow, "cost_by_quantity", "quantity")
+        )
+        return output.item()
+
+    def add_zero_flow(self):
+        """現在のレーン, コスト変化点情報をもとに, コスト変化点区間の物量を0としてグラフに追加
+
+        Note:
+            * `Graph.add_zero_flow` と同じ区間を, レーンごとのループを使わずに作成する
+            * レーンに存在しないコスト変化点は無視する
+        """
+        lane_id = self.column(Lane, "id_")
+        lane_cost = self.column(Lane, "cost_by_quantity")
+        lane_upper = self.column(Lane, "quantity_upper")
+        lsp_lane_id = self.column(LaneSingularPoint, "lane_id")
+        is_valid = np.isin(lsp_lane_id, lane_id)
+        lsp_lane_id = lsp_lane_id[is_valid]
+        lsp_point = self.column(LaneSingularPoint, "singular_point")[is_valid]
+        lsp_cost = self.column(LaneSingularPoint, "cost_by_quantity")[is_valid]
+
+        # 各レーンの 0 からの区間と, 各コスト変化点からの区間の開始点を並べる
+        flow_lane_id = np.concatenate([lane_id, lsp_lane_id])
+        flow_start = np.concatenate([np.zeros_like(lane_id), lsp_point])
+        flow_cost = np.concatenate([lane_cost, lsp_cost])
+        order = np.lexsort((flow_start, flow_lane_id))
+        flow_lane_id = flow_lane_id[order]
+        flow_start = flow_start[order]
+        flow_cost = flow_cost[order]
+
+        # 区間の終了点は, 同じレーンの次の開始点. レーンの最後の区間はレーンの上限
+        sorter = np.argsort(lane_id, kind="stable")
+        row_lane = sorter[np.searchsorted(lane_id, flow_lane_id, sorter=sorter)]
+        flow_end = lane_upper[row_lane].copy()
+        is_same_lane = flow_lane_id[1:] == flow_lane_id[:-1]
+        flow_end[:-1][is_same_lane] = flow_start[1:][is_same_lane]
+
+        self.add_columns(
+            Flow,
+            lane_id=flow_lane_id,
+            start_singular_point=flow_start,
+            end_singular_point=flow_end,
+            cost_by_quantity=flow_cost,
+            quantity=np.zeros(len(flow_lane_id)),
+        )
+
+    def nbytes(self) -> int:
+        """列配列が使用しているバイト数"""
+        return sum(
+            arr.nbytes
+            for cols in self._columns.values()
+            for arr in (cols.column(name) for name in cols.fields)
+        )
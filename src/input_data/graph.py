@@ -6,6 +6,8 @@ Composite パターンにより, 拠点, レーン, レーンごとのコスト
 """
 from __future__ import annotations
 from abc import ABCMeta, abstractmethod
+from collections import defaultdict
+from collections.abc import Iterable
 import dataclasses
 
 
@@ -14,7 +16,14 @@ class GraphAddException(Exception):
 
 
 class GraphComponent(metaclass=ABCMeta):
-    """グラフを形成する component クラス"""
+    """グラフを形成する component クラス
+
+    Note:
+        * 子クラスの dataclass が `slots=True` でインスタンスごとの `__dict__` を
+            持たないよう, このクラスも空の `__slots__` を持つ
+    """
+    __slots__ = ()
+
     def bases(self) -> set['Base']:
         return set()
 
@@ -51,6 +60,11 @@ class GraphComponent(metaclass=ABCMeta):
     def add(self, graph_component: 'GraphComponent'):
         raise GraphAddException
 
+    def add_many(self, graph_components: Iterable['GraphComponent']):
+        """複数のグラフの構成要素の追加"""
+        for component in graph_components:
+            self.add(component)
+
     def to_tuple(self):
         """子クラスが持つ, tuple型への変換
         """
@@ -141,7 +155,7 @@ class GraphComponent(metaclass=ABCMeta):
         return output
 
 
-@dataclasses.dataclass(frozen=True)
+@dataclasses.dataclass(frozen=True, slots=True)
 class Base(GraphComponent):
     """拠点を表すクラス
 
@@ -157,8 +171,15 @@ class Base(GraphComponent):
     quantity_demand: int
 
     def __eq__(self, other) -> bool:
+        """同じIDならば同じ拠点とする"""
+        if not isinstance(other, Base):
+            return NotImplemented
         return self.id_ == other.id_
 
+    def __hash__(self) -> int:
+        """`__eq__` と一致するよう, IDのみからハッシュ値を計算"""
+        return hash(self.id_)
+
     def bases(self):
         return {self}
 
@@ -166,7 +187,7 @@ class Base(GraphComponent):
         return self.opening_cost
 
 
-@dataclasses.dataclass(frozen=True)
+@dataclasses.dataclass(frozen=True, slots=True)
 class BaseSupply(GraphComponent):
     """各拠点で生産される量
 
@@ -188,7 +209,7 @@ class BaseSupply(GraphComponent):
         return {self}
 
 
-@dataclasses.dataclass(frozen=True)
+@dataclasses.dataclass(frozen=True, slots=True)
 class Lane(GraphComponent):
     """レーンを表すクラス
 
@@ -210,8 +231,13 @@ class Lane(GraphComponent):
     def __eq__(self, other) -> bool:
         """同じIDならば同じレーンとする
         """
+        if not isinstance(other, Lane):
+            return NotImplemented
         return self.id_ == other.id_
 
+    def __hash__(self) -> int:
+        return hash(self.id_)
+
     def lanes(self):
         return {self}
 
@@ -219,7 +245,7 @@ class Lane(GraphComponent):
         return self.opening_cost
 
 
-@dataclasses.dataclass(frozen=True)
+@dataclasses.dataclass(frozen=True, slots=True)
 class LaneSingularPoint(GraphComponent):
     """物量によって変化するレーンのコストを表すクラス
 
@@ -234,10 +260,15 @@ class LaneSingularPoint(GraphComponent):
     cost_by_quantity: int
 
     def __eq__(self, other) -> bool:
+        if not isinstance(other, LaneSingularPoint):
+            return NotImplemented
         is_same_lane = self.lane_id == other.lane_id
         is_same_singularity = self.singular_point == other.singular_point
         return is_same_lane and is_same_singularity
 
+    def __hash__(self) -> int:
+        return hash((self.lane_id, self.singular_point))
+
     def lane_singular_points(self):
         return {self}
 
@@ -246,7 +277,7 @@ class LaneSingularPoint(GraphComponent):
         return 0
 
 
-@dataclasses.dataclass(frozen=True)
+@dataclasses.dataclass(frozen=True, slots=True)
 class Flow(GraphComponent):
     """レーンを流れる物量にかかるコストと, 流れている量を格納するクラス
 
@@ -272,7 +303,7 @@ class Flow(GraphComponent):
         return self.end_singular_point - self.start_singular_point
 
 
-@dataclasses.dataclass(frozen=True)
+@dataclasses.dataclass(frozen=True, slots=True)
 class GraphComponentTemplate(GraphComponent):
     """グラフに要素を追加する際のテンプレート"""
     id_: int
@@ -284,22 +315,58 @@ class GraphComponentTemplate(GraphComponent):
 class Graph(GraphComponent):
     """グラフの要素を集めて1つのグラフとしたクラス
 
-    グラフの要素の走査に時間がかかるため, 一度走査した要素はキャッシュして属性として取得しておく
-
-    Attributes:
-        prefix_attrb_cached: キャッシュ属性につく前置詞名
+    グラフの要素の走査に時間がかかるため, 要素は型ごとの集合に分けて保持しておく.
+    型ごとの集合に加え, 拠点・レーンIDから隣接する要素を引く索引と, IDから要素を引く辞書も
+    `add` の度にその場で更新し, 読み込みと追加を交互に行っても全要素を走査し直さないようにする
     """
-    prefix_attrb_cached = "_cache"
-
     def __init__(self):
         """初期化
 
         Args:
             graph_components: GraphComponent クラスのインスタンス集合.
                 サブグラフの集合がグラフと考える
+
+        Attributes:
+            _bases: 拠点の集合
+            _base_supplies: 拠点生産量の集合
+            _lanes: レーンの集合
+            _lane_singular_points: コスト変化点の集合
+            _flows: 物量の集合
+            _lanes_by_start: 出発拠点IDごとのレーン集合
+            _lanes_by_end: 到着拠点IDごとのレーン集合
+            _base_supplies_by_base: 拠点IDごとの拠点生産量集合
+            _lane_singular_points_by_lane: レーンIDごとのコスト変化点集合
+            _flows_by_lane: レーンIDごとの物量集合
+            _base_by_id: 拠点IDをキーにした拠点の辞書
+            _lane_by_id: レーンIDをキーにしたレーンの辞書
+            _lane_singular_point_by_key: (レーンID, コスト変化点) をキーにした
+                コスト変化点の辞書
+            _flow_by_start: (レーンID, コスト変化開始点) をキーにした物量の辞書
+            _flow_by_end: (レーンID, コスト変化終了点) をキーにした物量の辞書
         """
         self.graph_components: set[GraphComponent] = set()
 
+        self._bases: set[Base] = set()
+        self._base_supplies: set[BaseSupply] = set()
+        self._lanes: set[Lane] = set()
+        self._lane_singular_points: set[LaneSingularPoint] = set()
+        self._flows: set[Flow] = set()
+
+        self._lanes_by_start: defaultdict[int, set[Lane]] = defaultdict(set)
+        self._lanes_by_end: defaultdict[int, set[Lane]] = defaultdict(set)
+        self._base_supplies_by_base: defaultdict[int, set[BaseSupply]] = \
+            defaultdict(set)
+        self._lane_singular_points_by_lane: \
+            defaultdict[int, set[LaneSingularPoint]] = defaultdict(set)
+        self._flows_by_lane: defaultdict[int, set[Flow]] = defaultdict(set)
+
+        self._base_by_id: dict[int, Base] = {}
+        self._lane_by_id: dict[int, Lane] = {}
+        self._lane_singular_point_by_key: \
+            dict[tuple[int, int], LaneSingularPoint] = {}
+        self._flow_by_start: dict[tuple[int, int], Flow] = {}
+        self._flow_by_end: dict[tuple[int, int], Flow] = {}
+
     def __repr__(self):
         str_components = ", ".join(repr(gp) for gp in self.graph_components)
         return f"{self.__class__.__name__}({str_components})"
@@ -307,135 +374,237 @@ class Graph(GraphComponent):
     def add(self, aGraphComponent: GraphComponent):
         """グラフの構成要素の追加
 
-        キャッシュ属性を削除してから追加
+        型ごとの集合, 索引もその場で更新する
         """
-        # キャッシュ属性の削除. イテレータのままfor文回すとサイズが変更されるためエラー
-        lst_cached_attrb = list(
-            attrb for attrb in self.__dict__.keys()
-            if attrb.startswith(self.prefix_attrb_cached)
-        )
-        for attrb in lst_cached_attrb:
-            delattr(self, attrb)
         self.graph_components.add(aGraphComponent)
+        self._register(aGraphComponent)
+
+    def add_many(self, graph_components: Iterable[GraphComponent]):
+        """複数のグラフの構成要素をまとめて追加
+
+        構成要素の集合は1度の `update` で更新し, 型ごとの集合, 索引は要素ごとにその場で更新する.
+        読み込みや乱数による作成など, 大量の要素を追加する場合はこちらを使用する
+        """
+        lst_graph_component = list(graph_components)
+        self.graph_components.update(lst_graph_component)
+        for component in lst_graph_component:
+            self._register(component)
+
+    def _register(self, aGraphComponent: GraphComponent):
+        """追加された要素を型ごとの集合, 索引, IDをキーにした辞書に登録
+
+        Note:
+            * 要素の型がわかっている場合は型ごとの登録処理のみ実行する
+            * サブグラフが追加された場合はその中の要素を全て登録する
+            * 集合への追加と同様, 同じキーの要素が既にあれば先に追加された要素を残す
+        """
+        register = self._register_by_type.get(type(aGraphComponent))
+        if register is not None:
+            register(self, aGraphComponent)
+            return
+
+        for base in aGraphComponent.bases():
+            self._register_base(base)
+        for bs in aGraphComponent.base_supplies():
+            self._register_base_supply(bs)
+        for lane in aGraphComponent.lanes():
+            self._register_lane(lane)
+        for lsp in aGraphComponent.lane_singular_points():
+            self._register_lane_singular_point(lsp)
+        for flow in aGraphComponent.flows():
+            self._register_flow(flow)
+
+    def _register_base(self, aBase: Base):
+        self._bases.add(aBase)
+        self._base_by_id.setdefault(aBase.id_, aBase)
+
+    def _register_base_supply(self, aBaseSupply: BaseSupply):
+        self._base_supplies.add(aBaseSupply)
+        self._base_supplies_by_base[aBaseSupply.base_id].add(aBaseSupply)
+
+    def _register_lane(self, aLane: Lane):
+        self._lanes.add(aLane)
+        self._lane_by_id.setdefault(aLane.id_, aLane)
+        self._lanes_by_start[aLane.start_base_id].add(aLane)
+        self._lanes_by_end[aLane.end_base_id].add(aLane)
+
+    def _register_lane_singular_point(self, lsp: LaneSingularPoint):
+        self._lane_singular_points.add(lsp)
+        self._lane_singular_point_by_key.setdefault(
+            (lsp.lane_id, lsp.singular_point), lsp
+        )
+        self._lane_singular_points_by_lane[lsp.lane_id].add(lsp)
+
+    def _register_flow(self, aFlow: Flow):
+        self._flows.add(aFlow)
+        self._flow_by_start.setdefault(
+            (aFlow.lane_id, aFlow.start_singular_point), aFlow
+        )
+        self._flow_by_end.setdefault(
+            (aFlow.lane_id, aFlow.end_singular_point), aFlow
+        )
+        self._flows_by_lane[aFlow.lane_id].add(aFlow)
+
+    # 型ごとの登録処理. サブグラフなど, ここにない型は全ての要素を走査して登録する
+    _register_by_type = {
+        Base: _register_base,
+        BaseSupply: _register_base_supply,
+        Lane: _register_lane,
+        LaneSingularPoint: _register_lane_singular_point,
+        Flow: _register_flow,
+    }
+
+    def remove(self, aGraphComponent: GraphComponent):
+        """グラフの構成要素の削除
+
+        型ごとの集合, 索引もその場で更新する
+
+        Note:
+            * 削除できるのは `add` で直接追加された拠点, 拠点生産量, レーン,
+                コスト変化点, 物量のみ. サブグラフの中の要素は削除できない
+        """
+        unregister = self._unregister_by_type.get(type(aGraphComponent))
+        if unregister is None or aGraphComponent not in self.graph_components:
+            raise KeyError(aGraphComponent)
+        self.graph_components.discard(aGraphComponent)
+        unregister(self, aGraphComponent)
+
+    def replace(self, old: GraphComponent, new: GraphComponent):
+        """グラフの構成要素を入れ替える
+
+        拠点・レーンのように同じIDで等しいとみなされる要素は, 追加するだけでは
+        先に追加された要素が残るため, 一度削除してから追加する
+        """
+        self.remove(old)
+        self.add(new)
+
+    @staticmethod
+    def _pop_if_same(dct: dict, key, value):
+        """辞書に登録されている要素が削除する要素と等しい場合のみ, 辞書から削除"""
+        if dct.get(key) == value:
+            del dct[key]
+
+    def _unregister_base(self, aBase: Base):
+        self._bases.discard(aBase)
+        self._pop_if_same(self._base_by_id, aBase.id_, aBase)
+
+    def _unregister_base_supply(self, aBaseSupply: BaseSupply):
+        self._base_supplies.discard(aBaseSupply)
+        self._base_supplies_by_base[aBaseSupply.base_id].discard(aBaseSupply)
+
+    def _unregister_lane(self, aLane: Lane):
+        self._lanes.discard(aLane)
+        self._pop_if_same(self._lane_by_id, aLane.id_, aLane)
+        self._lanes_by_start[aLane.start_base_id].discard(aLane)
+        self._lanes_by_end[aLane.end_base_id].discard(aLane)
+
+    def _unregister_lane_singular_point(self, lsp: LaneSingularPoint):
+        self._lane_singular_points.discard(lsp)
+        self._pop_if_same(
+            self._lane_singular_point_by_key,
+            (lsp.lane_id, lsp.singular_point), lsp
+        )
+        self._lane_singular_points_by_lane[lsp.lane_id].discard(lsp)
+
+    def _unregister_flow(self, aFlow: Flow):
+        self._flows.discard(aFlow)
+        self._pop_if_same(
+            self._flow_by_start,
+            (aFlow.lane_id, aFlow.start_singular_point), aFlow
+        )
+        self._pop_if_same(
+            self._flow_by_end,
+            (aFlow.lane_id, aFlow.end_singular_point), aFlow
+        )
+        self._flows_by_lane[aFlow.lane_id].discard(aFlow)
+
+    # 型ごとの削除処理
+    _unregister_by_type = {
+        Base: _unregister_base,
+        BaseSupply: _unregister_base_supply,
+        Lane: _unregister_lane,
+        LaneSingularPoint: _unregister_lane_singular_point,
+        Flow: _unregister_flow,
+    }
+
+    def search_base(self, base_id: int) -> Base:
+        """入力されたIDの `Base` class instance を出力"""
+        return self._base_by_id[base_id]
+
+    def search_lane(self, lane_id: int) -> Lane:
+        """入力されたIDの `Lane` class instance を出力"""
+        return self._lane_by_id[lane_id]
+
+    def search_lane_singular_point(
+        self, lane_id: int, singular_point: int
+    ) -> LaneSingularPoint:
+        """入力されたレーンID, コスト変化点をもつ `LaneSingularPoint` class instance を出力"""
+        return self._lane_singular_point_by_key[lane_id, singular_point]
 
     def bases(self):
-        """拠点一覧を, キャッシュがあればキャッシュから, そうでなければ走査して出力"""
-        attrb_name = f"{self.prefix_attrb_cached}_bases"
-        if hasattr(self, attrb_name):
-            return getattr(self, attrb_name)
-
-        output = set()
-        for gp in self.graph_components:
-            output.update(gp.bases())
-        setattr(self, attrb_name, output)
-        return output
+        """拠点一覧を出力. 追加の度に更新されている集合をそのまま返すため, 変更しないこと"""
+        return self._bases
 
     def base_supplies(self):
-        """拠点生産情報一覧を, キャッシュがあればキャッシュから, そうでなければ走査して出力"""
-        attrb_name = f"{self.prefix_attrb_cached}_base_supplies"
-        if hasattr(self, attrb_name):
-            return getattr(self, attrb_name)
-
-        output = set()
-        for gp in self.graph_components:
-            output.update(gp.base_supplies())
-        setattr(self, attrb_name, output)
-        return output
+        """拠点生産情報一覧を出力"""
+        return self._base_supplies
 
     def base_supplies_same_base(self, base_id: int) -> set[BaseSupply]:
         """同じ拠点IDを持つ拠点生産量集合を抽出"""
-        output = set(
-            base_supply for base_supply in self.base_supplies()
-            if base_supply.base_id == base_id
-        )
-        return output
+        return set(self._base_supplies_by_base.get(base_id, ()))
 
     def lanes(self):
-        """レーン情報一覧を, キャッシュがあればキャッシュから, そうでなければ走査して出力"""
-        attrb_name = f"{self.prefix_attrb_cached}_lanes"
-        if hasattr(self, attrb_name):
-            return getattr(self, attrb_name)
-
-        output = set()
-        for gp in self.graph_components:
-            output.update(gp.lanes())
-        setattr(self, attrb_name, output)
-        return output
+        """レーン情報一覧を出力"""
+        return self._lanes
 
     def lanes_same_start(self, base_id: int) -> set[Lane]:
         """レーンの出発拠点IDが入力拠点IDと同じレーン集合を出力"""
-        return set(ln for ln in self.lanes() if ln.start_base_id == base_id)
+        return set(self._lanes_by_start.get(base_id, ()))
 
     def lanes_same_end(self, base_id: int) -> set[Lane]:
         """レーンの到着拠点IDが入力拠点IDと同じレーン集合を出力"""
-        return set(ln for ln in self.lanes() if ln.end_base_id == base_id)
+        return set(self._lanes_by_end.get(base_id, ()))
 
     def lane_singular_points(self):
-        """レーンのコスト変化点情報一覧を, キャッシュがあればキャッシュから, そうでなければ走査して出力"""
-        attrb_name = f"{self.prefix_attrb_cached}_lane_singular_points"
-        if hasattr(self, attrb_name):
-            return getattr(self, attrb_name)
-
-        output = set()
-        for gp in self.graph_components:
-            output.update(gp.lane_singular_points())
-        setattr(self, attrb_name, output)
-        return output
+        """レーンのコスト変化点情報一覧を出力"""
+        return self._lane_singular_points
 
     def lane_singular_points_same_lane(
         self, lane_id: int
     ) -> set[LaneSingularPoint]:
         """同じレーンIDを持つコスト変化点集合を抽出"""
-        output = set(
-            lsp for lsp in self.lane_singular_points()
-            if lsp.lane_id == lane_id
-        )
-        return output
+        return set(self._lane_singular_points_by_lane.get(lane_id, ()))
 
     def flows(self):
-        """輸送量情報一覧を, キャッシュがあればキャッシュから, そうでなければ走査して出力"""
-        attrb_name = f"{self.prefix_attrb_cached}_flows"
-        if hasattr(self, attrb_name):
-            return getattr(self, attrb_name)
-
-        output = set()
-        for gp in self.graph_components:
-            output.update(gp.flows())
-        setattr(self, attrb_name, output)
-        return output
+        """輸送量情報一覧を出力"""
+        return self._flows
 
     def flows_same_lane(self, lane_id: int) -> set[Flow]:
         """同じレーンIDを持つコスト変化点ごとの物量の一覧を抽出"""
-        output = set(flow for flow in self.flows() if flow.lane_id == lane_id)
-        return output
+        return set(self._flows_by_lane.get(lane_id, ()))
 
     def search_flow_by_start(
         self, lane_id: int, start_singular_point: int
     ) -> GraphComponent:
         """入力されたレーンID, コスト変化開始点をもつ class instance を出力"""
-        flow_by_id_singular_point = {
-            (flow.lane_id, flow.start_singular_point): flow
-            for flow in self.flows()
-        }
-        return flow_by_id_singular_point[lane_id, start_singular_point]
+        return self._flow_by_start[lane_id, start_singular_point]
 
     def search_flow_by_end(
         self, lane_id: int, end_singular_point: int
     ) -> GraphComponent:
         """入力されたレーンID, コスト変化終了点をもつ class instance を出力"""
-        flow_by_id_singular_point = {
-            (flow.lane_id, flow.end_singular_point): flow
-            for flow in self.flows()
-        }
-        return flow_by_id_singular_point[lane_id, end_singular_point]
+        return self._flow_by_end[lane_id, end_singular_point]
 
     def costs(self):
-        return sum(gc.costs() for gc in self.graph_components)
+        return sum(
+            component.costs() for component in self.graph_components
+        )
 
-    def add_zero_flow_by_lane(
-        self, aLane: Lane, lst_lsp: list[LaneSingularPoint]
-    ):
-        """入力されたレーンについて, コスト変化点区間の輸送量を0としてグラフに追加
+    @staticmethod
+    def make_zero_flows_by_lane(
+        aLane: Lane, lst_lsp: list[LaneSingularPoint]
+    ) -> list[Flow]:
+        """入力されたレーンについて, コスト変化点区間の輸送量を0とした物量のリストを作成
 
         Attributes:
             aLane: 0の輸送量を設定するレーン
@@ -448,15 +617,15 @@ class Graph(GraphComponent):
 
         # もしコスト変化点がなければ, 0からレーンの上限値までをレーンのコストに紐づけて出力
         if not lst_lsp:
-            self.add(GraphComponent.flow(id_, 0, upper, base_cost))
-            return
+            return [GraphComponent.flow(id_, 0, upper, base_cost)]
 
         # コスト変化点が存在するならば, コスト変化区間を積み上げ
+        output = []
         last_singular = 0
         last_cost_by_quantity = base_cost
         for lsp in lst_lsp:
             # 1つ前の変化点から現在の変化点は1つ前の物量あたりコストと設定
-            self.add(GraphComponent.flow(
+            output.append(GraphComponent.flow(
                 id_, last_singular, lsp.singular_point, last_cost_by_quantity
             ))
             # 1つ前の変化点の情報を更新
@@ -465,29 +634,36 @@ class Graph(GraphComponent):
         else:
             # 全ての変化点まで走査したら最後に, 最後の変化点からレーンの上限までを追加
             # もし最後の変化点が上限を超えていたらエラーを返す
-            self.add(GraphComponent.flow(
+            output.append(GraphComponent.flow(
                 id_, last_singular, upper, last_cost_by_quantity
             ))
+        return output
+
+    def add_zero_flow_by_lane(
+        self, aLane: Lane, lst_lsp: list[LaneSingularPoint]
+    ):
+        """入力されたレーンについて, コスト変化点区間の輸送量を0としてグラフに追加
+
+        Attributes:
+            aLane: 0の輸送量を設定するレーン
+            lst_lsp: レーンのコスト変化点のリスト. コスト変化点の昇順に並べられている
+        """
+        self.add_many(self.make_zero_flows_by_lane(aLane, lst_lsp))
 
     def add_zero_flow(self):
         """現在のレーン,　コスト変化点情報をもとに, コスト変化点区間の物量を0としてグラフに追加
 
         Note:
-            * `add` method が実行されるとキャッシュがリセットされるため, レーンに紐づく
-                コスト変化点のリストを取得するのに時間がかかる. そのため,
-                あらかじめ全てのレーンに対するコスト変化点のリストを取得しておく
+            * 全てのレーンについて物量を作成してから, まとめてグラフに追加する
 
         todo:
             * あらかじめ物量が与えられている時にどのように追加するか
         """
-        # レーンごとの変化点集合をあらかじめ取得
-        dct_lsp = {
-            lane.id_: sorted(
-                list(self.lane_singular_points_same_lane(lane.id_)),
-                key=lambda x: x.singular_point
-                )
-            for lane in self.lanes()
-        }
-        # レーンごとに追加される
+        lst_flow = []
         for lane in self.lanes():
-            self.add_zero_flow_by_lane(lane, dct_lsp[lane.id_])
+            lst_lsp = sorted(
+                self._lane_singular_points_by_lane.get(lane.id_, ()),
+                key=lambda x: x.singular_point
+            )
+            lst_flow.extend(self.make_zero_flows_by_lane(lane, lst_lsp))
+        self.add_many(lst_flow)
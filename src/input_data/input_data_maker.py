@@ -7,7 +7,75 @@ import itertools
 from tqdm import tqdm
 import numpy as np
 
-from .graph import Graph
+from .graph import (
+    GraphComponent, Graph, Base, BaseSupply, Lane, LaneSingularPoint
+)
+from .array_graph import ArrayGraph
+
+# 1レーンあたりのコスト変化点の最大数
+max_num_singular_points = 3
+
+# レーンの張り方
+topology_complete = "complete"
+topology_knn = "knn"
+topology_hub = "hub"
+topology_echelon = "echelon"
+topologies = (topology_complete, topology_knn, topology_hub, topology_echelon)
+
+# 最近傍を探す際に, 1度に計算する距離の数の上限
+max_distances_by_chunk = 10_000_000
+
+
+def nearest_indices(
+    points: np.ndarray, candidates: np.ndarray, k: int,
+    is_same: bool = False
+) -> np.ndarray:
+    """各点から近い順に `k` 個の候補の行番号. 形は (点の数, k)
+
+    距離の行列を全て保持しないよう, 点を分けて計算する
+
+    Args:
+        points: 点の座標. 形は (点の数, 2)
+        candidates: 候補の座標. 形は (候補の数, 2)
+        k: 選ぶ候補の数. 候補の数を超える場合は候補の数とする
+        is_same: 点と候補が同じ配列であれば True とし, 自分自身は選ばない
+    """
+    k = min(k, len(candidates) - is_same)
+    if k <= 0 or not len(points):
+        return np.empty((len(points), 0), dtype=np.int64)
+    chunk_size = max(max_distances_by_chunk // len(candidates), 1)
+    output = []
+    for start in range(0, len(points), chunk_size):
+        chunk = points[start:start+chunk_size]
+        distance = np.linalg.norm(
+            chunk[:, np.newaxis, :] - candidates[np.newaxis, :, :], axis=2
+        )
+        if is_same:
+            rows = np.arange(len(chunk))
+            distance[rows, rows + start] = np.inf
+        nearest = np.argpartition(distance, k - 1, axis=1)[:, :k]
+        # 近い順に並べる
+        order = np.argsort(
+            np.take_along_axis(distance, nearest, axis=1), axis=1
+        )
+        output.append(np.take_along_axis(nearest, order, axis=1))
+    return np.concatenate(output)
+
+
+def pairs_to_nearest(
+    coordinates: np.ndarray, sources: np.ndarray, targets: np.ndarray,
+    k: int
+) -> tuple[np.ndarray, np.ndarray]:
+    """各出発拠点から, 近い順に `k` 個の到着拠点への組
+
+    Args:
+        coordinates: 全ての拠点の座標. 行番号を拠点 ID とする
+        sources: 出発拠点の ID の配列
+        targets: 到着拠点の ID の配列
+    """
+    nearest = nearest_indices(coordinates[sources], coordinates[targets], k)
+    start_base_id = np.repeat(sources, nearest.shape[1])
+    return start_base_id, targets[nearest.ravel()]
 
 
 @dataclasses.dataclass
@@ -164,6 +232,7 @@ class InputDataMaker:
                 そうでなければ乱数で設定
         """
         lane_id_count = 0
+        lst_lane = []
 
         # 全拠点の集合の直積をとり, 1つの for loop ですます
         iter_base_ids = range(self.num_base)
@@ -178,8 +247,10 @@ class InputDataMaker:
                 lane_id_count, start_base_id, end_base_id,
                 start_base_id in set_id_supply and end_base_id in set_id_demand
             )
-            aGraph.add(aLane)
+            lst_lane.append(aLane)
             lane_id_count += 1
+        # 作成したレーンはまとめて追加
+        aGraph.add_many(lst_lane)
         return aGraph
 
     def add_lane_singular_points(
@@ -194,6 +265,7 @@ class InputDataMaker:
             * レーンの物量上限がコスト変化点数より小さい場合も同様
             * コスト変化点より大きい流量のコストはそれ以前のコストより小さくなるよう乱数で設定
         """
+        lst_lsp = []
         lanes = aGraph.lanes()
         for aLane in lanes:
             max_num_singular_points = min(
@@ -217,10 +289,12 @@ class InputDataMaker:
                 obj = Graph.lane_singular_point(
                     aLane.id_, singular_point, cost
                 )
-                aGraph.add(obj)
+                lst_lsp.append(obj)
                 # コストの上限値, コスト変化点の下限値の更新
                 upper_cost = cost
                 lower_singular_point = singular_point + 1
+        # 作成したコスト変化点はまとめて追加
+        aGraph.add_many(lst_lsp)
         return aGraph
 
     def run(self, aGraph: Graph) -> Graph:
@@ -232,3 +306,317 @@ class InputDataMaker:
         aGraph = self.add_lanes(aGraph, set_id_supply, set_id_demand)
         aGraph = self.add_lane_singular_points(aGraph)
         return aGraph
+
+
+@dataclasses.dataclass
+class ArrayInputDataMaker:
+    """物流ネットワークグラフを NumPy の乱数で列ごとにまとめて作成するクラス
+
+    `InputDataMaker` と同じ規則で, 拠点・レーン・コスト変化点を要素ごとではなく
+    属性ごとの配列として作成する. 乱数は `random_seed` で初期化した
+    `numpy.random.Generator` のみから取るため, 同じ種であれば同じグラフとなる
+
+    Example:
+        >>> columns = ArrayInputDataMaker(100).make_columns()
+        >>> aDataHandler.write_processed_columns(columns)
+            要素のインスタンスを作成せずに処理済みのデータとして書き込まれる
+
+    レーンの張り方は `topology` で指定する.
+
+        * `complete`: 完全グラフ. `InputDataMaker` と同じ
+        * `knn`: 平面上の乱数の座標で, 各拠点と近い順に `num_neighbors` 個の拠点を双方向に結ぶ
+        * `hub`: `num_hubs` 個のハブ同士を全て結び, それ以外の拠点は近い順に
+            `num_neighbors` 個のハブと双方向に結ぶ
+        * `echelon`: 生産拠点 → `num_hubs` 個の配送拠点 → それ以外の拠点の3層とし,
+            各層の拠点を次の層の近い順に `num_neighbors` 個の拠点と結ぶ.
+            各層の拠点が前の層の近い順に `num_neighbors` 個の拠点から結ばれるようにもする
+
+    完全グラフ以外では, レーンの物量あたりコストは拠点間の距離とする.
+    どの張り方でも生産-需要拠点間のレーンは最大値の係数で作成するため, 実行可能性は変わらない
+
+    Example:
+        >>> ArrayInputDataMaker(500, topology="knn", num_neighbors=5)
+            各拠点から近い5拠点と結ぶ, レーン数が拠点数に比例するグラフとなる
+
+    Attributes:
+        num_base: 作成する拠点の数
+        num_supply_demand: 生産拠点の生産上限. 需要拠点の需要量はこの値までの乱数で取得
+        max_random: 生成する際にとる乱数の最大値. 0からこの値までが各 Graph の係数となる.
+            拠点の座標も拠点間の最大の距離がこの値となる正方形の中でとる
+        random_seed: 乱数の種
+        topology: レーンの張り方. `topologies` のいずれか
+        num_neighbors: 完全グラフ以外で, 1拠点から結ぶ近い拠点の数. 大きいほど密になる
+        num_hubs: ハブ・配送拠点の数. None ならば拠点数の平方根
+        ratio_convex_lane: コスト変化点の後に物量あたりコストが上がるレーンの割合.
+            0 ならば全てのレーンで `InputDataMaker` と同じく下がる
+    """
+    num_base: int
+    num_supply_demand: int = 100
+    max_random: int = 100
+    random_seed: int = 71
+    topology: str = topology_complete
+    num_neighbors: int = 5
+    num_hubs: int | None = None
+    ratio_convex_lane: float = 0.0
+
+    def __post_init__(self):
+        if self.topology not in topologies:
+            raise ValueError(f"Unknown topology: {self.topology}")
+        if self.num_hubs is None:
+            self.num_hubs = int(np.ceil(np.sqrt(self.num_base)))
+
+    def make_generator(self) -> np.random.Generator:
+        """種を固定した乱数生成器. `make_columns` のたびに作成し直す"""
+        return np.random.default_rng(self.random_seed)
+
+    def decide_id_supply_demand(
+        self, rng: np.random.Generator
+    ) -> tuple[np.ndarray, np.ndarray]:
+        """生産拠点と需要拠点の ID の配列. 重複しないように選ぶ
+
+        Note:
+            * 需要拠点の数は10か拠点数の半分以下, 生産拠点の数は需要拠点数以上とする
+        """
+        max_supply_demand_base = min(10, self.num_base // 2 + 1)
+        num_demand_base = int(rng.integers(1, max_supply_demand_base))
+        num_supply_base = int(
+            rng.integers(num_demand_base, max_supply_demand_base)
+        )
+        choiced_id = rng.permutation(self.num_base)
+        id_demand = np.sort(choiced_id[:num_demand_base])
+        id_supply = np.sort(
+            choiced_id[num_demand_base:num_demand_base+num_supply_base]
+        )
+        return id_supply, id_demand
+
+    def make_base_columns(
+        self, rng: np.random.Generator,
+        id_supply: np.ndarray, id_demand: np.ndarray
+    ) -> tuple[dict[str, np.ndarray], dict[str, np.ndarray]]:
+        """拠点と生産拠点の生産量の列
+
+        値の決め方は `InputDataMaker.add_bases` と同じ
+        """
+        num_base = self.num_base
+        id_ = np.arange(num_base)
+        # 開設費は最低でも1ないと解で開いてしまう
+        opening_cost = rng.integers(1, self.max_random, num_base)
+        quantity_upper = rng.integers(0, self.max_random, num_base)
+        quantity_upper[id_supply] = self.num_supply_demand
+        quantity_upper[id_demand] = self.num_supply_demand
+        quantity_demand = np.zeros(num_base, dtype=np.int64)
+        quantity_demand[id_demand] = rng.integers(
+            1, self.num_supply_demand, len(id_demand)
+        )
+        bases = {
+            "id_": id_,
+            "opening_cost": opening_cost,
+            "quantity_upper": quantity_upper,
+            "quantity_demand": quantity_demand,
+        }
+
+        # 生産拠点が最低限生産しなければいけない量は, 総需要を生産拠点数で割った値未満
+        num_supply = len(id_supply)
+        lower_supply = max(int(quantity_demand.sum() / num_supply), 1)
+        base_supplies = {
+            "base_id": id_supply,
+            "quantity": rng.integers(0, lower_supply, num_supply),
+            "cost_by_quantity": rng.integers(0, self.max_random, num_supply),
+            "upper": np.full(num_supply, self.num_supply_demand),
+        }
+        return bases, base_supplies
+
+    def make_lane_columns(
+        self, rng: np.random.Generator,
+        id_supply: np.ndarray, id_demand: np.ndarray
+    ) -> dict[str, np.ndarray]:
+        """`topology` で指定した張り方のレーンの列
+
+        出発拠点の ID, 到着拠点の ID の順に並べ, 出発地と到着地が同じ組は除く.
+        値の決め方は完全グラフ以外の物量あたりコストを除き, `InputDataMaker.add_lanes` と同じ
+        """
+        num_base = self.num_base
+        if self.topology == topology_complete:
+            num_lane = num_base * (num_base-1)
+            lane_index = np.arange(num_lane)
+            start_base_id = lane_index // (num_base-1)
+            # 出発拠点の ID 以上の到着拠点は1つずらし, 出発拠点自身を飛ばす
+            end_base_id = lane_index % (num_base-1)
+            end_base_id += end_base_id >= start_base_id
+            cost_by_quantity = None
+        else:
+            # 拠点間の最大の距離が `max_random` となる正方形の中で座標をとる
+            coordinates = rng.random((num_base, 2)) \
+                * self.max_random / np.sqrt(2)
+            start_base_id, end_base_id = self.sparse_lane_pairs(
+                rng, coordinates, id_supply, id_demand
+            )
+            num_lane = len(start_base_id)
+            distance = np.linalg.norm(
+                coordinates[start_base_id] - coordinates[end_base_id], axis=1
+            )
+            cost_by_quantity = np.ceil(distance).astype(np.int64).clip(
+                1, self.max_random
+            )
+
+        is_supply = np.zeros(num_base, dtype=bool)
+        is_supply[id_supply] = True
+        is_demand = np.zeros(num_base, dtype=bool)
+        is_demand[id_demand] = True
+        # 生産-需要拠点間のレーンは全て最大値を設定
+        is_lane_supply_demand = \
+            is_supply[start_base_id] & is_demand[end_base_id]
+
+        def coefficient(low: int, values: np.ndarray | None = None):
+            if values is None:
+                values = rng.integers(low, self.max_random, num_lane)
+            return np.where(is_lane_supply_demand, self.max_random, values)
+
+        return {
+            "id_": np.arange(num_lane),
+            "start_base_id": start_base_id,
+            "end_base_id": end_base_id,
+            "cost_by_quantity": coefficient(0, cost_by_quantity),
+            # 開設費は最低でも1ないと解で開いてしまう
+            "opening_cost": coefficient(1),
+            "quantity_upper": coefficient(0),
+        }
+
+    def sparse_lane_pairs(
+        self, rng: np.random.Generator, coordinates: np.ndarray,
+        id_supply: np.ndarray, id_demand: np.ndarray
+    ) -> tuple[np.ndarray, np.ndarray]:
+        """完全グラフ以外の張り方で, レーンの出発拠点と到着拠点の ID の配列
+
+        生産-需要拠点間の組を加え, 重複と出発地と到着地が同じ組を除いて
+        出発拠点の ID, 到着拠点の ID の順に並べる
+        """
+        num_base = self.num_base
+        k = self.num_neighbors
+        id_base = np.arange(num_base)
+        lst_pair = [(
+            np.repeat(id_supply, len(id_demand)),
+            np.tile(id_demand, len(id_supply))
+        )]
+        if self.topology == topology_knn:
+            # 最も近いのは自分自身のため1つ多く選び, 後で除く
+            pair = pairs_to_nearest(coordinates, id_base, id_base, k + 1)
+            lst_pair += [pair, pair[::-1]]
+        elif self.topology == topology_hub:
+            is_hub = np.zeros(num_base, dtype=bool)
+            is_hub[rng.choice(num_base, self.num_hubs, replace=False)] = True
+            id_hub = id_base[is_hub]
+            pair = pairs_to_nearest(coordinates, id_base[~is_hub], id_hub, k)
+            lst_pair += [
+                (np.repeat(id_hub, len(id_hub)), np.tile(id_hub, len(id_hub))),
+                pair, pair[::-1],
+            ]
+        else:
+            # 生産拠点以外から配送拠点を選び, 残りを顧客とする
+            id_other = np.setdiff1d(id_base, id_supply)
+            is_dc = np.zeros(num_base, dtype=bool)
+            is_dc[rng.choice(
+                id_other, min(self.num_hubs, len(id_other)), replace=False
+            )] = True
+            is_dc[id_demand] = False
+            id_dc = id_base[is_dc]
+            id_customer = np.setdiff1d(id_other, id_dc)
+            for id_from, id_to in (
+                (id_supply, id_dc), (id_dc, id_customer)
+            ):
+                pair = pairs_to_nearest(coordinates, id_from, id_to, k)
+                pair_reverse = pairs_to_nearest(coordinates, id_to, id_from, k)
+                lst_pair += [pair, pair_reverse[::-1]]
+
+        start_base_id, end_base_id = (
+            np.concatenate(ids) for ids in zip(*lst_pair)
+        )
+        # 出発拠点, 到着拠点の順に並べた番号で重複を除く
+        key = np.unique(start_base_id * num_base + end_base_id)
+        start_base_id, end_base_id = np.divmod(key, num_base)
+        is_loop = start_base_id == end_base_id
+        return start_base_id[~is_loop], end_base_id[~is_loop]
+
+    def make_lane_singular_point_columns(
+        self, rng: np.random.Generator, lanes: dict[str, np.ndarray]
+    ) -> dict[str, np.ndarray]:
+        """コスト変化点の列
+
+        値の決め方は `InputDataMaker.add_lane_singular_points` と同じ.
+        変化点の数が残り i 個のレーンをまとめて, 1個ずつ全てのレーンの変化点を作成する
+
+        Note:
+            * 同じレーンのコスト変化点は変化点の昇順に並べ, レーン ID の昇順に並べる
+            * `ratio_convex_lane` の割合のレーンは, レーンの物量あたりコストを軸に
+                コストを反転させ, 変化点ごとに上がるようにする.
+                割合が0より大きい場合のみ乱数を追加で取るため, 他の値は変わらない
+        """
+        lane_id = lanes["id_"]
+        quantity_upper = lanes["quantity_upper"]
+        max_num = np.minimum.reduce([
+            np.full(len(lane_id), max_num_singular_points),
+            quantity_upper - 1, lanes["cost_by_quantity"] - 1
+        ]).clip(min=0)
+        num_singular_points = rng.integers(0, max_num, endpoint=True)
+
+        upper_cost = lanes["cost_by_quantity"].copy()
+        lower_singular_point = np.ones(len(lane_id), dtype=np.int64)
+        lst_column = []
+        for step in range(max_num_singular_points):
+            rows = np.flatnonzero(num_singular_points > step)
+            # 残りの変化点数. 前と同じ値にならないよう, 後ろから range をかける
+            i = num_singular_points[rows] - step
+            cost = rng.integers(i, upper_cost[rows], endpoint=True)
+            singular_point = rng.integers(
+                lower_singular_point[rows], quantity_upper[rows] - i,
+                endpoint=True
+            )
+            lst_column.append((rows, singular_point, cost))
+            # コストの上限値, コスト変化点の下限値の更新
+            upper_cost[rows] = cost
+            lower_singular_point[rows] = singular_point + 1
+
+        rows, singular_points, costs = (
+            np.concatenate(column) for column in zip(*lst_column)
+        )
+        if self.ratio_convex_lane > 0:
+            is_convex = rng.random(len(lane_id)) < self.ratio_convex_lane
+            flipped = 2 * lanes["cost_by_quantity"][rows] - costs
+            costs = np.where(is_convex[rows], flipped, costs)
+        lane_ids = lane_id[rows]
+        order = np.lexsort((singular_points, lane_ids))
+        return {
+            "lane_id": lane_ids[order],
+            "singular_point": singular_points[order],
+            "cost_by_quantity": costs[order],
+        }
+
+    def make_columns(self) -> dict[type, dict[str, np.ndarray]]:
+        """要素のクラスをキーにした, 属性名をキーにした列の配列の辞書"""
+        rng = self.make_generator()
+        id_supply, id_demand = self.decide_id_supply_demand(rng)
+        bases, base_supplies = self.make_base_columns(
+            rng, id_supply, id_demand
+        )
+        lanes = self.make_lane_columns(rng, id_supply, id_demand)
+        return {
+            Base: bases,
+            BaseSupply: base_supplies,
+            Lane: lanes,
+            LaneSingularPoint: self.make_lane_singular_point_columns(
+                rng, lanes
+            ),
+        }
+
+    def run(self, aGraph: GraphComponent) -> GraphComponent:
+        """グラフネットワークを作成して出力
+
+        `ArrayGraph` には列をそのまま追加し, それ以外のグラフには行ごとに要素を作成して追加する
+        """
+        for component_type, columns in self.make_columns().items():
+            if isinstance(aGraph, ArrayGraph):
+                aGraph.add_columns(component_type, **columns)
+                continue
+            rows = zip(*(array.tolist() for array in columns.values()))
+            aGraph.add_many(itertools.starmap(component_type, rows))
+        return aGraph
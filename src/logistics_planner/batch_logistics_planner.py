@@ -0,0 +1,179 @@
+"""物流ネットワーク最適化のモデルを, 事前に作成した索引からまとめて構築するモジュール"""
+from __future__ import annotations
+from collections import defaultdict
+
+from ..optimizer.build_step import objective_function, constraint
+from .logistics_planner import LogisticsPlanner
+
+
+class BatchLogisticsPlanner(LogisticsPlanner):
+    """目的関数, 制約を索引からまとめて構築する `LogisticsPlanner`
+
+    `LogisticsPlanner` では拠点・レーンごとに `Model.sum` でジェネレータを足し合わせるため,
+    大規模な入力では Python 側のモデル構築に時間がかかる.
+    このクラスでは決定変数を設定した後, グラフを1度だけ走査して拠点・レーンごとの変数リストを作成し,
+    `Model.sum_vars`, `Model.scal_prod` でまとめて式を作成する.
+    作成されるモデルは `LogisticsPlanner` と同じになる
+
+    Note:
+        * 目的関数, 制約のメソッド名は `LogisticsPlanner` と同じにして上書きし,
+            同じデコレータで登録する
+        * 式に渡す変数, 係数は索引から作成したものに限られるため,
+            docplex による引数の型チェックは行わない
+    """
+    model_options = {"checker": "off"}
+
+    # 索引 ####################################################################
+    def set_index(self):
+        """拠点・レーンごとの変数リストを作成
+
+        Attributes:
+            _vars_flow_by_lane: レーンIDごとのコスト変化点区間の物量変数リスト
+            _vars_supply_by_base: 拠点IDごとの生産量変数リスト
+            _lane_ids_in: 到着拠点IDごとのレーンIDリスト
+            _lane_ids_out: 出発拠点IDごとのレーンIDリスト
+            _lsps_by_lane: レーンIDごとの, コスト変化点の昇順に並べたコスト変化点リスト.
+                コスト変化点に到達したか否かの変数を設定したレーンのみ
+        """
+        self._vars_flow_by_lane = defaultdict(list)
+        for flow, var in self.var_quantity_flow_by_singular_point.items():
+            self._vars_flow_by_lane[flow.lane_id].append(var)
+
+        self._vars_supply_by_base = defaultdict(list)
+        for bs, var in self.var_quantity_base_supply.items():
+            self._vars_supply_by_base[bs.base_id].append(var)
+
+        self._lane_ids_in = defaultdict(list)
+        self._lane_ids_out = defaultdict(list)
+        for lane in self._aGraph.lanes():
+            self._lane_ids_in[lane.end_base_id].append(lane.id_)
+            self._lane_ids_out[lane.start_base_id].append(lane.id_)
+
+        self._lsps_by_lane = defaultdict(list)
+        for lsp in getattr(self, "var_bool_reached_singular_point", {}):
+            self._lsps_by_lane[lsp.lane_id].append(lsp)
+        for lst_lsp in self._lsps_by_lane.values():
+            lst_lsp.sort(key=lambda x: x.singular_point)
+
+    def set_decision_variables(self):
+        """変数の設定後, 変数リストの索引を作成"""
+        super().set_decision_variables()
+        self.set_index()
+
+    def vars_flow_by_lanes(self, lane_ids: list[int]) -> list:
+        """複数のレーンの物量変数を1つのリストにまとめて出力"""
+        return [
+            var
+            for lane_id in lane_ids
+            for var in self._vars_flow_by_lane.get(lane_id, ())
+        ]
+
+    def get_sum_flow_by_lane(self, lane_id: int):
+        """レーンごとの総物量を取得"""
+        if lane_id not in self._cache_sum_flow_by_lane:
+            self._cache_sum_flow_by_lane[lane_id] = self._model.sum_vars(
+                self._vars_flow_by_lane.get(lane_id, ())
+            )
+        return self._cache_sum_flow_by_lane[lane_id]
+
+    # 目的関数 ####################################################################
+    @objective_function
+    def objective_function_base(self):
+        """拠点に関する目的関数"""
+        dct_open = self.var_bool_open_base
+        dct_supply = self.var_quantity_base_supply
+        return self._model.scal_prod(
+            terms=list(dct_open.values()) + list(dct_supply.values()),
+            coefs=[base.opening_cost for base in dct_open]
+            + [bs.cost_by_quantity for bs in dct_supply]
+        )
+
+    @objective_function
+    def objective_function_lane(self):
+        """レーンに関する目的関数"""
+        dct_open = self.var_bool_open_lane
+        dct_flow = self.var_quantity_flow_by_singular_point
+        return self._model.scal_prod(
+            terms=list(dct_open.values()) + list(dct_flow.values()),
+            coefs=[lane.opening_cost for lane in dct_open]
+            + [flow.cost_by_quantity for flow in dct_flow]
+        )
+
+    # 制約条件 ####################################################################
+    def sum_in_and_supply(self, base_id: int):
+        """拠点に入る物量と拠点で生産される物量の合計"""
+        return self._model.sum_vars(
+            self.vars_flow_by_lanes(self._lane_ids_in.get(base_id, ()))
+            + self._vars_supply_by_base.get(base_id, [])
+        )
+
+    @constraint
+    def add_constraints_base_capacity(self):
+        """拠点が扱うことができる物量の制約の追加"""
+        lst_base = list(self._aGraph.bases())
+        lst_constraint = [
+            self.sum_in_and_supply(base.id_)
+            <= self.upper_base(base) * self.var_bool_open_base[base]
+            for base in lst_base
+        ]
+        self.ct_base_capacity = dict(
+            zip(lst_base, self._model.add_constraints(lst_constraint))
+        )
+
+    @constraint
+    def add_constraints_flow_storage(self):
+        """各拠点の流量保存に関する制約"""
+        lst_base = list(self._aGraph.bases())
+        lst_constraint = [
+            self.sum_in_and_supply(base.id_)
+            == self._model.sum_vars(
+                self.vars_flow_by_lanes(self._lane_ids_out.get(base.id_, ()))
+            ) + base.quantity_demand
+            for base in lst_base
+        ]
+        self.ct_flow_storage = dict(
+            zip(lst_base, self._model.add_constraints(lst_constraint))
+        )
+
+    @constraint
+    def add_constraints_lane_capacity_by_singular_point(self):
+        """コスト変化点間の上限を超えないようにする制約の追加"""
+        dct_flow = self.var_quantity_flow_by_singular_point
+        dct_reached = self.var_bool_reached_singular_point
+        lst_constraint = []
+        for lane in self._aGraph.lanes():
+            for lsp in self._lsps_by_lane.get(lane.id_, ()):
+                flow = self._aGraph.search_flow_by_start(
+                    lane.id_, lsp.singular_point
+                )
+                lst_constraint.append(
+                    dct_flow[flow] <= dct_reached[lsp] * flow.upper
+                )
+        self._model.add_constraints(lst_constraint)
+
+    @constraint
+    def add_constraints_filled_singular_point(self):
+        """コスト変化点まで物量を流さなければコストが変化してはいけない制約の追加"""
+        dct_flow = self.var_quantity_flow_by_singular_point
+        dct_reached = self.var_bool_reached_singular_point
+        lst_constraint = []
+        for lane in self._aGraph.lanes():
+            for lsp in self._lsps_by_lane.get(lane.id_, ()):
+                flow = self._aGraph.search_flow_by_end(
+                    lane.id_, lsp.singular_point
+                )
+                lst_constraint.append(
+                    dct_reached[lsp] <= dct_flow[flow] / flow.upper
+                )
+        self._model.add_constraints(lst_constraint)
+
+    @constraint
+    def add_constraints_unchange_cost_unless_reach_singular_point(self):
+        """1つ前の特異点まで物量が到達していなければ物量あたりコストは変化しない制約の追加"""
+        dct_reached = self.var_bool_reached_singular_point
+        lst_constraint = [
+            dct_reached[lsp] >= dct_reached[lst_lsp[idx+1]]
+            for lst_lsp in self._lsps_by_lane.values()
+            for idx, lsp in enumerate(lst_lsp[:-1])
+        ]
+        self._model.add_constraints(lst_constraint)
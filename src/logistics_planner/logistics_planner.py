@@ -3,114 +3,209 @@
 
 @author: EINOSUKEIIDA
 """
-from docplex.mp.model import Model
+import dataclasses
+from collections.abc import Iterable, Iterator
 
-from ..input_data.graph import Graph
-from ..optimizer.optimization_parameters import OptimizationParameters
+from docplex.mp.constants import EffortLevel
 
+from ..input_data.graph import (
+    Graph, GraphComponent, Base, BaseSupply, Lane, Flow
+)
+from ..optimizer.optimization_parameters import OptimizationParameters
+from ..optimizer.solver_optimizer import SolverOptimizer
+from ..optimizer.solver_backend import solver_cplex
+from ..optimizer.build_step import (
+    decision_variable, objective_function, constraint
+)
+from .presolve import (
+    is_fixed_open_base, CapacityBounds, tighten_bounds, convex_lane_ids
+)
+
+
+# CPLEX の Benders 分解で, 変数に設定した分割をそのまま使用する `benders.strategy` の値
+benders_strategy_user = 1
+# Benders 分解で, マスター問題とする変数の分割の番号
+benders_master = 0
+
+
+class ModelUpdateException(Exception):
+    pass
+
+
+class LogisticsPlanner(SolverOptimizer):
+    """最適化を実行する class
+
+    決定変数, 目的関数, 制約を設定するメソッドは `build_step` のデコレータで登録する.
+    モデルはパラメータの `SOLVER` で指定したソルバーで作成する
+    """
+    model_name = "LogisticsNetworkOptimization"
+    # Benders 分解で, マスター問題・部分問題とする決定変数の辞書の属性名
+    benders_master_var_names = (
+        "var_bool_open_base", "var_bool_open_lane",
+        "var_bool_reached_singular_point",
+    )
+    benders_sub_var_names = (
+        "var_quantity_base_supply", "var_quantity_flow_by_singular_point",
+    )
 
-class LogisticsPlanner:
-    """最適化を実行する class"""
     def __init__(
         self,
         anOptimizeParameters=OptimizationParameters.import_(),
+        disabled_steps: Iterable[str] = (),
+        is_tightening_bounds: bool = True,
+        is_detecting_convex_lanes: bool = True,
+        is_benders: bool = False,
     ):
         """初期化
 
         Args:
             anOptimizeParameters: 最適化に関するハイパーパラメータ群
+            disabled_steps: 実行しない決定変数, 目的関数, 制約のメソッド名
+            is_tightening_bounds: 容量制約の係数と変数の上限に, 入力の物量上限ではなく
+                `tighten_bounds` で小さくした上限を使用するか否か
+            is_detecting_convex_lanes: コストが物量の凸関数となるレーンについて,
+                コスト変化点に到達したか否かの変数と制約を省略するか否か
+            is_benders: 開設の 0-1 変数をマスター問題, 物量の連続変数を部分問題として,
+                CPLEX の Benders 分解で求解するか否か.
+                求解中の暫定解と下界の推移も記録する
 
         Attributes:
             _model: 物流ネットワーク最小化問題のオブジェクト
             _cache_sum_flow_by_lane: レーンごとの流量を計算した際に格納しておくキャッシュ
+            ct_base_capacity: 拠点ごとの拠点容量制約. 差分更新の際に係数を書き換える
+            ct_lane_capacity: レーンごとのレーン容量制約. 差分更新の際に係数を書き換える
+            ct_flow_storage: 拠点ごとの流量保存制約. 差分更新の際に右辺を書き換える
         """
+        if is_benders and anOptimizeParameters.SOLVER != solver_cplex:
+            raise ValueError(
+                f"Solver {anOptimizeParameters.SOLVER} "
+                "does not support Benders decomposition."
+            )
         # Setup optimization model
-        self._model = Model(name="LogisticsNetworkOptimization")
-        self._model.set_time_limit(anOptimizeParameters.MAX_SECONDS)
+        super().__init__(anOptimizeParameters, disabled_steps)
 
         # Initializing cache dict
         self._cache_sum_flow_by_lane = {}
 
+        self.is_tightening_bounds = is_tightening_bounds
+        self.is_detecting_convex_lanes = is_detecting_convex_lanes
+        self.is_benders = is_benders
+        if is_benders:
+            self.record_convergence()
+        self.ct_base_capacity = {}
+        self.ct_lane_capacity = {}
+        self.ct_flow_storage = {}
+
     # 定数 ####################################################################
     def set_constants(self, aGraph: Graph):
         self._aGraph = aGraph
         self._aGraph.add_zero_flow()
+        self.set_capacity_bounds()
+        self.set_convex_lane_ids()
+
+    def set_capacity_bounds(self):
+        """拠点・レーンの物量の上限を計算
+
+        Attributes:
+            capacity_bounds: 容量制約の係数と変数の上限に使用する物量の上限
+        """
+        if self.is_tightening_bounds:
+            self.capacity_bounds = tighten_bounds(self._aGraph)
+        else:
+            self.capacity_bounds = CapacityBounds.from_graph(self._aGraph)
+
+    def set_convex_lane_ids(self):
+        """コスト変化点に到達したか否かの変数を使わないレーンを判定
+
+        Attributes:
+            convex_lane_ids: コストが物量の凸関数となるレーンの ID
+        """
+        if self.is_detecting_convex_lanes:
+            self.convex_lane_ids = convex_lane_ids(self._aGraph)
+        else:
+            self.convex_lane_ids = set()
+
+    def lanes_with_singular_point_var(self) -> list[Lane]:
+        """コスト変化点に到達したか否かの変数と, 区間の順序の制約を設定するレーン"""
+        return [
+            lane for lane in self._aGraph.lanes()
+            if lane.id_ not in self.convex_lane_ids
+        ]
+
+    def upper_base(self, aBase: Base) -> float:
+        """拠点容量制約で, 開設の変数にかける係数"""
+        return self.capacity_bounds.base[aBase.id_]
+
+    def upper_lane(self, aLane: Lane) -> float:
+        """レーン容量制約で, 開設の変数にかける係数"""
+        return self.capacity_bounds.lane[aLane.id_]
+
+    def upper_base_supply(self, aBaseSupply: BaseSupply) -> float:
+        """生産量の変数の上限. 下限を下回る場合は下限とする"""
+        upper = min(
+            aBaseSupply.upper,
+            self.capacity_bounds.base[aBaseSupply.base_id]
+        )
+        return max(upper, aBaseSupply.quantity)
+
+    def upper_flow(self, aFlow: Flow) -> float:
+        """コスト変化点区間の物量の変数の上限. 下限を下回る場合は下限とする"""
+        upper = min(aFlow.upper, self.capacity_bounds.lane[aFlow.lane_id])
+        return max(upper, aFlow.quantity)
 
     # 決定変数 ####################################################################
-    # def key_x(self, aBase: Base):
-    #     """x_i の i に当たるキー"""
-    #     return aBase.id_
-
-    # def isOne_x(self, aBase: Base):
-    #     """xを定数1としてセットする対象であるか
-
-    #     Notes:
-    #         * 変数の次元削減のため, 以下の状況のいずれかにあたる場合は定数 1 とする
-    #             * 生産拠点である
-    #             * 需要拠点である
-    #     """
-    #     is_production_base = aBase.production > 0
-    #     is_demand_base = aBase.demand > 0
-    #     return is_production_base or is_demand_base
-
-    # def isZero_x(self, key):
-    #     """xを定数0としてセットする対象であるか
-
-    #     Notes:
-    #         * 変数の次元削減のため, 以下の状況のいずれかにあたる場合は定数0とする
-    #             * tmp
-    #         * x を設定する際, 先に定数1かどうかから設定するため, 定数1か否かをメソッドで判断する必要はない
-    #     """
-    #     return False
-
-    # def isVariable_x(self, aBase: Base):
-    #     """xを変数としてセットする対象であるか"""
-    #     is_not_one = not self.isOne_x(aBase)
-    #     is_not_zero = not self.isZero_x(aBase)
-    #     return is_not_one and is_not_zero
-
-    # def get_x_name(self, key):
-    #     """Getter of xの名前"""
-    #     return "x({:})".format(key)
+    def is_fixed_open_base(self, aBase: Base) -> bool:
+        """開設を1に固定する拠点か否か
 
+        Notes:
+            * 変数の次元削減のため, 開設しなければ実行不可能となる拠点は1に固定する.
+                判定は `presolve.is_fixed_open_base` と同じ
+        """
+        return is_fixed_open_base(aBase, self._aGraph)
+
+    @decision_variable
     def set_var_bool_open_base(self):
         """拠点を開設するか否かの変数を設定
 
         Notes:
             * あらかじめ x を辞書型の attribute として設定しておく
-            * 変数の対象でなければ定数とする
-            * 先に定数1か否かから判定する
+            * 開設を固定する拠点は下限を1とし, ソルバーの前処理で変数から除かれるようにする
         """
         self.var_bool_open_base = self._model.binary_var_dict(
-            keys=self._aGraph.bases(), name="bool_open_base"
+            keys=self._aGraph.bases(),
+            lb=lambda base: int(self.is_fixed_open_base(base)),
+            name="bool_open_base"
         )
 
+    @decision_variable
     def set_var_quantity_base_supply(self):
         """拠点の生産量を表す変数を設定
 
         Note:
             * 下限は入力として与えられている生産量
-            * 上限はコスト変化点の間隔量と一致
+            * 上限は生産上限と, 拠点の物量の上限の小さいほう
         """
         self.var_quantity_base_supply = self._model.continuous_var_dict(
             keys=self._aGraph.base_supplies(),
             lb=lambda x: x.quantity,
-            ub=lambda x: x.upper,
+            ub=self.upper_base_supply,
             name="quantity_base_supply"
         )
 
+    @decision_variable
     def set_var_bool_open_lane(self):
         """レーンを開設するか否かの変数を設定"""
         self.var_bool_open_lane = self._model.binary_var_dict(
             keys=self._aGraph.lanes(), name="bool_open_lane"
         )
 
+    @decision_variable
     def set_var_quantity_flow_by_singular_point(self):
         """コスト変化点ごとの物量単位あたりの物量を表す変数を設定
 
         Note:
             * 最小値は, 入力として与えられている物量
-            * 上限はコスト変化点の間隔量と一致.
+            * 上限はコスト変化点の間隔量と, レーンの物量の上限の小さいほう.
                 前のコスト変化点まで達していなければ増やせないので制約で反映している
             * 計算結果を見やすくするため整数変数 `integer_var_dict` にしている.
                 計算時間が長すぎるようになったら `continuous_var_dict` に変更
@@ -118,39 +213,50 @@ class LogisticsPlanner:
         var = self._model.continuous_var_dict(
             keys=self._aGraph.flows(),
             lb=lambda x: x.quantity,
+            ub=self.upper_flow,
             name="quantity_flow_by_singular_point"
         )
         self.var_quantity_flow_by_singular_point = var
 
+    @decision_variable
     def set_var_bool_reached_singular_point(self):
         """レーンを流れる物量がコスト変化点に到達したか否かの変数を設定
 
         Note:
             * レーンを流れる総物量がコスト変化点より大きくなっていれば1
+            * コストが物量の凸関数となるレーンのコスト変化点には設定しない
         """
         self.var_bool_reached_singular_point = self._model.binary_var_dict(
-            keys=self._aGraph.lane_singular_points(),
+            keys=[
+                lsp for lsp in self._aGraph.lane_singular_points()
+                if lsp.lane_id not in self.convex_lane_ids
+            ],
             name="bool_reached_singular_point"
         )
 
-    def set_var_template(self):
-        """変数を設定する際のテンプレート
-
-        Note:
-            * 引数は取らないようにする
-            * 変数を追加する際は `set_var_*` という命名規則に従う
-        """
-        pass
-
     def set_decision_variables(self):
-        """変数の設定
+        """変数の設定後, Benders 分解で求解する場合は変数を分割する"""
+        super().set_decision_variables()
+        if self.is_benders:
+            self.set_benders_annotation()
+
+    def set_benders_annotation(self):
+        """開設と, コスト変化点に到達したか否かの 0-1 変数をマスター問題,
+        生産量と物量の連続変数を部分問題とする
 
         Note:
-            * `Optimizer` class で設定された `set_var_*` というメソッドを全て実行
+            * 部分問題は全ての連続変数で1つとする.
+                開設が決まれば残りは連続変数のみの線形計画問題になる
+            * 設定されていない変数の辞書は飛ばす
         """
-        for func_name in dir(self):
-            if func_name.startswith("set_var_"):
-                eval(f"self.{func_name}()")
+        for annotation, var_names in enumerate(
+            (self.benders_master_var_names, self.benders_sub_var_names),
+            start=benders_master
+        ):
+            for var_name in var_names:
+                for var in getattr(self, var_name, {}).values():
+                    self._model.set_benders_annotation(var, annotation)
+        self._model.parameters.benders.strategy = benders_strategy_user
 
     def get_sum_flow_by_lane(self, lane_id: int):
         """レーンごとの総物量を取得
@@ -165,19 +271,8 @@ class LogisticsPlanner:
             self._cache_sum_flow_by_lane[lane_id] = sum_by_singular_point
         return self._cache_sum_flow_by_lane[lane_id]
 
-    # def get_x(self, key):
-    #     return self.var_bool_open_base[self.key_x(key)]
-
-    # def get_x_value(self, key):
-    #     """x の値をとる際, 変数を用意しなかった場合にx.value() とするとエラーが発生するので,
-    #     変数を設定した場合のみ x.value() を返す
-    #     """
-    #     if self.isVariable_x(key):
-    #         return self.get_x(key).value()
-    #     else:
-    #         return self.get_x(key)
-
     # 目的関数 ####################################################################
+    @objective_function
     def objective_function_base(self):
         """拠点に関する目的関数"""
         sum_cost_open = self._model.sum(
@@ -190,6 +285,7 @@ class LogisticsPlanner:
         )
         return sum_cost_open + sum_cost_supply
 
+    @objective_function
     def objective_function_lane(self):
         """レーンに関する目的関数"""
         sum_open_cost = self._model.sum(
@@ -202,19 +298,6 @@ class LogisticsPlanner:
         )
         return sum_open_cost + sum_flow_cost_by_singular_point
 
-    def set_objective_function(self):
-        """目的関数の設定
-
-        Note:
-            * `Optimizer` class で設定された `objective_function_*` という
-                メソッドを全て実行し、出力を累積
-        """
-        obj = 0
-        for func_name in dir(self):
-            if func_name.startswith("objective_function_"):
-                obj += eval(f"self.{func_name}()")
-        self._model.minimize(obj)
-
     # 制約条件 ####################################################################
     def sum_flow_in(self, base_id: int):
         """拠点に入る物量合計
@@ -233,53 +316,69 @@ class LogisticsPlanner:
         )
         return sum_flow_supply
 
+    @constraint
     def add_constraints_base_capacity(self):
         """拠点が扱うことができる物量の制約の追加
 
         Note:
             * 拠点が開設すれば上限まで扱えるが, 開設しない場合上限 0
             * 流量保存制約により入る量 = 出る量なので, 片方のみに絞ってよい
+            * 上限は `upper_base` で, 入力の物量上限より小さくなりうる
         """
+        lst_base = list(self._aGraph.bases())
         lst_constraint = [
             self.sum_flow_in(base.id_) + self.sum_supply_by_base(base.id_)
-            <= base.quantity_upper * self.var_bool_open_base[base]
-            for base in self._aGraph.bases()
+            <= self.upper_base(base) * self.var_bool_open_base[base]
+            for base in lst_base
         ]
-        self._model.add_constraints(lst_constraint)
+        self.ct_base_capacity = dict(
+            zip(lst_base, self._model.add_constraints(lst_constraint))
+        )
 
+    @constraint
     def add_constraints_flow_storage(self):
         """各拠点の流量保存に関する制約
 
         需要拠点の需要を満たす制約もこの中に含まれる
         """
+        lst_base = list(self._aGraph.bases())
         lst_constraint = [
             self.sum_flow_in(base.id_) + self.sum_supply_by_base(base.id_)
             == self._model.sum(
                 self.get_sum_flow_by_lane(lane.id_)
                 for lane in self._aGraph.lanes_same_start(base.id_)
             ) + base.quantity_demand
-            for base in self._aGraph.bases()
+            for base in lst_base
         ]
-        self._model.add_constraints(lst_constraint)
+        self.ct_flow_storage = dict(
+            zip(lst_base, self._model.add_constraints(lst_constraint))
+        )
 
+    @constraint
     def add_constraints_lane_capacity(self):
         """レーンが流すことができる物量の制約の追加
 
         Note:
             * レーンが開設すれば上限まで流せるが, 開設しない場合上限 0
+            * 上限は `upper_lane` で, 入力の物量上限より小さくなりうる
         """
+        lst_lane = list(self._aGraph.lanes())
         lst_constraint = [
             self.get_sum_flow_by_lane(lane.id_)
-            <= lane.quantity_upper * self.var_bool_open_lane[lane]
-            for lane in self._aGraph.lanes()
+            <= self.upper_lane(lane) * self.var_bool_open_lane[lane]
+            for lane in lst_lane
         ]
-        self._model.add_constraints(lst_constraint)
+        self.ct_lane_capacity = dict(
+            zip(lst_lane, self._model.add_constraints(lst_constraint))
+        )
 
+    @constraint
     def add_constraints_lane_capacity_by_singular_point(self):
         """コスト変化点間の上限を超えないようにする制約の追加
 
         Note:
             * 1つ前のコスト変化点まで物量が到達していない場合, そのコスト変化点間の物量は0
+            * コストが物量の凸関数となるレーンには設定しない
         """
         lst_lsp_flow = [
             (
@@ -288,7 +387,7 @@ class LogisticsPlanner:
                     lane.id_, lane_singular_point.singular_point
                 )
             )
-            for lane in self._aGraph.lanes()
+            for lane in self.lanes_with_singular_point_var()
             for lane_singular_point
             in self._aGraph.lane_singular_points_same_lane(lane.id_)
         ]
@@ -299,6 +398,7 @@ class LogisticsPlanner:
         ]
         self._model.add_constraints(lst_constraint)
 
+    @constraint
     def add_constraints_filled_singular_point(self):
         """コスト変化点まで物量を流さなければコストが変化してはいけない制約の追加
 
@@ -312,7 +412,7 @@ class LogisticsPlanner:
                     lane.id_, lane_singular_point.singular_point
                 )
             )
-            for lane in self._aGraph.lanes()
+            for lane in self.lanes_with_singular_point_var()
             for lane_singular_point
             in self._aGraph.lane_singular_points_same_lane(lane.id_)
         ]
@@ -324,6 +424,7 @@ class LogisticsPlanner:
         ]
         self._model.add_constraints(lst_constraint)
 
+    @constraint
     def add_constraints_unchange_cost_unless_reach_singular_point(self):
         """1つ前の特異点まで物量が到達していなければ物量あたりコストは変化しない制約の追加
 
@@ -331,85 +432,272 @@ class LogisticsPlanner:
             * レーンごとにコスト変化点が異なるため, コスト変化点が存在するレーンごとに設定
             * 変化点が2つ以上の場合のみ, 次の変化点にまでに今の変化点に到達する必要がある
         """
+        lst_lane = self.lanes_with_singular_point_var()
         dct_lane_lst_lsp = {
             lane: sorted(
                 list(self._aGraph.lane_singular_points_same_lane(lane.id_)),
                 key=lambda x: x.singular_point
             )
-            for lane in self._aGraph.lanes()
+            for lane in lst_lane
         }
         lst_constraint = [
             self.var_bool_reached_singular_point[lsp]
             >= self.var_bool_reached_singular_point[
                 dct_lane_lst_lsp[lane][idx+1]
             ]
-            for lane in self._aGraph.lanes()
+            for lane in lst_lane
             for idx, lsp in enumerate(dct_lane_lst_lsp[lane][:-1])
         ]
         self._model.add_constraints(lst_constraint)
 
-    def add_constraints_template(self):
-        """制約を追加する際のテンプレート
+    # 差分更新 ####################################################################
+    def update(self, graph_components: Iterable[GraphComponent]):
+        """構築済みのモデルに拠点, 拠点生産量, レーンの変更を反映
+
+        モデルは作り直さず, 変数の上下限, 目的関数の係数, 制約の係数・右辺のみ書き換える.
+        入力グラフと変数・制約の辞書のキーも変更後の要素に入れ替える
+
+        Note:
+            * 拠点, レーンはIDで, 拠点生産量は拠点IDで変更前の要素を特定する
+            * 要素の追加・削除など, モデルの構造が変わる変更は扱わず
+                `ModelUpdateException` を返す. その場合はモデルを作り直す
+            * 式・制約をその場で書き換えるため, CPLEX を使用する場合のみ扱う
+            * 物量の上限は全ての変更を反映した後に計算し直す
+        """
+        if self._parameters.SOLVER != solver_cplex:
+            raise ModelUpdateException(
+                f"Solver {self._parameters.SOLVER} cannot update the model."
+            )
+        update_by_type = {
+            Base: self.update_base,
+            BaseSupply: self.update_base_supply,
+            Lane: self.update_lane,
+        }
+        for gc in graph_components:
+            update = update_by_type.get(type(gc))
+            if update is None:
+                raise ModelUpdateException(f"Cannot update {gc!r}")
+            update(gc)
+        self.update_capacity_bounds()
+
+    @staticmethod
+    def _search_for_update(search, key):
+        """変更前の要素を検索. モデルにない要素であればエラー"""
+        try:
+            return search(key)
+        except KeyError:
+            raise ModelUpdateException(
+                f"{key} is not in the model. Rebuild the model."
+            ) from None
+
+    @staticmethod
+    def _replace_key(dct: dict, old, new):
+        """辞書に変更前の要素があれば, 変更後の要素をキーにする"""
+        if old in dct:
+            dct[new] = dct.pop(old)
+
+    def set_objective_coefficient(self, var, coefficient):
+        """目的関数の変数の係数を書き換える"""
+        self._model.objective_expr.set_coefficient(var, coefficient)
+
+    def update_base(self, aBase: Base):
+        """拠点の開設費用, 物量上限, 需要量の変更を反映
+
+        Note:
+            * 物量上限は `update_capacity_bounds` で拠点容量制約の係数に反映する
+        """
+        old = self._search_for_update(self._aGraph.search_base, aBase.id_)
+        var = self.var_bool_open_base[old]
+        if aBase.opening_cost != old.opening_cost:
+            self.set_objective_coefficient(var, aBase.opening_cost)
+        if (ct := self.ct_flow_storage.get(old)) is not None:
+            if aBase.quantity_demand != old.quantity_demand:
+                ct.right_expr.constant = aBase.quantity_demand
+        # 需要量が変われば, 開設を固定するか否かも変わる
+        var.lb = int(self.is_fixed_open_base(aBase))
+
+        for dct in (
+            self.var_bool_open_base, self.ct_base_capacity,
+            self.ct_flow_storage
+        ):
+            self._replace_key(dct, old, aBase)
+        self._aGraph.replace(old, aBase)
+
+    def update_base_supply(self, aBaseSupply: BaseSupply):
+        """拠点生産量の下限, 上限, 生産量単位あたりコストの変更を反映
 
         Note:
-            * 引数は取らないようにする
-            * 制約を追加する際は `add_constraints_*` という命名規則に従う
-            * 制約ごとに for文で回すと遅いと思うので, `add_constraint_*` という関数で
-                各変数ごとの制約を入れるようにする
+            * 変更前の要素を拠点IDで特定するため, 拠点ごとに生産量が1つの場合のみ扱う
         """
-        pass
+        set_supply = self._aGraph.base_supplies_same_base(aBaseSupply.base_id)
+        if len(set_supply) != 1:
+            raise ModelUpdateException(
+                f"Base {aBaseSupply.base_id} must have exactly one supply."
+            )
+        old = set_supply.pop()
+        var = self.var_quantity_base_supply[old]
+        var.lb = aBaseSupply.quantity
+        var.ub = aBaseSupply.upper
+        if aBaseSupply.cost_by_quantity != old.cost_by_quantity:
+            self.set_objective_coefficient(var, aBaseSupply.cost_by_quantity)
+
+        self._replace_key(self.var_quantity_base_supply, old, aBaseSupply)
+        self._aGraph.replace(old, aBaseSupply)
+        # 最低限生産する量が変われば, 拠点の開設を固定するか否かも変わる
+        aBase = self._aGraph.search_base(aBaseSupply.base_id)
+        self.var_bool_open_base[aBase].lb = int(self.is_fixed_open_base(aBase))
+
+    def update_capacity_bounds(self):
+        """変更後の入力から物量の上限を計算し直し, 変わった係数と変数の上限を書き換える
 
-    def set_constraints(self):
-        """制約の設定
+        Note:
+            * 総需要が変わると全ての上限が変わりうるため, 全ての拠点・レーンについて確認する
+        """
+        old = self.capacity_bounds
+        self.set_capacity_bounds()
+        for base, ct in self.ct_base_capacity.items():
+            if self.upper_base(base) != old.base[base.id_]:
+                ct.right_expr = \
+                    self.upper_base(base) * self.var_bool_open_base[base]
+        for lane, ct in self.ct_lane_capacity.items():
+            if self.upper_lane(lane) != old.lane[lane.id_]:
+                ct.right_expr = \
+                    self.upper_lane(lane) * self.var_bool_open_lane[lane]
+        dct_supply = getattr(self, "var_quantity_base_supply", {})
+        for bs, var in dct_supply.items():
+            var.ub = self.upper_base_supply(bs)
+        dct_flow = getattr(self, "var_quantity_flow_by_singular_point", {})
+        for flow, var in dct_flow.items():
+            if self.capacity_bounds.lane[flow.lane_id] \
+                    != old.lane[flow.lane_id]:
+                var.ub = self.upper_flow(flow)
+
+    def update_lane(self, aLane: Lane):
+        """レーンの物量単位あたりコスト, 開設費用の変更を反映
 
         Note:
-            * `Optimizer` class で設定された `add_constraints_*` というメソッドを全て実行
+            * 出発・到着拠点や上限が変わるとコスト変化点の区間も変わるため扱わない
+            * 物量単位あたりコストは, 物量0から始まるコスト変化点区間の物量のコストとなる
+            * コスト変化点に到達したか否かの変数を省略したレーンで,
+                コストが物量の凸関数でなくなる変更は扱わない
         """
-        for func_name in dir(self):
-            if func_name.startswith("add_constraints_"):
-                eval(f"self.{func_name}()")
+        old = self._search_for_update(self._aGraph.search_lane, aLane.id_)
+        fields = ("start_base_id", "end_base_id", "quantity_upper")
+        if any(getattr(aLane, f) != getattr(old, f) for f in fields):
+            raise ModelUpdateException(
+                f"Cannot change {fields} of {old!r}. Rebuild the model."
+            )
+        if aLane.opening_cost != old.opening_cost:
+            self.set_objective_coefficient(
+                self.var_bool_open_lane[old], aLane.opening_cost
+            )
+        if aLane.cost_by_quantity != old.cost_by_quantity:
+            old_flow = self._aGraph.search_flow_by_start(aLane.id_, 0)
+            if aLane.id_ in self.convex_lane_ids \
+                    and aLane.cost_by_quantity > min(
+                        fl.cost_by_quantity
+                        for fl in self._aGraph.flows_same_lane(aLane.id_)
+                        if fl != old_flow
+                    ):
+                raise ModelUpdateException(
+                    f"{aLane!r} is no longer convex. Rebuild the model."
+                )
+            new_flow = dataclasses.replace(
+                old_flow, cost_by_quantity=aLane.cost_by_quantity
+            )
+            dct_var = self.var_quantity_flow_by_singular_point
+            self.set_objective_coefficient(
+                dct_var[old_flow], aLane.cost_by_quantity
+            )
+            self._replace_key(dct_var, old_flow, new_flow)
+            self._aGraph.replace(old_flow, new_flow)
 
-    # 求解 ####################################################################
-    def solve(self):
-        """求解してその結果を保持する
+        for dct in (self.var_bool_open_lane, self.ct_lane_capacity):
+            self._replace_key(dct, old, aLane)
+        self._aGraph.replace(old, aLane)
 
-        `{実行日付}_{モデルname}.log` というファイルに CPLEX の計算結果が格納される
+    def set_mip_start(self):
+        """直前の解を MIP start として設定
 
-        Attributes:
-            solution: 最適化の結果.
-            result_status: 最適化問題を解いた結果、どのような結果になったかを表す変数
+        Note:
+            * 変更により直前の解が実行不可能になっている場合もあるため, CPLEX に修復させる
+            * 解で0となった変数は解に含まれないため, 0として補完する
+        """
+        self._model.clear_mip_starts()
+        if getattr(self, "solution", None) is None:
+            return
+        self._model.add_mip_start(
+            self.solution, effort_level=EffortLevel.Repair, complete_vars=True
+        )
+
+    def make_mip_start(self, aGraph_solution: Graph):
+        """過去の最適化結果のグラフから, MIP start となる解を作成
 
-        todo:
-            * CPLEX へのログ出力綺麗に
+        Args:
+            aGraph_solution: `make_result` や `CsvHandler.read_opt_solution` で
+                作成された, 開設された拠点・レーンと物量が設定されたグラフ
+
+        Note:
+            * 拠点・レーンの開設, 生産量, コスト変化点区間ごとの物量の値を設定する
+            * 結果にない拠点・レーン・物量は 0 とする
+            * コスト変化点に到達したか否かの変数は設定せず, CPLEX に補完させる
         """
-        log_file_path = "logs/cplex.log"
-        with open(log_file_path, mode="a+") as f:
-            self.solution = self._model.solve(log_output=f)
-        self.result_status = self._model.solve_details.status
+        values = {}
+        set_base = aGraph_solution.bases()
+        for base, var in self.var_bool_open_base.items():
+            values[var] = int(base in set_base)
+        set_lane = aGraph_solution.lanes()
+        for lane, var in self.var_bool_open_lane.items():
+            values[var] = int(lane in set_lane)
+
+        supply_by_key = {
+            (bs.base_id, bs.cost_by_quantity, bs.upper): bs.quantity
+            for bs in aGraph_solution.base_supplies()
+        }
+        for bs, var in self.var_quantity_base_supply.items():
+            key = (bs.base_id, bs.cost_by_quantity, bs.upper)
+            values[var] = supply_by_key.get(key, 0)
+
+        flow_by_key = {
+            (fl.lane_id, fl.start_singular_point): fl.quantity
+            for fl in aGraph_solution.flows()
+        }
+        for fl, var in self.var_quantity_flow_by_singular_point.items():
+            key = (fl.lane_id, fl.start_singular_point)
+            values[var] = flow_by_key.get(key, 0)
 
-    def is_opt_or_feasible(self):
-        """出力された結果が最適解か実行可能解かを出力
+        return self._model.new_solution(
+            var_value_dict=values, name="solution_graph"
+        )
+
+    def set_mip_start_from_graph(self, aGraph_solution: Graph):
+        """過去の最適化結果のグラフを MIP start として設定
 
-        結果の出力の際, 実行不可能であれば出力しない
+        Note:
+            * 入力が変わって結果が実行不可能になっている場合もあるため, CPLEX に修復させる
         """
-        is_opt = "optimal" in self.result_status
-        is_feasible = "feasible" in self.result_status
-        return is_opt or is_feasible
+        self._model.clear_mip_starts()
+        self._model.add_mip_start(
+            self.make_mip_start(aGraph_solution),
+            effort_level=EffortLevel.Repair
+        )
 
+    # 求解 ####################################################################
     def make_result_base(self, aGraph: Graph) -> Graph:
         """拠点に関する最適化の結果を出力"""
+        value_open_base = self.solution_values("var_bool_open_base")
         # 拠点ごとの生産量表示の際に必要になる辞書
-        dct_var = self.var_quantity_base_supply
+        value_supply = self.solution_values("var_quantity_base_supply")
 
         # 開設された拠点と, その生産量の追加
         for base in self._aGraph.bases():
-            if not self.solution.get_value(self.var_bool_open_base[base]):
+            if not value_open_base[base]:
                 continue
 
             aGraph.add(base)
             lst_supply = self._aGraph.base_supplies_same_base(base.id_)
             for supply in lst_supply:
-                val = self.solution.get_value(dct_var[supply])
+                val = value_supply[supply]
                 if val:
                     aGraph.add(Graph.base_supply(
                         base.id_, val,
@@ -419,18 +707,21 @@ class LogisticsPlanner:
 
     def make_result_lane(self, aGraph: Graph) -> Graph:
         """レーンに関する最適化の結果を出力"""
+        value_open_lane = self.solution_values("var_bool_open_lane")
         # コスト変化点ごとの表示の際に必要になる辞書
-        dct_var = self.var_quantity_flow_by_singular_point
+        value_flow = self.solution_values(
+            "var_quantity_flow_by_singular_point"
+        )
 
         # 開設されたレーンと, コスト変化点ごとに設定された物量単位あたりコストでの物量の追加
         for lane in self._aGraph.lanes():
-            if not self.solution.get_value(self.var_bool_open_lane[lane]):
+            if not value_open_lane[lane]:
                 continue
 
             aGraph.add(lane)
             lst_flow = self._aGraph.flows_same_lane(lane.id_)
             for flow in lst_flow:
-                val = self.solution.get_value(dct_var[flow])
+                val = value_flow[flow]
                 if val:
                     aGraph.add(Graph.flow(
                         lane.id_, flow.start_singular_point,
@@ -439,6 +730,24 @@ class LogisticsPlanner:
                     ))
         return aGraph
 
+    def result_flows(self) -> Iterator[Flow]:
+        """流れた物量が0でないコスト変化点区間を, 結果のグラフを作成せずに1つずつ出力
+
+        `CsvHandler.write_opt_solution` の `flows` に渡せば,
+        全ての物量をメモリに保持せずに書き込める
+
+        Note:
+            * 最適解でなければ何も出力しない
+        """
+        if not self.is_opt_or_feasible():
+            return
+        value_flow = self.solution_values(
+            "var_quantity_flow_by_singular_point"
+        )
+        for flow, val in value_flow.items():
+            if val:
+                yield dataclasses.replace(flow, quantity=val)
+
     def make_result(self, aGraph: Graph) -> Graph:
         """最適化の結果を物量を表すクラスで出力
 
@@ -465,6 +774,8 @@ class LogisticsPlanner:
         if self.is_opt_or_feasible():
             sol_val = self.solution.get_objective_value()
             logger.info(f"Objective value = {sol_val}")
+        if self.convergence_history is not None:
+            self.convergence_history.display(logger)
         logger.info("********")
 
     def display_result_base(self, aGraph: Graph, logger):
@@ -478,7 +789,7 @@ class LogisticsPlanner:
             * 見やすくするためソートした形で表示する
         """
         # 拠点ごとの生産量表示の際に必要になる辞書
-        dct_var = self.var_quantity_base_supply
+        value_supply = self.solution_values("var_quantity_base_supply")
 
         def display_result_base_supply(base_id: int):
             """拠点ごとの生産量の表示
@@ -488,7 +799,7 @@ class LogisticsPlanner:
             """
             set_supply = self._aGraph.base_supplies_same_base(base_id)
             for supply in sorted(set_supply, key=lambda x: x.base_id):
-                if val := self.solution.get_value(dct_var[supply]):
+                if val := value_supply[supply]:
                     logger.info(repr(supply))
                     logger.info(f"Quantity of supply: {val}")
 
@@ -510,7 +821,9 @@ class LogisticsPlanner:
             * 見やすくするためソートした形で表示する
         """
         # コスト変化点ごとの表示の際に必要になる辞書
-        dct_var = self.var_quantity_flow_by_singular_point
+        value_flow = self.solution_values(
+            "var_quantity_flow_by_singular_point"
+        )
 
         def display_result_lane_by_singular_point(lane_id: int):
             """コスト変化点ごとの物量の表示
@@ -520,7 +833,7 @@ class LogisticsPlanner:
             """
             set_flow = self._aGraph.flows_same_lane(lane_id)
             for flow in sorted(set_flow, key=lambda x: x.start_singular_point):
-                if val := self.solution.get_value(dct_var[flow]):
+                if val := value_flow[flow]:
                     logger.info(repr(flow))
                     logger.info(f"Quantity by singular point: {val}")
 
@@ -544,23 +857,57 @@ class LogisticsPlanner:
             self.display_result_base(aGraph, logger)
             self.display_result_lane(aGraph, logger)
 
-    def run(self, aGraph_input: Graph, aGraph_output: Graph, logger) -> Graph:
+    def run(
+        self, aGraph_input: Graph, aGraph_output: Graph, logger,
+        aGraph_mip_start: Graph | None = None
+    ) -> Graph:
         """全てを実行して最適化を行う関数
 
         Args:
             aGraph_input: 入力となるグラフ
             aGraph_output: 出力を追加する Graph
             logger: 最適化結果を記述するロガー
+            aGraph_mip_start: 初期解とする過去の最適化結果のグラフ. 指定しなければ初期解なし
         """
         # 定数、変数、目的関数、制約条件のセット
         self.set_constants(aGraph_input)
         logger.info("constants has set")
+        logger.info(f"Num convex lanes = {len(self.convex_lane_ids)}")
         self.set_decision_variables()
         logger.info("decision variables has set")
         self.set_objective_function()
         logger.info("objective function has set")
         self.set_constraints()
         logger.info("constraints has set")
+        self.display_build_steps(logger)
+        self.display_parameters(logger)
+        if aGraph_mip_start is not None:
+            self.set_mip_start_from_graph(aGraph_mip_start)
+            logger.info("MIP start has set")
+        # 求解
+        logger.info("Start solving problem.")
+        self.solve()
+        logger.info("End solving problem.")
+        # 解の出力
+        output = self.make_result(aGraph_output)
+        self.display_result_solve(output, logger)
+        return output
+
+    def rerun(
+        self, graph_components: Iterable[GraphComponent],
+        aGraph_output: Graph, logger
+    ) -> Graph:
+        """構築済みのモデルに変更を反映し, 直前の解を初期解として再度最適化を行う関数
+
+        Args:
+            graph_components: 変更後の拠点, 拠点生産量, レーン
+            aGraph_output: 出力を追加する Graph
+            logger: 最適化結果を記述するロガー
+        """
+        self.update(graph_components)
+        logger.info("model has updated")
+        self.set_mip_start()
+        self.display_parameters(logger)
         # 求解
         logger.info("Start solving problem.")
         self.solve()
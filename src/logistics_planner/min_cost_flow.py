@@ -0,0 +1,519 @@
+"""開設の判断が不要な物流ネットワークを, 最小費用流として解くモジュール
+
+拠点・レーンの開設費が全て0で, コスト変化点がないかコストが物量の凸関数となるレーンのみであれば,
+`LogisticsPlanner` の 0-1 変数は最適値に影響せず, 問題は最小費用流問題となる.
+拠点・レーンの開設を固定した場合も同じく最小費用流問題となるため,
+開設を探索するヒューリスティクスで, 開設案ごとの物量とコストの計算にも使用できる
+
+Example:
+    >>> if is_min_cost_flow(aGraph):
+    >>>     aGraph_result = MinCostFlowPlanner().run(aGraph, Graph(), logger)
+            `LogisticsPlanner.run` と同じ形式の結果が出力される
+
+    >>> aMinCostFlowPlanner.set_constants(aGraph)
+    >>> aMinCostFlowPlanner.solve(open_base_ids, open_lane_ids)
+    >>> aMinCostFlowPlanner.objective_value
+        指定した拠点・レーンのみ開設した場合の最小の総コスト
+
+ネットワークは以下のように作成し, 逐次最短路法で最小費用流を求める.
+
+    * 拠点は入口と出口の2頂点に分け, 入口から出口への辺の容量を拠点の物量上限とする
+    * レーンのコスト変化点区間ごとに, 出発拠点の出口から到着拠点の入口への辺を作成する
+    * 生産量は始点から拠点の入口への辺とし, 最低限の生産量の分は始点から直接つなぐ
+    * 需要は拠点の出口から終点への辺とし, 総需要だけ流せれば実行可能
+
+Note:
+    * 物量あたりコストが0以上であることを前提とする
+    * `ArrayGraph` であれば列配列から直接ネットワークを作成する
+"""
+from __future__ import annotations
+import heapq
+from collections.abc import Iterable
+
+import numpy as np
+
+from ..input_data.graph import (
+    Graph, GraphComponent, Base, BaseSupply, Lane, Flow
+)
+from ..input_data.array_graph import ArrayGraph
+from ..optimizer.optimizer import OptimizerInterface
+from ..optimizer.optimization_parameters import OptimizationParameters
+
+# ネットワークの始点, 始点から生産量の下限以外に流す中継点, 終点の頂点番号
+node_source = 0
+node_supply = 1
+node_sink = 2
+num_special_nodes = 3
+
+# 結果の状態を表す文字列. `LogisticsPlanner` と同じく最適解は "optimal" を含む
+status_optimal = "optimal"
+status_infeasible = "infeasible"
+
+# 要素の型ごとの, ソートした要素を出力するメソッド名
+sorted_method_names = {
+    Base: "sorted_bases",
+    BaseSupply: "sorted_base_supplies",
+    Lane: "sorted_lanes",
+    Flow: "sorted_flows",
+}
+
+
+class MinCostFlowException(Exception):
+    pass
+
+
+def graph_columns(
+    aGraph: GraphComponent, component_class: type, names: Iterable[str]
+) -> dict[str, np.ndarray]:
+    """要素の型と属性名を指定して, 属性ごとの配列を取得
+
+    `ArrayGraph` であれば列配列をそのまま, それ以外はソートした要素から作成する
+    """
+    if isinstance(aGraph, ArrayGraph):
+        return {name: aGraph.column(component_class, name) for name in names}
+    components = getattr(aGraph, sorted_method_names[component_class])()
+    return {
+        name: np.array([getattr(gc, name) for gc in components])
+        for name in names
+    }
+
+
+def has_flows(aGraph: GraphComponent) -> bool:
+    """コスト変化点区間の物量が追加されているか否か"""
+    if isinstance(aGraph, ArrayGraph):
+        return len(aGraph.columns_of(Flow)) > 0
+    return bool(aGraph.flows())
+
+
+def add_zero_flow_if_missing(aGraph: GraphComponent):
+    """コスト変化点区間の物量がなければ, 入力のグラフに追加する"""
+    if not has_flows(aGraph):
+        aGraph.add_zero_flow()
+
+
+def has_no_opening_cost(aGraph: GraphComponent) -> bool:
+    """拠点・レーンの開設費が全て0か否か"""
+    return not (
+        np.any(graph_columns(aGraph, Base, ["opening_cost"])["opening_cost"])
+        or np.any(
+            graph_columns(aGraph, Lane, ["opening_cost"])["opening_cost"]
+        )
+    )
+
+
+def check_min_cost_flow(aGraph: GraphComponent):
+    """開設を固定すれば最小費用流として解けるグラフか確認し, 解けなければエラー
+
+    Note:
+        * コスト変化点区間の物量を追加した後に実行する
+        * コストが物量の凸関数でないレーン, 物量があらかじめ与えられた区間,
+            負の物量あたりコストがあれば解けない
+        * 凸関数か否かは `presolve.convex_lane_ids` と同じ判定を,
+            要素のインスタンスを作成せずに列配列で行う
+    """
+    flows = graph_columns(aGraph, Flow, [
+        "lane_id", "start_singular_point", "cost_by_quantity", "quantity"
+    ])
+    order = np.lexsort((flows["start_singular_point"], flows["lane_id"]))
+    lane_id = flows["lane_id"][order]
+    is_decreasing = (np.diff(flows["cost_by_quantity"][order]) < 0) \
+        & (lane_id[1:] == lane_id[:-1])
+    if np.any(is_decreasing):
+        nonconvex = np.unique(lane_id[1:][is_decreasing])
+        raise MinCostFlowException(
+            f"Lanes {nonconvex[:10].tolist()} have non-convex costs."
+        )
+    if np.any(flows["quantity"]):
+        raise MinCostFlowException("Quantities of flows are given.")
+    supplies = graph_columns(aGraph, BaseSupply, ["cost_by_quantity"])
+    if np.any(flows["cost_by_quantity"] < 0) \
+            or np.any(supplies["cost_by_quantity"] < 0):
+        raise MinCostFlowException("Costs by quantity must be non-negative.")
+
+
+def is_min_cost_flow(aGraph: GraphComponent) -> bool:
+    """開設を固定せずに, 最小費用流として最適解が求まるグラフか否か
+
+    Note:
+        * コスト変化点区間の物量がなければ, 入力のグラフに追加する
+    """
+    if not has_no_opening_cost(aGraph):
+        return False
+    add_zero_flow_if_missing(aGraph)
+    try:
+        check_min_cost_flow(aGraph)
+    except MinCostFlowException:
+        return False
+    return True
+
+
+class MinCostFlowPlanner(OptimizerInterface):
+    """物流ネットワークを逐次最短路法による最小費用流として解くクラス
+
+    `LogisticsPlanner` と同じく `run` で最適化し, 同じ形式の結果のグラフを出力する.
+    `set_constants` でネットワークを1度作成すれば, `solve` で開設する拠点・レーンを
+    変えて繰り返し解ける
+
+    Note:
+        * 開設を指定しない場合, 需要があるか最低限の生産量がある拠点と,
+            物量を扱った拠点・レーンを開設したものとする
+    """
+
+    def __init__(
+        self, anOptimizeParameters=OptimizationParameters.import_()
+    ):
+        """初期化
+
+        Attributes:
+            result_status: 求解した結果の状態. 最適解であれば "optimal"
+            objective_value: 最適解の総コスト. 実行不可能であれば None
+        """
+        super().__init__(anOptimizeParameters)
+        self.result_status: str | None = None
+        self.objective_value: float | None = None
+
+    # 定数 ####################################################################
+    def set_constants(self, aGraph: GraphComponent):
+        """グラフから最小費用流のネットワークを作成
+
+        Note:
+            * コスト変化点区間の物量がなければ, 入力のグラフに追加する
+        """
+        self._aGraph = aGraph
+        add_zero_flow_if_missing(aGraph)
+        check_min_cost_flow(aGraph)
+        self.set_columns()
+        self.set_network()
+
+    def set_columns(self):
+        """ネットワークの作成と結果の出力に使用する, 要素の型ごとの属性の配列を取得"""
+        self._bases = graph_columns(self._aGraph, Base, [
+            "id_", "opening_cost", "quantity_upper", "quantity_demand"
+        ])
+        self._supplies = graph_columns(self._aGraph, BaseSupply, [
+            "base_id", "quantity", "cost_by_quantity", "upper"
+        ])
+        self._lanes = graph_columns(self._aGraph, Lane, [
+            "id_", "start_base_id", "end_base_id", "opening_cost"
+        ])
+        self._flows = graph_columns(self._aGraph, Flow, [
+            "lane_id", "start_singular_point", "end_singular_point",
+            "cost_by_quantity"
+        ])
+
+    def _add_arcs(
+        self, tails: np.ndarray, heads: np.ndarray, caps: np.ndarray,
+        costs: np.ndarray
+    ) -> np.ndarray:
+        """辺と逆辺をまとめて追加し, 追加した辺の番号を出力
+
+        辺の番号 e の逆辺は e ^ 1 とする
+        """
+        start = len(self._arc_head)
+        num = len(tails)
+        self._arc_tail.extend(np.column_stack([tails, heads]).ravel().tolist())
+        self._arc_head.extend(np.column_stack([heads, tails]).ravel().tolist())
+        self._arc_cap.extend(
+            np.column_stack([caps, np.zeros(num)]).ravel().tolist()
+        )
+        self._arc_cost.extend(
+            np.column_stack([costs, -costs]).ravel().tolist()
+        )
+        return np.arange(start, start + 2 * num, 2)
+
+    def set_network(self):
+        """拠点の入口・出口, 始点・終点を頂点とするネットワークを作成
+
+        Attributes:
+            _num_nodes: 頂点数
+            _arc_tail, _arc_head, _arc_cap, _arc_cost: 辺の番号ごとの始点, 終点,
+                容量, 物量あたりコスト
+            _adjacency: 頂点ごとの, 出ていく辺の番号のリスト
+            _arcs_base: 拠点ごとの, 入口から出口への辺の番号
+            _arcs_supply_lower, _arcs_supply: 拠点生産量ごとの,
+                最低限の生産量の分と, それを超える分の辺の番号
+            _arcs_flow: コスト変化点区間ごとの辺の番号
+            _row_lane_by_flow: コスト変化点区間ごとの, レーンの行番号
+            total_demand: 総需要
+        """
+        bases, supplies = self._bases, self._supplies
+        lanes, flows = self._lanes, self._flows
+        num_base = len(bases["id_"])
+        self._num_nodes = num_special_nodes + 2 * num_base
+        self._arc_tail, self._arc_head = [], []
+        self._arc_cap, self._arc_cost = [], []
+
+        def row_of(ids: np.ndarray, keys: np.ndarray) -> np.ndarray:
+            sorter = np.argsort(ids, kind="stable")
+            return sorter[np.searchsorted(ids, keys, sorter=sorter)]
+
+        node_in = num_special_nodes + 2 * np.arange(num_base)
+        node_out = node_in + 1
+        self._arcs_base = self._add_arcs(
+            node_in, node_out, bases["quantity_upper"], np.zeros(num_base)
+        )
+
+        self.total_demand = int(bases["quantity_demand"].sum())
+        lower = supplies["quantity"]
+        total_lower = int(lower.sum())
+        row_base = row_of(bases["id_"], supplies["base_id"])
+        num_supply = len(row_base)
+        self._arcs_supply_lower = self._add_arcs(
+            np.full(num_supply, node_source), node_in[row_base],
+            lower, supplies["cost_by_quantity"]
+        )
+        self._add_arcs(
+            np.array([node_source]), np.array([node_supply]),
+            np.array([max(self.total_demand - total_lower, 0)]), np.zeros(1)
+        )
+        self._arcs_supply = self._add_arcs(
+            np.full(num_supply, node_supply), node_in[row_base],
+            supplies["upper"] - lower, supplies["cost_by_quantity"]
+        )
+        self.is_lower_over_demand = total_lower > self.total_demand
+
+        self._row_lane_by_flow = row_of(lanes["id_"], flows["lane_id"])
+        self._arcs_flow = self._add_arcs(
+            node_out[row_of(
+                bases["id_"], lanes["start_base_id"][self._row_lane_by_flow]
+            )],
+            node_in[row_of(
+                bases["id_"], lanes["end_base_id"][self._row_lane_by_flow]
+            )],
+            flows["end_singular_point"] - flows["start_singular_point"],
+            flows["cost_by_quantity"]
+        )
+
+        is_demand = bases["quantity_demand"] > 0
+        self._add_arcs(
+            node_out[is_demand], np.full(is_demand.sum(), node_sink),
+            bases["quantity_demand"][is_demand], np.zeros(is_demand.sum())
+        )
+
+        self._initial_cap = list(self._arc_cap)
+        self._adjacency = [[] for _ in range(self._num_nodes)]
+        for e, tail in enumerate(self._arc_tail):
+            self._adjacency[tail].append(e)
+
+    # 求解 ####################################################################
+    def reset_capacity(
+        self, open_base_ids: Iterable[int] | None = None,
+        open_lane_ids: Iterable[int] | None = None
+    ):
+        """残余容量を初期化し, 開設しない拠点・レーンの辺の容量を0にする
+
+        Attributes:
+            _is_open_base, _is_open_lane: 拠点・レーンの行ごとの開設の指定.
+                指定しなければ None
+        """
+        self._arc_cap = list(self._initial_cap)
+        self._is_open_base = None
+        self._is_open_lane = None
+        if open_base_ids is not None:
+            self._is_open_base = np.isin(
+                self._bases["id_"], np.fromiter(open_base_ids, dtype=int)
+            )
+            for e in self._arcs_base[~self._is_open_base].tolist():
+                self._arc_cap[e] = 0
+        if open_lane_ids is not None:
+            self._is_open_lane = np.isin(
+                self._lanes["id_"], np.fromiter(open_lane_ids, dtype=int)
+            )
+            is_closed = ~self._is_open_lane[self._row_lane_by_flow]
+            for e in self._arcs_flow[is_closed].tolist():
+                self._arc_cap[e] = 0
+
+    def successive_shortest_path(self) -> int:
+        """始点から終点へ, 総需要に達するまで最短路に沿って流し, 流した量を出力
+
+        Note:
+            * 頂点ポテンシャルで辺のコストを非負にし, Dijkstra 法で最短路を求める.
+                終点までの距離が確定した時点で探索を打ち切り,
+                確定していない頂点のポテンシャルは終点までの距離で更新する
+        """
+        num_nodes = self._num_nodes
+        head, cap, cost = self._arc_head, self._arc_cap, self._arc_cost
+        adjacency = self._adjacency
+        potential = [0] * num_nodes
+        sum_flow = 0
+        while sum_flow < self.total_demand:
+            dist = [float("inf")] * num_nodes
+            prev_arc = [-1] * num_nodes
+            dist[node_source] = 0
+            queue = [(0, node_source)]
+            while queue:
+                d, v = heapq.heappop(queue)
+                if d > dist[v]:
+                    continue
+                if v == node_sink:
+                    break
+                d_v = d + potential[v]
+                for e in adjacency[v]:
+                    if cap[e] <= 0:
+                        continue
+                    w = head[e]
+                    d_w = d_v + cost[e] - potential[w]
+                    if d_w < dist[w]:
+                        dist[w] = d_w
+                        prev_arc[w] = e
+                        heapq.heappush(queue, (d_w, w))
+            dist_sink = dist[node_sink]
+            if dist_sink == float("inf"):
+                break
+            for v in range(num_nodes):
+                potential[v] += min(dist[v], dist_sink)
+
+            # 最短路上の残余容量の最小値だけ流す
+            quantity = self.total_demand - sum_flow
+            v = node_sink
+            while v != node_source:
+                e = prev_arc[v]
+                quantity = min(quantity, cap[e])
+                v = head[e ^ 1]
+            v = node_sink
+            while v != node_source:
+                e = prev_arc[v]
+                cap[e] -= quantity
+                cap[e ^ 1] += quantity
+                v = head[e ^ 1]
+            sum_flow += quantity
+        return sum_flow
+
+    def arc_flows(self, arcs: np.ndarray) -> np.ndarray:
+        """辺の番号ごとの, 流れた物量"""
+        return np.array([self._arc_cap[e ^ 1] for e in arcs.tolist()])
+
+    def set_result(self):
+        """辺の物量から, 生産量, 区間ごとの物量, 開設と総コストを計算
+
+        Attributes:
+            quantity_supply: 拠点生産量の行ごとの生産量
+            quantity_flow: コスト変化点区間の行ごとの物量
+            is_open_base, is_open_lane: 拠点・レーンの行ごとの開設
+        """
+        self.quantity_supply = self.arc_flows(self._arcs_supply_lower) \
+            + self.arc_flows(self._arcs_supply)
+        self.quantity_flow = self.arc_flows(self._arcs_flow)
+
+        self.is_open_base = self._is_open_base
+        if self.is_open_base is None:
+            row_supply = np.isin(
+                self._bases["id_"],
+                self._supplies["base_id"][self._supplies["quantity"] > 0]
+            )
+            self.is_open_base = (self.arc_flows(self._arcs_base) > 0) \
+                | (self._bases["quantity_demand"] > 0) | row_supply
+        self.is_open_lane = self._is_open_lane
+        if self.is_open_lane is None:
+            sum_by_lane = np.bincount(
+                self._row_lane_by_flow, weights=self.quantity_flow,
+                minlength=len(self._lanes["id_"])
+            )
+            self.is_open_lane = sum_by_lane > 0
+
+        self.objective_value = float(
+            np.dot(self.quantity_supply, self._supplies["cost_by_quantity"])
+            + np.dot(self.quantity_flow, self._flows["cost_by_quantity"])
+            + self._bases["opening_cost"][self.is_open_base].sum()
+            + self._lanes["opening_cost"][self.is_open_lane].sum()
+        )
+
+    def solve(
+        self, open_base_ids: Iterable[int] | None = None,
+        open_lane_ids: Iterable[int] | None = None
+    ):
+        """開設する拠点・レーンを指定して求解し, その結果を保持する
+
+        Args:
+            open_base_ids: 開設する拠点の ID. 指定しなければ全ての拠点を使える
+            open_lane_ids: 開設するレーンの ID. 指定しなければ全てのレーンを使える
+
+        Note:
+            * 開設を指定した場合, 総コストには指定した拠点・レーンの開設費を含める
+        """
+        self.reset_capacity(open_base_ids, open_lane_ids)
+        self.objective_value = None
+        if self.is_lower_over_demand \
+                or self.successive_shortest_path() < self.total_demand:
+            self.result_status = status_infeasible
+            return
+        self.result_status = status_optimal
+        self.set_result()
+
+    def is_opt_or_feasible(self) -> bool:
+        """出力された結果が最適解か否か"""
+        return self.result_status == status_optimal
+
+    def make_result(self, aGraph: Graph) -> Graph:
+        """最適化の結果を `LogisticsPlanner.make_result` と同じ形式で出力
+
+        Note:
+            * 最適解でなければ入力をそのまま返す
+        """
+        if not self.is_opt_or_feasible():
+            return aGraph
+
+        open_base_ids = set(self._bases["id_"][self.is_open_base].tolist())
+        aGraph.add_many(
+            self._aGraph.search_base(id_) for id_ in sorted(open_base_ids)
+        )
+        supplies = self._supplies
+        for row in np.flatnonzero(self.quantity_supply).tolist():
+            if supplies["base_id"][row] not in open_base_ids:
+                continue
+            aGraph.add(Graph.base_supply(
+                int(supplies["base_id"][row]),
+                float(self.quantity_supply[row]),
+                int(supplies["cost_by_quantity"][row]),
+                int(supplies["upper"][row])
+            ))
+
+        open_lane_ids = self._lanes["id_"][self.is_open_lane].tolist()
+        aGraph.add_many(
+            self._aGraph.search_lane(id_) for id_ in sorted(open_lane_ids)
+        )
+        flows = self._flows
+        for row in np.flatnonzero(self.quantity_flow).tolist():
+            aGraph.add(Graph.flow(
+                int(flows["lane_id"][row]),
+                int(flows["start_singular_point"][row]),
+                int(flows["end_singular_point"][row]),
+                int(flows["cost_by_quantity"][row]),
+                float(self.quantity_flow[row])
+            ))
+        return aGraph
+
+    def display_result_solve(self, aGraph: Graph, logger):
+        """最適化による結果の概要を表示"""
+        logger.info("********")
+        logger.info("計算結果 ")
+        logger.info("********")
+        logger.info(f"最適性 = {self.result_status}")
+        if self.is_opt_or_feasible():
+            logger.info(f"Objective value = {self.objective_value}")
+            logger.info(f"Open bases = {len(aGraph.bases())}")
+            logger.info(f"Open lanes = {len(aGraph.lanes())}")
+        logger.info("********")
+
+    def run(
+        self, aGraph_input: GraphComponent, aGraph_output: Graph, logger
+    ) -> Graph:
+        """全てを実行して最適化を行う関数
+
+        Args:
+            aGraph_input: 入力となるグラフ. `is_min_cost_flow` を満たす必要がある
+            aGraph_output: 出力を追加する Graph
+            logger: 最適化結果を記述するロガー
+        """
+        if not has_no_opening_cost(aGraph_input):
+            raise MinCostFlowException(
+                "Opening costs must be zero unless the design is fixed."
+            )
+        self.set_constants(aGraph_input)
+        logger.info("network has set")
+        logger.info("Start solving problem.")
+        self.solve()
+        logger.info("End solving problem.")
+        output = self.make_result(aGraph_output)
+        self.display_result_solve(output, logger)
+        return output
@@ -0,0 +1,329 @@
+"""最適化モデルを構築する前に, 解に影響しない拠点・レーンをグラフから除くモジュール
+
+`CsvHandler.read_constants` で読み込んだグラフを `LogisticsPlanner.set_constants` に渡す前に実行し,
+決定変数・制約の数を減らす.
+拠点・レーンの容量制約に使用する物量の上限を, 入力の上限より小さくする計算と,
+コスト変化点の到達を表す変数が不要なレーンの判定もここで行う
+
+Example:
+    >>> aGraph = aDataHandler.read_constants(Graph())
+    >>> aGraph, aPresolveReport = presolve(aGraph)
+    >>> aPresolveReport.display(logger)
+    >>> LogisticsPlanner().run(aGraph, Graph(), logger)
+"""
+from __future__ import annotations
+import dataclasses
+from collections import defaultdict, deque
+from collections.abc import Iterable
+
+from ..input_data.graph import GraphComponent, Base
+
+# 上限を小さくする計算を繰り返す最大の回数
+max_iterations_tightening = 10
+
+
+@dataclasses.dataclass
+class PresolveReport:
+    """前処理で除いた要素と, 開設を固定した拠点
+
+    Attributes:
+        lane_ids_zero_upper: 物量上限が0のため除いたレーンの ID
+        base_ids_zero_capacity: 物量上限が0のため除いた拠点の ID
+        lane_ids_zero_capacity_base: 物量上限が0の拠点とつながっているため除いたレーンの ID
+        base_ids_unreachable: 生産拠点から到達できないか, 需要拠点に到達できないため除いた拠点の ID
+        lane_ids_unreachable: 生産拠点から需要拠点への経路に含まれないため除いたレーンの ID
+        num_removed_base_supplies: 除いた拠点とともに除いた拠点生産量の数
+        num_removed_lane_singular_points: 除いたレーンとともに除いたコスト変化点の数
+        base_ids_fixed_open: 必ず開設するため, 開設を固定する拠点の ID
+    """
+    lane_ids_zero_upper: list[int] = dataclasses.field(default_factory=list)
+    base_ids_zero_capacity: list[int] = dataclasses.field(
+        default_factory=list
+    )
+    lane_ids_zero_capacity_base: list[int] = dataclasses.field(
+        default_factory=list
+    )
+    base_ids_unreachable: list[int] = dataclasses.field(default_factory=list)
+    lane_ids_unreachable: list[int] = dataclasses.field(default_factory=list)
+    num_removed_base_supplies: int = 0
+    num_removed_lane_singular_points: int = 0
+    base_ids_fixed_open: list[int] = dataclasses.field(default_factory=list)
+
+    @property
+    def num_removed_bases(self) -> int:
+        return len(self.base_ids_zero_capacity) \
+            + len(self.base_ids_unreachable)
+
+    @property
+    def num_removed_lanes(self) -> int:
+        return len(self.lane_ids_zero_upper) \
+            + len(self.lane_ids_zero_capacity_base) \
+            + len(self.lane_ids_unreachable)
+
+    def display(self, logger):
+        """除いた要素の数と理由を表示"""
+        logger.info("Presolve:")
+        logger.info(f"Removed bases = {self.num_removed_bases}")
+        logger.info(f"    zero capacity = {len(self.base_ids_zero_capacity)}")
+        logger.info(f"    unreachable = {len(self.base_ids_unreachable)}")
+        logger.info(f"Removed lanes = {self.num_removed_lanes}")
+        logger.info(f"    zero upper = {len(self.lane_ids_zero_upper)}")
+        logger.info(
+            "    touching zero capacity base = "
+            f"{len(self.lane_ids_zero_capacity_base)}"
+        )
+        logger.info(f"    unreachable = {len(self.lane_ids_unreachable)}")
+        logger.info(
+            f"Removed base supplies = {self.num_removed_base_supplies}"
+        )
+        logger.info(
+            "Removed lane singular points = "
+            f"{self.num_removed_lane_singular_points}"
+        )
+        logger.info(f"Fixed open bases = {len(self.base_ids_fixed_open)}")
+
+
+def is_fixed_open_base(aBase: Base, aGraph: GraphComponent) -> bool:
+    """開設しなければ実行不可能となるため, 開設を固定できる拠点か否か
+
+    Note:
+        * 需要がある拠点, 最低限生産しなければいけない量がある生産拠点は,
+            拠点容量制約により開設しなければ物量を扱えない
+        * 最低限生産する量が0の生産拠点は, 開設しないほうが安い場合があるため固定しない
+    """
+    if aBase.quantity_demand > 0:
+        return True
+    return any(
+        bs.quantity > 0 for bs in aGraph.base_supplies_same_base(aBase.id_)
+    )
+
+
+def reachable(
+    sources: Iterable[int], adjacency: dict[int, list[int]]
+) -> set[int]:
+    """`sources` から隣接リストをたどって到達できる拠点 ID の集合"""
+    output = set(sources)
+    queue = deque(output)
+    while queue:
+        for base_id in adjacency[queue.popleft()]:
+            if base_id not in output:
+                output.add(base_id)
+                queue.append(base_id)
+    return output
+
+
+def presolve(
+    aGraph: GraphComponent
+) -> tuple[GraphComponent, PresolveReport]:
+    """解に影響しない拠点・レーンを除いたグラフと, 除いた内容
+
+    以下の順に除き, 除いた拠点・レーンに紐づく拠点生産量・コスト変化点・物量も除く.
+
+        1. 物量上限が0のレーン
+        2. 物量上限が0で需要も最低限の生産量もない拠点と, その拠点につながるレーン
+        3. 生産拠点から到達できないか, 需要拠点に到達できない拠点.
+            残った拠点のうち, 生産拠点から到達できる拠点から需要拠点に到達できる拠点へのレーン以外
+
+    Note:
+        * 開設を固定する拠点は, 到達できなくとも除かない.
+            除くと実行不可能であることがわからなくなるため
+        * 出力するグラフは入力と同じクラスの新しいインスタンスとし, 入力は変更しない
+    """
+    aPresolveReport = PresolveReport()
+    fixed_open = {
+        base.id_ for base in aGraph.bases()
+        if is_fixed_open_base(base, aGraph)
+    }
+    aPresolveReport.base_ids_fixed_open = sorted(fixed_open)
+
+    # 物量上限が0のレーン・拠点
+    lanes = []
+    for lane in aGraph.sorted_lanes():
+        if lane.quantity_upper <= 0:
+            aPresolveReport.lane_ids_zero_upper.append(lane.id_)
+        else:
+            lanes.append(lane)
+    zero_capacity = {
+        base.id_ for base in aGraph.bases()
+        if base.quantity_upper <= 0 and base.id_ not in fixed_open
+    }
+    aPresolveReport.base_ids_zero_capacity = sorted(zero_capacity)
+    lst_lane = []
+    for lane in lanes:
+        if {lane.start_base_id, lane.end_base_id} & zero_capacity:
+            aPresolveReport.lane_ids_zero_capacity_base.append(lane.id_)
+        else:
+            lst_lane.append(lane)
+
+    # 生産拠点から到達でき, かつ需要拠点に到達できる拠点
+    adjacency_out = defaultdict(list)
+    adjacency_in = defaultdict(list)
+    for lane in lst_lane:
+        adjacency_out[lane.start_base_id].append(lane.end_base_id)
+        adjacency_in[lane.end_base_id].append(lane.start_base_id)
+    supply_base_ids = {
+        bs.base_id for bs in aGraph.base_supplies()
+        if bs.upper > 0 and bs.base_id not in zero_capacity
+    }
+    demand_base_ids = {
+        base.id_ for base in aGraph.bases() if base.quantity_demand > 0
+    }
+    from_supply = reachable(supply_base_ids, adjacency_out)
+    to_demand = reachable(demand_base_ids, adjacency_in)
+
+    kept_base_ids = set()
+    for base in aGraph.sorted_bases():
+        if base.id_ in zero_capacity:
+            continue
+        is_useful = base.id_ in from_supply and base.id_ in to_demand
+        if is_useful or base.id_ in fixed_open:
+            kept_base_ids.add(base.id_)
+        else:
+            aPresolveReport.base_ids_unreachable.append(base.id_)
+    kept_lane_ids = set()
+    for lane in lst_lane:
+        is_useful = lane.start_base_id in from_supply \
+            and lane.end_base_id in to_demand \
+            and lane.start_base_id in kept_base_ids \
+            and lane.end_base_id in kept_base_ids
+        if is_useful:
+            kept_lane_ids.add(lane.id_)
+        else:
+            aPresolveReport.lane_ids_unreachable.append(lane.id_)
+
+    # 残った拠点・レーンと, それに紐づく要素を新しいグラフに追加
+    output = type(aGraph)()
+    output.add_many(
+        base for base in aGraph.bases() if base.id_ in kept_base_ids
+    )
+    base_supplies = [
+        bs for bs in aGraph.base_supplies() if bs.base_id in kept_base_ids
+    ]
+    aPresolveReport.num_removed_base_supplies = \
+        len(aGraph.base_supplies()) - len(base_supplies)
+    output.add_many(base_supplies)
+    output.add_many(
+        lane for lane in aGraph.lanes() if lane.id_ in kept_lane_ids
+    )
+    lane_singular_points = [
+        lsp for lsp in aGraph.lane_singular_points()
+        if lsp.lane_id in kept_lane_ids
+    ]
+    aPresolveReport.num_removed_lane_singular_points = \
+        len(aGraph.lane_singular_points()) - len(lane_singular_points)
+    output.add_many(lane_singular_points)
+    output.add_many(
+        flow for flow in aGraph.flows() if flow.lane_id in kept_lane_ids
+    )
+    return output, aPresolveReport
+
+
+@dataclasses.dataclass
+class CapacityBounds:
+    """拠点・レーンが扱う物量の上限
+
+    容量制約で開設の変数にかける係数(big-M)と, 物量の変数の上限に使用する
+
+    Attributes:
+        base: 拠点 ID をキーにした, 拠点に入る物量と生産量の合計の上限
+        lane: レーン ID をキーにした, レーンを流れる物量の上限
+    """
+    base: dict[int, float]
+    lane: dict[int, float]
+
+    @classmethod
+    def from_graph(cls, aGraph: GraphComponent) -> CapacityBounds:
+        """入力の物量上限をそのまま使用した上限"""
+        return cls(
+            {base.id_: base.quantity_upper for base in aGraph.bases()},
+            {lane.id_: lane.quantity_upper for lane in aGraph.lanes()},
+        )
+
+    def num_tightened(self, other: CapacityBounds) -> tuple[int, int]:
+        """`other` より上限が小さくなった拠点とレーンの数"""
+        return (
+            sum(val < other.base[key] for key, val in self.base.items()),
+            sum(val < other.lane[key] for key, val in self.lane.items()),
+        )
+
+
+def tighten_bounds(aGraph: GraphComponent) -> CapacityBounds:
+    """拠点・レーンの物量上限を, 最適解を除かない範囲で小さくした上限
+
+    以下の上限の最小値とし, 変化がなくなるまで拠点とレーンの上限を交互に計算する.
+
+        * レーン: 入力の上限, 出発拠点の上限から出発拠点の需要を除いた量,
+            到着拠点の上限, 総需要から出発拠点の需要を除いた量
+        * 拠点: 入力の上限, 総需要, 到着するレーンの上限と拠点の生産上限の合計
+
+    Note:
+        * 総需要を超える物量は循環にしか使われず, 循環を除いても
+            コストが増えないため, 上限を総需要としても最適解は残る.
+            物量あたりコスト・開設費が0以上であることを前提とする
+    """
+    total_demand = sum(base.quantity_demand for base in aGraph.bases())
+    demand = {base.id_: base.quantity_demand for base in aGraph.bases()}
+    supply_upper = defaultdict(float)
+    for bs in aGraph.base_supplies():
+        supply_upper[bs.base_id] += bs.upper
+    lanes = list(aGraph.lanes())
+
+    output = CapacityBounds.from_graph(aGraph)
+    output.base = {
+        id_: min(upper, total_demand) for id_, upper in output.base.items()
+    }
+    for _ in range(max_iterations_tightening):
+        is_changed = False
+        for lane in lanes:
+            start = lane.start_base_id
+            upper = max(min(
+                output.lane[lane.id_],
+                output.base[start] - demand[start],
+                output.base[lane.end_base_id],
+                total_demand - demand[start],
+            ), 0)
+            if upper < output.lane[lane.id_]:
+                output.lane[lane.id_] = upper
+                is_changed = True
+
+        sum_in = defaultdict(float, supply_upper)
+        for lane in lanes:
+            sum_in[lane.end_base_id] += output.lane[lane.id_]
+        for id_, upper in output.base.items():
+            if sum_in[id_] < upper:
+                output.base[id_] = sum_in[id_]
+                is_changed = True
+        if not is_changed:
+            break
+    return output
+
+
+def convex_lane_ids(aGraph: GraphComponent) -> set[int]:
+    """コスト変化点があり, 到達したか否かの変数を使わずに定式化できるレーンの ID
+
+    コスト変化点区間の物量あたりコストが単調非減少であれば, レーンのコストは物量の凸関数となる.
+    最小化では安い区間から順に物量が満たされるため, 区間の順序を強制する変数・制約は不要
+
+    Note:
+        * `add_zero_flow` でコスト変化点区間の物量を追加した後に実行する
+        * 2つ目以降の区間に物量の下限が与えられている場合, 前の区間を満たすことを
+            強制する必要があるため対象外とする
+        * コストが同じ区間が続く場合, 後ろの区間に先に物量が流れた解も出力されうるが,
+            目的関数値は変わらない
+    """
+    flows_by_lane = defaultdict(list)
+    for flow in aGraph.flows():
+        flows_by_lane[flow.lane_id].append(flow)
+
+    output = set()
+    for lane_id, flows in flows_by_lane.items():
+        if len(flows) < 2:
+            continue
+        flows.sort(key=lambda x: x.start_singular_point)
+        is_non_decreasing = all(
+            former.cost_by_quantity <= latter.cost_by_quantity
+            for former, latter in zip(flows, flows[1:])
+        )
+        if is_non_decreasing and all(fl.quantity == 0 for fl in flows[1:]):
+            output.add(lane_id)
+    return output
@@ -1,16 +1,20 @@
 """物流ネットワーク最適化の入力となるデータを乱数により作成する
+
+拠点数を第1引数, 乱数の種を第2引数(省略可)として受け取る.
+要素のインスタンスを作成せず, 列の配列のまま処理済みのデータとして書き込む
 """
 import os
 import sys
 
 from .utils.config_util import read_config
-from .input_data.graph import Graph
-from .data_access.data_access import CsvHandler
-from .input_data.input_data_maker import InputDataMaker
+from .data_access.data_handler import make_data_handler
+from .input_data.input_data_maker import ArrayInputDataMaker
 from .logger.logger import setup_logger
 
 
-path_data = read_config().get("PATH_DATA")
+config_path_and_name = read_config()
+path_data = config_path_and_name.get("PATH_DATA")
+data_format = config_path_and_name.get("DATA_FORMAT")
 
 
 def main():
@@ -21,16 +25,19 @@ def main():
     str_start = "Start making input data."
     logger.info(str_start)
 
-    aCsvHandler = CsvHandler(path_data)
+    aDataHandler = make_data_handler(path_data, data_format, is_progress=True)
 
-    # 標準入力から拠点数を取得
+    # 標準入力から拠点数, 乱数の種を取得
     num_base = int(sys.argv[1])
+    options = {}
+    if len(sys.argv) > 2:
+        options["random_seed"] = int(sys.argv[2])
 
     # 拠点・レーンの作成
-    aGraph = InputDataMaker(num_base).run(Graph())
+    columns = ArrayInputDataMaker(num_base, **options).make_columns()
 
     # 書き込み
-    aCsvHandler.write_processed_data(aGraph)
+    aDataHandler.write_processed_columns(columns)
 
     # 完了通知
     str_end = "End making input data."
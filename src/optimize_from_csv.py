@@ -3,15 +3,40 @@ import os
 
 from .utils.config_util import read_config
 from .input_data.graph import Graph
-from .optimizer.logistics_planner import LogisticsPlanner
-from .data_access.data_access import CsvHandler
+from .logistics_planner.logistics_planner import LogisticsPlanner
+from .logistics_planner.presolve import presolve
+from .logistics_planner.min_cost_flow import (
+    MinCostFlowPlanner, is_min_cost_flow
+)
+from .data_access.data_handler import make_data_handler
 from .logger.logger import setup_logger
 
 
-path_data = read_config().get("PATH_DATA")
+config_path_and_name = read_config()
+path_data = config_path_and_name.get("PATH_DATA")
+data_format = config_path_and_name.get("DATA_FORMAT")
 
+# 構築したモデルを書き込むファイル名. 拡張子で LP/MPS 形式と gzip 圧縮を指定する
+file_name_model = f"{path_data}result/model.lp.gz"
 
-def main():
+
+def main(
+    is_warm_start: bool = False, is_export_model: bool = False,
+    is_presolve: bool = True, is_detecting_min_cost_flow: bool = True
+):
+    """csvファイルを読み込んで最適化し, 結果をcsvファイルに書き込む
+
+    `DATA_FORMAT` に npz を指定した場合は npz ファイルで読み込み・書き込みを行う
+
+    Args:
+        is_warm_start: 前回書き込んだ最適化の結果を初期解(MIP start)として使用するか否か
+        is_export_model: 構築したモデルを LP/MPS 形式のファイルに書き込むか否か.
+            書き込んだモデルは `solve_from_model_file` で再度求解できる
+        is_presolve: モデルを構築する前に, 解に影響しない拠点・レーンをグラフから除くか否か
+        is_detecting_min_cost_flow: 開設費が全て0で最小費用流問題となる場合に,
+            モデルを構築せず `MinCostFlowPlanner` で解くか否か.
+            モデルを書き込む場合は使用しない
+    """
     # set up
     logger = setup_logger(os.path.basename(__file__)[:-3])
 
@@ -19,19 +44,42 @@ def main():
     str_start = "Network optimization start."
     logger.info(str_start)
 
-    # csvファイルの入出力先指定
-    aCsvHandler = CsvHandler(path_data)
+    # ファイルの入出力先と保存形式の指定
+    aDataHandler = make_data_handler(path_data, data_format, is_progress=True)
 
     # データの読み込み
-    aGraph = aCsvHandler.read_constants(Graph())
+    aGraph = aDataHandler.read_constants(Graph())
+
+    # 解に影響しない拠点・レーンを除く
+    if is_presolve:
+        aGraph, aPresolveReport = presolve(aGraph)
+        aPresolveReport.display(logger)
+
+    # 前回の最適化の結果の読み込み
+    aGraph_mip_start = None
+    if is_warm_start:
+        aGraph_mip_start = aDataHandler.read_opt_solution(Graph())
 
     # 最適化し結果を出力
-    anOptimizer = LogisticsPlanner()
-    sol_aGraph = anOptimizer.run(aGraph, Graph(), logger)
+    if is_detecting_min_cost_flow and not is_export_model \
+            and is_min_cost_flow(aGraph):
+        logger.info("Solve as a min-cost-flow problem.")
+        anOptimizer = MinCostFlowPlanner()
+        sol_aGraph = anOptimizer.run(aGraph, Graph(), logger)
+    else:
+        anOptimizer = LogisticsPlanner()
+        sol_aGraph = anOptimizer.run(
+            aGraph, Graph(), logger, aGraph_mip_start=aGraph_mip_start
+        )
+
+    # 求解したモデルの書き込み
+    if is_export_model:
+        anOptimizer.export_model(file_name_model)
+        logger.info(f"Model is exported to {file_name_model}")
 
     # 最適であれば最適化結果の書き込み
     if anOptimizer.is_opt_or_feasible():
-        aCsvHandler.write_opt_solution(sol_aGraph)
+        aDataHandler.write_opt_solution(sol_aGraph)
 
     # 終了通知
     str_end = "Network optimization end."
@@ -0,0 +1,133 @@
+"""最適化モデルの構築手順を登録し, 実行するモジュール
+
+決定変数, 目的関数, 制約を設定するメソッドをデコレータで登録しておき,
+クラスごとに1度だけ登録された手順を解決して実行する.
+手順ごとにかかった時間と, 追加された制約(行)・変数(列)の数を記録する
+
+Example:
+    >>> class Planner(BuildPipeline):
+    ...     @decision_variable
+    ...     def set_var_x(self): ...
+    ...
+    ...     @constraint
+    ...     def add_constraints_x(self): ...
+"""
+from __future__ import annotations
+import dataclasses
+import functools
+import time
+from collections.abc import Iterable
+
+# 構築手順の種類
+kind_variable = "variable"
+kind_objective = "objective"
+kind_constraint = "constraint"
+
+
+def build_step(kind: str):
+    """メソッドを構築手順として登録するデコレータを作成
+
+    Args:
+        kind: 構築手順の種類
+    """
+    def decorator(func):
+        func.build_step_kind = kind
+        return func
+    return decorator
+
+
+decision_variable = build_step(kind_variable)
+objective_function = build_step(kind_objective)
+constraint = build_step(kind_constraint)
+
+
+@functools.cache
+def resolve_build_steps(cls: type, kind: str) -> tuple[str, ...]:
+    """クラスに登録された構築手順のメソッド名を出力
+
+    Note:
+        * 親クラスで定義された順に並べ, 子クラスで上書きされたメソッドは親クラスの位置に置く
+        * 上書きしたメソッドも登録されていなければ構築手順としない
+        * クラスごとに1度だけ解決し, 以降はキャッシュを使用する
+    """
+    output: list[str] = []
+    for klass in reversed(cls.__mro__):
+        for name in vars(klass):
+            if name in output:
+                continue
+            method = getattr(cls, name, None)
+            if getattr(method, "build_step_kind", None) == kind:
+                output.append(name)
+    return tuple(output)
+
+
+@dataclasses.dataclass
+class BuildStepRecord:
+    """構築手順を実行した記録
+
+    Args:
+        name: メソッド名
+        kind: 構築手順の種類
+        elapsed_time: 実行にかかった秒数
+        num_rows: 追加された制約の数
+        num_columns: 追加された変数の数
+    """
+    name: str
+    kind: str
+    elapsed_time: float
+    num_rows: int
+    num_columns: int
+
+
+class BuildPipeline:
+    """登録された構築手順を実行する mixin
+
+    Attributes:
+        disabled_steps: 実行しない構築手順のメソッド名の集合
+        build_step_records: 実行した構築手順の記録
+    """
+    disabled_steps: frozenset[str] = frozenset()
+
+    def set_disabled_steps(self, disabled_steps: Iterable[str]):
+        """実行しない構築手順を設定. 登録されていない名前が含まれていればエラー"""
+        disabled_steps = frozenset(disabled_steps)
+        registered = {
+            name
+            for kind in (kind_variable, kind_objective, kind_constraint)
+            for name in resolve_build_steps(type(self), kind)
+        }
+        if unknown := disabled_steps - registered:
+            raise ValueError(f"Unknown build steps: {sorted(unknown)}")
+        self.disabled_steps = disabled_steps
+
+    def size_of_model(self) -> tuple[int, int]:
+        """モデルの制約数と変数数. 使用するパッケージによって異なるため, 都度実装する"""
+        return 0, 0
+
+    def run_build_steps(self, kind: str) -> list:
+        """指定された種類の構築手順を実行し, 各メソッドの出力をリストで出力"""
+        if "build_step_records" not in self.__dict__:
+            self.build_step_records: list[BuildStepRecord] = []
+
+        output = []
+        for name in resolve_build_steps(type(self), kind):
+            if name in self.disabled_steps:
+                continue
+            num_rows_before, num_columns_before = self.size_of_model()
+            start = time.perf_counter()
+            output.append(getattr(self, name)())
+            elapsed_time = time.perf_counter() - start
+            num_rows, num_columns = self.size_of_model()
+            self.build_step_records.append(BuildStepRecord(
+                name, kind, elapsed_time,
+                num_rows - num_rows_before, num_columns - num_columns_before
+            ))
+        return output
+
+    def display_build_steps(self, logger):
+        """構築手順ごとの実行時間, 追加された制約・変数の数を表示"""
+        for record in self.build_step_records:
+            logger.info(
+                f"{record.name}: {record.elapsed_time:.2f}s, "
+                f"rows={record.num_rows}, columns={record.num_columns}"
+            )
@@ -0,0 +1,90 @@
+"""求解中の暫定解の目的関数値と下界の推移を記録するモジュール
+
+ソルバーごとの `SolverBackend.record_progress` で, 暫定解か下界が変わるたびに記録する.
+分解法などの解き方の違いを, ギャップが閾値に達するまでの時間で比較する際に使用する
+
+Example:
+    >>> aConvergenceHistory = ConvergenceHistory()
+    >>> model.record_progress(aConvergenceHistory)
+    >>> model.solve()
+    >>> aConvergenceHistory.time_to_gap(1e-2)
+        ギャップが1%以下になるまでの秒数
+"""
+from __future__ import annotations
+import math
+import dataclasses
+
+
+@dataclasses.dataclass(frozen=True)
+class ProgressRecord:
+    """求解中のある時点の暫定解の目的関数値と下界
+
+    Attributes:
+        time: 求解を開始してからの秒数
+        incumbent: 暫定解の目的関数値. 暫定解がなければ None
+        best_bound: 下界. 得られていなければ None
+        gap: 相対ギャップ. 暫定解がなければ None
+        num_nodes: 探索した分枝木のノード数
+    """
+    time: float
+    incumbent: float | None
+    best_bound: float | None
+    gap: float | None
+    num_nodes: int = 0
+
+    @classmethod
+    def make(
+        cls, time: float, incumbent: float | None,
+        best_bound: float | None, gap: float | None, num_nodes: int = 0
+    ) -> ProgressRecord:
+        """ソルバーが無限大や nan で表す得られていない値を None にした記録"""
+        def finite(value):
+            if value is None or not math.isfinite(value):
+                return None
+            return value
+        return cls(
+            time, finite(incumbent), finite(best_bound), finite(gap),
+            num_nodes
+        )
+
+
+@dataclasses.dataclass
+class ConvergenceHistory:
+    """求解中の暫定解の目的関数値と下界の推移
+
+    Attributes:
+        records: 時刻順の記録. 暫定解, 下界のいずれかが変わった時点のみ保持する
+    """
+    records: list[ProgressRecord] = dataclasses.field(default_factory=list)
+
+    def append(self, aProgressRecord: ProgressRecord):
+        """暫定解か下界が直前の記録から変わっていれば追加"""
+        if self.records:
+            last = self.records[-1]
+            is_same = last.incumbent == aProgressRecord.incumbent \
+                and last.best_bound == aProgressRecord.best_bound
+            if is_same:
+                return
+        self.records.append(aProgressRecord)
+
+    def clear(self):
+        """次の求解のために記録を全て削除"""
+        self.records.clear()
+
+    def time_to_gap(self, gap: float) -> float | None:
+        """相対ギャップが `gap` 以下になった最初の時刻. 達していなければ None"""
+        for record in self.records:
+            if record.gap is not None and record.gap <= gap:
+                return record.time
+        return None
+
+    def display(self, logger):
+        """記録を1行ずつ表示"""
+        logger.info("Convergence:")
+        for record in self.records:
+            gap = "-" if record.gap is None else f"{record.gap:.2%}"
+            logger.info(
+                f"{record.time:8.2f}s nodes = {record.num_nodes}, "
+                f"incumbent = {record.incumbent}, "
+                f"bound = {record.best_bound}, gap = {gap}"
+            )
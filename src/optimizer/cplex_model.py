@@ -0,0 +1,119 @@
+"""CPLEX を使用して最適化モデルを作成・求解するモジュール
+
+docplex の `Model` をそのまま使用し, パラメータの設定のみ追加する
+"""
+from __future__ import annotations
+import functools
+
+from docplex.mp.model import Model
+from docplex.mp.model_reader import ModelReader
+from docplex.mp.progress import ProgressListener, ProgressClock
+
+from .optimization_parameters import OptimizationParameters
+from .solver_backend import SolverBackend
+from .convergence import ConvergenceHistory, ProgressRecord
+
+
+class ConvergenceListener(ProgressListener):
+    """CPLEX から通知された暫定解と下界を `ConvergenceHistory` に追加する listener
+
+    Note:
+        * ギャップが変わった時点のみ通知させる
+    """
+
+    def __init__(self, aConvergenceHistory: ConvergenceHistory):
+        super().__init__(ProgressClock.Gap)
+        self.convergence_history = aConvergenceHistory
+
+    def notify_progress(self, progress_data):
+        incumbent = None
+        gap = None
+        if progress_data.has_incumbent:
+            incumbent = progress_data.current_objective
+            gap = progress_data.mip_gap
+        self.convergence_history.append(ProgressRecord.make(
+            progress_data.time, incumbent, progress_data.best_bound, gap,
+            progress_data.current_nb_nodes
+        ))
+
+
+class CplexModel(Model, SolverBackend):
+    """docplex の `Model` に `SolverBackend` のパラメータ設定を追加したクラス
+
+    Attributes:
+        cplex_parameter_by_name: `OptimizationParameters` の属性名と,
+            対応する CPLEX のパラメータ名
+    """
+    log_file_name = "cplex"
+    _convergence_history: ConvergenceHistory | None = None
+    cplex_parameter_by_name = {
+        "NUM_THREADS": "threads",
+        "MAX_SECONDS": "timelimit",
+        "MIP_GAP": "mip.tolerances.mipgap",
+        "MIP_EMPHASIS": "emphasis.mip",
+        "PARALLEL_MODE": "parallel",
+        "WORK_MEMORY": "workmem",
+        "NODE_FILE": "mip.strategy.file",
+        "TREE_MEMORY": "mip.limits.treememory",
+    }
+
+    def cplex_parameter(self, name: str):
+        """`OptimizationParameters` の属性名に対応する CPLEX のパラメータ"""
+        return functools.reduce(
+            getattr, self.cplex_parameter_by_name[name].split("."),
+            self.parameters
+        )
+
+    def set_parameters(self, anOptimizeParameters: OptimizationParameters):
+        for name in self.cplex_parameter_by_name:
+            self.cplex_parameter(name).set(getattr(anOptimizeParameters, name))
+
+    def parameters_in_effect(self) -> dict:
+        output = {}
+        for name in self.cplex_parameter_by_name:
+            param = self.cplex_parameter(name)
+            output[param.qualified_name] = param.get()
+        return output
+
+    def record_progress(self, aConvergenceHistory: ConvergenceHistory):
+        """進捗を通知する listener と, 求解後の情報で記録する"""
+        self._convergence_history = aConvergenceHistory
+        self.add_progress_listener(ConvergenceListener(aConvergenceHistory))
+
+    def solve(self, **kwargs):
+        """求解し, 記録していれば最後の通知の後に得られた解・下界も追加"""
+        solution = super().solve(**kwargs)
+        if self._convergence_history is not None:
+            details = self.solve_details
+            incumbent = None
+            gap = None
+            if solution is not None:
+                incumbent = solution.objective_value
+                gap = details.mip_relative_gap
+            self._convergence_history.append(ProgressRecord.make(
+                details.time, incumbent, details.best_bound, gap,
+                details.nb_nodes_processed
+            ))
+        return solution
+
+    def write_model(self, path: str):
+        """CPLEX の書き出し機能を使用し, 形式は拡張子から判断させる
+
+        Note:
+            * 変数名はキーの文字列表現であり LP/MPS の名前として不正な文字を含むため,
+                複製した CPLEX のモデルで変数・制約名を番号に置き換えて書き込む
+            * モデルの構築には CPLEX の実行環境が不要なため, ここでのみ読み込む
+        """
+        import cplex
+        cpx = cplex.Cplex(self.get_cplex())
+        for interface, prefix in (
+            (cpx.variables, "x"), (cpx.linear_constraints, "c")
+        ):
+            num = interface.get_num()
+            if num:
+                interface.set_names([(i, f"{prefix}{i}") for i in range(num)])
+        cpx.write(path)
+
+    @classmethod
+    def read_model(cls, path: str, name: str) -> 'CplexModel':
+        return ModelReader.read(path, model_name=name, model_class=cls)
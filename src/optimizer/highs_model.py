@@ -0,0 +1,461 @@
+"""HiGHS を使用して最適化モデルを作成・求解するモジュール
+
+docplex の `Model` のうち, `SolverBackend` で定めたメソッドのみ同じ名前で実装する.
+式は変数の列番号をキーにした係数の辞書で保持し, 制約はまとめて HiGHS に渡す.
+highspy はオプションの依存パッケージのため, `make_model` で HiGHS を指定した場合のみ読み込む
+"""
+from __future__ import annotations
+import dataclasses
+from abc import ABCMeta, abstractmethod
+from collections.abc import Iterable
+from numbers import Number
+
+import highspy
+import numpy as np
+
+from .optimization_parameters import OptimizationParameters
+from .solver_backend import SolverBackend
+from .convergence import ConvergenceHistory, ProgressRecord
+
+dtype_index = np.int32
+inf = highspy.kHighsInf
+
+
+class ExprOperators(metaclass=ABCMeta):
+    """変数・式に共通する演算子. 新しい線形式を作成して計算する
+
+    Note:
+        * numpy の数値との演算で numpy 側の演算が使われないよう, `__array_ufunc__` を None とする
+    """
+    __slots__ = ()
+    __array_ufunc__ = None
+
+    @abstractmethod
+    def to_linear_expr(self) -> LinearExpr:
+        """演算の対象となる線形式"""
+        pass
+
+    def copy_expr(self) -> LinearExpr:
+        """演算結果を格納する新しい線形式"""
+        expr = self.to_linear_expr()
+        return LinearExpr(dict(expr.coefs), expr.constant)
+
+    def __add__(self, other):
+        return self.copy_expr().add(other)
+
+    __radd__ = __add__
+
+    def __sub__(self, other):
+        return self.copy_expr().add(other, -1)
+
+    def __rsub__(self, other):
+        return self.copy_expr().scale(-1).add(other)
+
+    def __mul__(self, other):
+        if not isinstance(other, Number):
+            return NotImplemented
+        return self.copy_expr().scale(other)
+
+    __rmul__ = __mul__
+
+    def __truediv__(self, other):
+        if not isinstance(other, Number):
+            return NotImplemented
+        return self.copy_expr().scale(1 / other)
+
+    def __neg__(self):
+        return self.copy_expr().scale(-1)
+
+    def __le__(self, other) -> LinearConstraint:
+        return LinearConstraint.make(self - other, "<=")
+
+    def __ge__(self, other) -> LinearConstraint:
+        return LinearConstraint.make(self - other, ">=")
+
+    def __eq__(self, other) -> LinearConstraint:
+        return LinearConstraint.make(self - other, "==")
+
+
+class Var(ExprOperators):
+    """HiGHS の列を表す変数
+
+    Args:
+        index: 列番号
+    """
+    __slots__ = ("index",)
+
+    def __init__(self, index: int):
+        self.index = index
+
+    def __repr__(self):
+        return f"{self.__class__.__name__}({self.index})"
+
+    def __hash__(self) -> int:
+        return hash(self.index)
+
+    def to_linear_expr(self) -> LinearExpr:
+        return LinearExpr({self.index: 1.0})
+
+
+class LinearExpr(ExprOperators):
+    """線形式. 列番号をキーにした係数の辞書と定数で表す"""
+    __slots__ = ("coefs", "constant")
+    __hash__ = None
+
+    def __init__(self, coefs: dict[int, float] | None = None, constant=0):
+        self.coefs = {} if coefs is None else coefs
+        self.constant = constant
+
+    def __repr__(self):
+        return f"{self.__class__.__name__}({self.coefs}, {self.constant})"
+
+    def to_linear_expr(self) -> LinearExpr:
+        return self
+
+    def add(self, other, coef=1) -> LinearExpr:
+        """変数, 式, 数値に係数をかけてその場で足し合わせる"""
+        coefs = self.coefs
+        if isinstance(other, Var):
+            coefs[other.index] = coefs.get(other.index, 0) + coef
+        elif isinstance(other, LinearExpr):
+            for index, val in other.coefs.items():
+                coefs[index] = coefs.get(index, 0) + coef * val
+            self.constant += coef * other.constant
+        elif isinstance(other, Number):
+            self.constant += coef * other
+        else:
+            raise TypeError(f"Cannot add {other!r} to a linear expression")
+        return self
+
+    def scale(self, coef) -> LinearExpr:
+        """その場で係数をかける"""
+        for index in self.coefs:
+            self.coefs[index] *= coef
+        self.constant *= coef
+        return self
+
+
+@dataclasses.dataclass(slots=True)
+class LinearConstraint:
+    """`lb <= expr <= ub` の形の制約
+
+    Args:
+        expr: 定数を含まない線形式
+        lb: 下限
+        ub: 上限
+        index: 追加された行番号. 追加前は None
+    """
+    expr: LinearExpr
+    lb: float
+    ub: float
+    index: int | None = None
+
+    @classmethod
+    def make(cls, expr: LinearExpr, sense: str) -> LinearConstraint:
+        """`expr (sense) 0` を, 定数を右辺に移した形で作成"""
+        rhs = -expr.constant
+        expr.constant = 0
+        if sense == "<=":
+            return cls(expr, -inf, rhs)
+        if sense == ">=":
+            return cls(expr, rhs, inf)
+        return cls(expr, rhs, rhs)
+
+
+@dataclasses.dataclass
+class SolveDetails:
+    """求解した結果の状態
+
+    Args:
+        status: 結果を表す文字列. 最適解であれば "optimal",
+            最適ではないが解が得られていれば "feasible" を含む
+    """
+    status: str
+
+
+@dataclasses.dataclass
+class Solution:
+    """HiGHS で求解した解, もしくは MIP start となる解
+
+    Args:
+        value_by_index: 列番号をキーにした変数の値
+        objective_value: 目的関数値
+    """
+    value_by_index: dict[int, float]
+    objective_value: float | None = None
+
+    def get_value(self, var: Var) -> float:
+        return self.value_by_index.get(var.index, 0.0)
+
+    def get_values(self, var_seq: Iterable[Var]) -> list[float]:
+        value_by_index = self.value_by_index
+        return [value_by_index.get(var.index, 0.0) for var in var_seq]
+
+    def get_value_dict(
+        self, var_dict: dict, keep_zeros: bool = True,
+        precision: float = 1e-6
+    ) -> dict:
+        """変数の辞書と同じキーで, 値の辞書を出力
+
+        Args:
+            keep_zeros: 絶対値が `precision` 未満の値も残すか否か
+        """
+        values = zip(var_dict, self.get_values(var_dict.values()))
+        if keep_zeros:
+            return dict(values)
+        return {key: val for key, val in values if abs(val) >= precision}
+
+    def get_objective_value(self) -> float | None:
+        return self.objective_value
+
+
+class HighsModel(SolverBackend):
+    """HiGHS を使用する最適化モデル
+
+    Attributes:
+        highs_option_by_name: `OptimizationParameters` の属性名と,
+            対応する HiGHS のオプション名. HiGHS に対応するものがないパラメータは設定しない
+    """
+    log_file_name = "highs"
+    highs_option_by_name = {
+        "NUM_THREADS": "threads",
+        "MAX_SECONDS": "time_limit",
+        "MIP_GAP": "mip_rel_gap",
+    }
+
+    def __init__(self, name: str = "", **options):
+        """初期化
+
+        Args:
+            name: モデル名
+            options: docplex の `Model` に渡すオプション. HiGHS では使用しない
+        """
+        self.name = name
+        self._highs = highspy.Highs()
+        # ログは求解の際にのみファイルへ書き込み, 標準出力には表示しない
+        self._highs.setOptionValue("log_to_console", False)
+        self._highs.setOptionValue("output_flag", False)
+        self.solve_details: SolveDetails | None = None
+        self._convergence_history: ConvergenceHistory | None = None
+
+    # 決定変数 ####################################################################
+    def _add_vars(self, keys: Iterable, lb, ub, is_binary: bool) -> dict:
+        """キーごとに列を追加し, キーと変数の辞書を出力"""
+        keys = list(keys)
+        num = len(keys)
+        start = self._highs.getNumCol()
+
+        def bounds(bound, default) -> np.ndarray:
+            if bound is None:
+                return np.full(num, default, dtype=float)
+            if callable(bound):
+                return np.array([bound(key) for key in keys], dtype=float)
+            return np.full(num, bound, dtype=float)
+
+        empty_index = np.array([], dtype=dtype_index)
+        self._highs.addCols(
+            num, np.zeros(num), bounds(lb, 0.0), bounds(ub, inf),
+            0, empty_index, empty_index, np.array([], dtype=float)
+        )
+        if is_binary:
+            self._highs.changeColsIntegrality(
+                num, np.arange(start, start + num, dtype=dtype_index),
+                np.full(num, highspy.HighsVarType.kInteger)
+            )
+        return {key: Var(start + i) for i, key in enumerate(keys)}
+
+    def binary_var_dict(
+        self, keys: Iterable, lb=None, name: str | None = None
+    ) -> dict:
+        return self._add_vars(
+            keys, 0.0 if lb is None else lb, 1.0, is_binary=True
+        )
+
+    def continuous_var_dict(
+        self, keys: Iterable, lb=None, ub=None, name: str | None = None
+    ) -> dict:
+        return self._add_vars(keys, lb, ub, is_binary=False)
+
+    # 式 ####################################################################
+    def sum(self, args: Iterable) -> LinearExpr:
+        output = LinearExpr()
+        for arg in args:
+            output.add(arg)
+        return output
+
+    def sum_vars(self, dvars: Iterable[Var]) -> LinearExpr:
+        coefs: dict[int, float] = {}
+        for var in dvars:
+            coefs[var.index] = coefs.get(var.index, 0) + 1
+        return LinearExpr(coefs)
+
+    def scal_prod(self, terms: Iterable, coefs: Iterable) -> LinearExpr:
+        output = LinearExpr()
+        for term, coef in zip(terms, coefs):
+            output.add(term, coef)
+        return output
+
+    # 目的関数・制約 ####################################################################
+    def minimize(self, expr):
+        """目的関数の係数を全ての列について設定し直す"""
+        expr = LinearExpr().add(expr)
+        num = self._highs.getNumCol()
+        costs = np.zeros(num)
+        for index, coef in expr.coefs.items():
+            costs[index] = coef
+        self._highs.changeColsCost(
+            num, np.arange(num, dtype=dtype_index), costs
+        )
+        self._highs.changeObjectiveOffset(float(expr.constant))
+        self._highs.changeObjectiveSense(highspy.ObjSense.kMinimize)
+
+    def add_constraints(self, cts: Iterable[LinearConstraint]) -> list:
+        """制約を行列の形にまとめて, 1度に追加する"""
+        cts = list(cts)
+        start = self._highs.getNumRow()
+        starts, indices, values = [], [], []
+        for ct in cts:
+            starts.append(len(indices))
+            for index, coef in ct.expr.coefs.items():
+                if coef:
+                    indices.append(index)
+                    values.append(coef)
+        self._highs.addRows(
+            len(cts),
+            np.array([ct.lb for ct in cts], dtype=float),
+            np.array([ct.ub for ct in cts], dtype=float),
+            len(indices),
+            np.array(starts, dtype=dtype_index),
+            np.array(indices, dtype=dtype_index),
+            np.array(values, dtype=float),
+        )
+        for i, ct in enumerate(cts):
+            ct.index = start + i
+        return cts
+
+    @property
+    def number_of_constraints(self) -> int:
+        return self._highs.getNumRow()
+
+    @property
+    def number_of_variables(self) -> int:
+        return self._highs.getNumCol()
+
+    # パラメータ ####################################################################
+    def set_parameters(self, anOptimizeParameters: OptimizationParameters):
+        for name, option in self.highs_option_by_name.items():
+            self._highs.setOptionValue(
+                option, getattr(anOptimizeParameters, name)
+            )
+
+    def parameters_in_effect(self) -> dict:
+        options = self._highs.getOptions()
+        return {
+            option: getattr(options, option)
+            for option in self.highs_option_by_name.values()
+        }
+
+    # 求解 ####################################################################
+    def solve(self, log_output=None) -> Solution | None:
+        highs = self._highs
+        highs.setOptionValue("output_flag", log_output is not None)
+
+        def write_log(event):
+            log_output.write(event.message)
+
+        def record(event):
+            data = event.data_out
+            self._convergence_history.append(ProgressRecord.make(
+                data.running_time, data.mip_primal_bound,
+                data.mip_dual_bound, data.mip_gap, data.mip_node_count
+            ))
+
+        if log_output is not None:
+            highs.cbLogging.subscribe(write_log)
+        if self._convergence_history is not None:
+            highs.cbMipInterrupt.subscribe(record)
+        try:
+            highs.run()
+        finally:
+            if log_output is not None:
+                highs.cbLogging.unsubscribe(write_log)
+            if self._convergence_history is not None:
+                highs.cbMipInterrupt.unsubscribe(record)
+
+        model_status = highs.getModelStatus()
+        info = highs.getInfo()
+        has_solution = (
+            info.primal_solution_status == highspy.kSolutionStatusFeasible
+        )
+        # 最後の callback の後に得られた解・下界も残す
+        if self._convergence_history is not None:
+            incumbent = info.objective_function_value if has_solution else None
+            self._convergence_history.append(ProgressRecord.make(
+                highs.getRunTime(), incumbent, info.mip_dual_bound,
+                info.mip_gap, info.mip_node_count
+            ))
+        if model_status == highspy.HighsModelStatus.kOptimal:
+            status = "optimal"
+        else:
+            status = highs.modelStatusToString(model_status).lower()
+            if has_solution:
+                status = f"feasible, {status}"
+        self.solve_details = SolveDetails(status)
+        if not has_solution:
+            return None
+
+        col_value = highs.getSolution().col_value
+        return Solution(
+            dict(enumerate(col_value)), info.objective_function_value
+        )
+
+    def record_progress(self, aConvergenceHistory: ConvergenceHistory):
+        """分枝限定法の途中で呼ばれる callback と, 求解後の情報で記録する
+
+        Note:
+            * callback は暫定解・下界が変わらなくても呼ばれるため,
+                変わった時点のみ `ConvergenceHistory.append` で残す
+        """
+        self._convergence_history = aConvergenceHistory
+
+    def new_solution(
+        self, var_value_dict: dict, name: str | None = None
+    ) -> Solution:
+        return Solution({
+            var.index: value for var, value in var_value_dict.items()
+        })
+
+    def add_mip_start(
+        self, mip_start_sol: Solution, effort_level=None, complete_vars=False
+    ):
+        """MIP start を追加
+
+        Note:
+            * HiGHS は与えられなかった変数を補完するため, `effort_level` は使用しない
+            * `complete_vars` ならば, 与えられなかった変数を 0 とする
+        """
+        value_by_index = mip_start_sol.value_by_index
+        if complete_vars:
+            value_by_index = dict.fromkeys(
+                range(self._highs.getNumCol()), 0.0
+            ) | value_by_index
+        self._highs.setSolution(
+            len(value_by_index),
+            np.fromiter(value_by_index.keys(), dtype=dtype_index),
+            np.fromiter(value_by_index.values(), dtype=float),
+        )
+
+    def clear_mip_starts(self):
+        """HiGHS は MIP start のみ削除できないため, 直前の解ごと削除する"""
+        self._highs.clearSolver()
+
+    # ファイル ####################################################################
+    def write_model(self, path: str):
+        self._highs.writeModel(path)
+
+    @classmethod
+    def read_model(cls, path: str, name: str) -> HighsModel:
+        """ファイルから読み込んだモデル. 変数は列番号でのみ扱う"""
+        output = cls(name=name)
+        output._highs.readModel(path)
+        return output
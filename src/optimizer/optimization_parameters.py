@@ -7,12 +7,33 @@ from ..utils.config_util import read_config, default_section
 class OptimizationParameters:
     """最適化の計算に使用するパラメータをまとめた class
 
+    config ファイルに書かれていないパラメータは, CPLEX の既定値とする
+
     Args:
-        NUM_THREADS: 最適化実行時のスレッド数
+        SOLVER: 使用するソルバー名. "cplex" もしくは "highs"
+        NUM_THREADS: 最適化実行時のスレッド数. 0 ならばソルバーが自動で決める
         MAX_SECONDS: 最適化に使用可能な最大秒数
+        MIP_GAP: 最適解とみなす相対ギャップ
+        MIP_EMPHASIS: 探索で何を重視するか. 0: バランス, 1: 実行可能性, 2: 最適性,
+            3: 下界の改善, 4: 隠れた実行可能解, 5: 発見的解法
+        PARALLEL_MODE: 並列化の方法. -1: 非決定的, 0: 自動, 1: 決定的
+        WORK_MEMORY: 作業用メモリの上限(MB). 超えるとノードファイルを使用する
+        NODE_FILE: ノードファイルの保存先. 0: 使用しない, 1: メモリ上で圧縮,
+            2: ディスク, 3: ディスク上で圧縮
+        TREE_MEMORY: 分枝木に使用するメモリの上限(MB). 超えると計算を打ち切る
+
+    Note:
+        * ソルバーに対応するものがないパラメータは設定されない
     """
     NUM_THREADS: int
     MAX_SECONDS: int
+    SOLVER: str = "cplex"
+    MIP_GAP: float = 1e-4
+    MIP_EMPHASIS: int = 0
+    PARALLEL_MODE: int = 0
+    WORK_MEMORY: float = 2048
+    NODE_FILE: int = 1
+    TREE_MEMORY: float = 1e75
 
     @classmethod
     def import_(cls, config_section: str = default_section) -> 'OptimizationParameters':
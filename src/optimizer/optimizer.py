@@ -26,7 +26,7 @@ class OptimizerInterface(metaclass=ABCMeta):
     """
     def __init__(
         self,
-        parameters: OptimizationParameters = OptimizationParameters()
+        parameters: OptimizationParameters = OptimizationParameters.import_()
     ):
         """初期化
 
@@ -0,0 +1,226 @@
+"""最適化モデルを作成・求解するソルバーのインターフェース
+
+モデルの構築で使用するメソッドは docplex の `Model` と同じ名前・引数とし,
+ソルバーごとにこのインターフェースを実装する.
+使用するソルバーは `OptimizationParameters.SOLVER` で指定する
+
+Example:
+    >>> model = make_model("highs", name="LogisticsNetworkOptimization")
+    >>> x = model.binary_var_dict(keys=[0, 1], name="x")
+    >>> model.add_constraints([x[0] + x[1] <= 1])
+"""
+from __future__ import annotations
+import os
+import gzip
+import shutil
+import tempfile
+import contextlib
+from abc import ABCMeta, abstractmethod
+from collections.abc import Iterable
+
+from .optimization_parameters import OptimizationParameters
+from .convergence import ConvergenceHistory
+
+# ソルバー名
+solver_cplex = "cplex"
+solver_highs = "highs"
+
+# gzip で圧縮されたモデルファイルの拡張子
+suffix_gzip = ".gz"
+
+
+class SolverBackend(metaclass=ABCMeta):
+    """最適化モデルを作成・求解するソルバーのインターフェース
+
+    Attributes:
+        log_file_name: 求解のログを書き込むファイル名(拡張子なし)
+        solve_details: 求解した結果の状態. `status` に結果を表す文字列を持つ
+    """
+    log_file_name: str
+
+    # 決定変数 ####################################################################
+    @abstractmethod
+    def binary_var_dict(
+        self, keys: Iterable, lb=None, name: str | None = None
+    ) -> dict:
+        """キーごとの 0-1 変数の辞書を作成
+
+        Args:
+            lb: 下限. 数値か, キーから下限を計算する関数. 1 とすれば値を 1 に固定する
+        """
+        pass
+
+    @abstractmethod
+    def continuous_var_dict(
+        self, keys: Iterable, lb=None, ub=None, name: str | None = None
+    ) -> dict:
+        """キーごとの連続変数の辞書を作成
+
+        Args:
+            lb: 下限. 数値か, キーから下限を計算する関数. 指定しなければ 0
+            ub: 上限. 数値か, キーから上限を計算する関数. 指定しなければ上限なし
+        """
+        pass
+
+    # 式 ####################################################################
+    @abstractmethod
+    def sum(self, args: Iterable):
+        """変数, 式, 数値の和"""
+        pass
+
+    @abstractmethod
+    def sum_vars(self, dvars: Iterable):
+        """変数のみの和. `sum` より速い"""
+        pass
+
+    @abstractmethod
+    def scal_prod(self, terms: Iterable, coefs: Iterable):
+        """変数と係数の積の和"""
+        pass
+
+    # 目的関数・制約 ####################################################################
+    @abstractmethod
+    def minimize(self, expr):
+        """目的関数を最小化として設定"""
+        pass
+
+    @abstractmethod
+    def add_constraints(self, cts: Iterable) -> list:
+        """制約をまとめて追加し, 追加した制約のリストを出力"""
+        pass
+
+    @property
+    @abstractmethod
+    def number_of_constraints(self) -> int:
+        pass
+
+    @property
+    @abstractmethod
+    def number_of_variables(self) -> int:
+        pass
+
+    # パラメータ ####################################################################
+    @abstractmethod
+    def set_parameters(self, anOptimizeParameters: OptimizationParameters):
+        """最適化に関するパラメータのうち, ソルバーが扱えるものを全て設定"""
+        pass
+
+    @abstractmethod
+    def parameters_in_effect(self) -> dict:
+        """設定されているパラメータ名と値の辞書"""
+        pass
+
+    # 求解 ####################################################################
+    @abstractmethod
+    def solve(self, log_output=None):
+        """求解し, 解を出力. 解が得られなければ None
+
+        出力する解は `get_value(変数)`, `get_values(変数のリスト)`,
+        `get_value_dict(変数の辞書)`, `get_objective_value()` を持つ
+
+        Args:
+            log_output: 求解のログを書き込むファイルオブジェクト
+        """
+        pass
+
+    @abstractmethod
+    def record_progress(self, aConvergenceHistory: ConvergenceHistory):
+        """以降の求解で, 暫定解か下界が変わるたびに `aConvergenceHistory` に追加する"""
+        pass
+
+    @abstractmethod
+    def new_solution(self, var_value_dict: dict, name: str | None = None):
+        """変数と値の辞書から, MIP start に使用する解を作成"""
+        pass
+
+    @abstractmethod
+    def add_mip_start(
+        self, mip_start_sol, effort_level=None, complete_vars=False
+    ):
+        """MIP start を追加"""
+        pass
+
+    @abstractmethod
+    def clear_mip_starts(self):
+        """追加した MIP start を全て削除"""
+        pass
+
+    # ファイル ####################################################################
+    @abstractmethod
+    def write_model(self, path: str):
+        """モデルを拡張子(`.lp`, `.mps`)に応じた形式のファイルに書き込む"""
+        pass
+
+    @classmethod
+    @abstractmethod
+    def read_model(cls, path: str, name: str) -> SolverBackend:
+        """LP/MPS 形式のファイルからモデルを作成"""
+        pass
+
+
+def make_model(solver: str, name: str, **options) -> SolverBackend:
+    """ソルバー名に対応する最適化モデルを作成
+
+    Args:
+        solver: ソルバー名
+        name: モデル名
+        options: モデルを作成する際に渡すオプション
+    """
+    return backend_class(solver)(name=name, **options)
+
+
+def backend_class(solver: str) -> type[SolverBackend]:
+    """ソルバー名に対応する `SolverBackend` のクラス
+
+    Note:
+        * ソルバーのパッケージはオプションの依存パッケージのため, 使用する時点で読み込む
+    """
+    if solver == solver_cplex:
+        from .cplex_model import CplexModel
+        return CplexModel
+    if solver == solver_highs:
+        from .highs_model import HighsModel
+        return HighsModel
+    raise ValueError(f"Unknown solver: {solver}")
+
+
+def write_model(model: SolverBackend, path: str):
+    """モデルを LP/MPS 形式のファイルに書き込む
+
+    `.lp.gz` のように `.gz` で終わるファイル名であれば gzip で圧縮する.
+    ソルバーによって圧縮して書き込めるか異なるため, 一時ファイルに書き込んでから圧縮する
+    """
+    if not path.endswith(suffix_gzip):
+        model.write_model(path)
+        return
+    with tempfile.TemporaryDirectory() as dir_tmp:
+        path_tmp = os.path.join(
+            dir_tmp, os.path.basename(path).removesuffix(suffix_gzip)
+        )
+        model.write_model(path_tmp)
+        with open(path_tmp, "rb") as f_in, gzip.open(path, "wb") as f_out:
+            shutil.copyfileobj(f_in, f_out)
+
+
+@contextlib.contextmanager
+def uncompressed(path: str):
+    """gzip で圧縮されたファイルであれば一時ファイルに展開し, そのパスを出力"""
+    if not path.endswith(suffix_gzip):
+        yield path
+        return
+    with tempfile.TemporaryDirectory() as dir_tmp:
+        path_tmp = os.path.join(
+            dir_tmp, os.path.basename(path).removesuffix(suffix_gzip)
+        )
+        with gzip.open(path, "rb") as f_in, open(path_tmp, "wb") as f_out:
+            shutil.copyfileobj(f_in, f_out)
+        yield path_tmp
+
+
+def read_model(solver: str, path: str, name: str) -> SolverBackend:
+    """LP/MPS 形式のファイルから, ソルバー名に対応する最適化モデルを作成
+
+    `.gz` で終わるファイル名であれば gzip で展開してから読み込む
+    """
+    with uncompressed(path) as path_model:
+        return backend_class(solver).read_model(path_model, name)
@@ -1,27 +1,93 @@
 """ソルバーを用いて最適化する際のインターフェース
 """
 from abc import ABCMeta, abstractmethod
-import time
+from collections.abc import Iterable
 
 from ..logger.logger import get_main_logger
-from .optimizer import OptimizerInterface, OptimizationConstants, OptimizedResult
+from .optimizer import OptimizerInterface
+from .optimization_input import OptimizationInput
+from .optimization_parameters import OptimizationParameters
+from .solver_backend import make_model, write_model, read_model
+from .convergence import ConvergenceHistory
+from .build_step import (
+    BuildPipeline, kind_variable, kind_objective, kind_constraint
+)
 
 logger = get_main_logger()
 
 
-class SolverOptimizer(OptimizerInterface, metaclass=ABCMeta):
+class SolverOptimizer(OptimizerInterface, BuildPipeline, metaclass=ABCMeta):
     """ソルバーを用いて最適化を実行するインターフェース
 
-    主に定式化等を扱う
+    主に定式化等を扱う. 決定変数, 目的関数, 制約を設定するメソッドは
+    `build_step` のデコレータで登録する.
+    モデルはパラメータの `SOLVER` で指定したソルバーの `SolverBackend` で作成するため,
+    定式化は docplex の `Model` と同じ名前のメソッドのみで記述する
 
     Example:
-        >>> Optimizer(anOptimizationParameters).run(OptimizationConstants)
+        >>> Optimizer(anOptimizationParameters).run(OptimizationInput)
             与えられたパラメータと定数により最適化が実行される
+
+    Attributes:
+        model_name: モデル名
+        model_options: モデルを作成する際に渡すオプション
     """
+    model_name: str = "Optimization"
+    model_options: dict = {}
+
+    def __init__(
+        self,
+        parameters: OptimizationParameters = OptimizationParameters.import_(),
+        disabled_steps: Iterable[str] = (),
+    ):
+        """初期化
+
+        Args:
+            parameters: 最適化に関するパラメータ. 使用するソルバーもここで指定する
+            disabled_steps: 実行しない決定変数, 目的関数, 制約のメソッド名
+
+        Attributes:
+            _model: 最適化のモデル
+            convergence_history: 求解中の暫定解と下界の推移.
+                `record_convergence` を実行するまでは記録しないため None
+        """
+        super().__init__(parameters)
+        self._model = make_model(
+            parameters.SOLVER, name=self.model_name, **self.model_options
+        )
+        self._model.set_parameters(parameters)
+
+        self.build_step_records = []
+        self.set_disabled_steps(disabled_steps)
+        self._solution_values: dict[str, dict] = {}
+        self.convergence_history: ConvergenceHistory | None = None
+
+    def size_of_model(self) -> tuple[int, int]:
+        """モデルの制約数と変数数"""
+        model = self._model
+        return model.number_of_constraints, model.number_of_variables
+
+    def record_convergence(self):
+        """以降の求解で, 暫定解と下界の推移を `convergence_history` に記録する
+
+        Note:
+            * 求解のたびに前回の記録は削除する
+        """
+        if self.convergence_history is None:
+            self.convergence_history = ConvergenceHistory()
+            self._model.record_progress(self.convergence_history)
+
+    def display_parameters(self, logger):
+        """モデルに設定されているパラメータを表示"""
+        logger.info(f"Solver: {self._parameters.SOLVER}")
+        for name, value in self._model.parameters_in_effect().items():
+            logger.info(f"{name} = {value}")
+
     # 定数 ####################################################################
-    def set_constants(self, constants: OptimizationConstants):
+    @abstractmethod
+    def set_constants(self, constants: OptimizationInput):
         """定数の設定"""
-        self._constants = constants
+        pass
 
     # 決定変数 ####################################################################
     def set_var_template(self):
@@ -29,7 +95,8 @@ class SolverOptimizer(OptimizerInterface, metaclass=ABCMeta):
 
         Note:
             * 引数は取らないようにする
-            * 変数を追加する際は `set_var_*` という命名規則に従う
+            * 変数を追加する際は `set_var_*` という命名規則に従い,
+                `@decision_variable` で登録する
         """
         pass
 
@@ -37,11 +104,9 @@ class SolverOptimizer(OptimizerInterface, metaclass=ABCMeta):
         """変数の設定
 
         Note:
-            * `Optimizer` class で設定された `set_var_*` というメソッドを全て実行
+            * `@decision_variable` で登録されたメソッドを全て実行
         """
-        for func_name in dir(self):
-            if func_name.startswith("set_var_"):
-                eval(f"self.{func_name}()")
+        self.run_build_steps(kind_variable)
 
     # 目的関数 ####################################################################
     def objective_function_template(self):
@@ -49,7 +114,8 @@ class SolverOptimizer(OptimizerInterface, metaclass=ABCMeta):
 
         Note:
             * 引数は取らないようにする
-            * 目的関数を追加する際は `objective_function_*` という命名規則に従う
+            * 目的関数を追加する際は `objective_function_*` という命名規則に従い,
+                `@objective_function` で登録する
 
         Returns:
             係数まで含めた計算式. パッケージによって型が異なるので指定はしない
@@ -60,13 +126,11 @@ class SolverOptimizer(OptimizerInterface, metaclass=ABCMeta):
         """目的関数の設定
 
         Note:
-            * `Optimizer` class で設定された `objective_function_*` という
-                メソッドを全て実行し、出力を累積
+            * `@objective_function` で登録されたメソッドを全て実行し、出力を累積
         """
         obj = 0
-        for func_name in dir(self):
-            if func_name.startswith("objective_function_"):
-                obj += eval(f"self.{func_name}()")
+        for expr in self.run_build_steps(kind_objective):
+            obj += expr
         # モデルに目的関数を追加
         self._model.minimize(obj)
 
@@ -76,7 +140,8 @@ class SolverOptimizer(OptimizerInterface, metaclass=ABCMeta):
 
         Note:
             * 引数は取らないようにする
-            * 制約を追加する際は `add_constraints_*` という命名規則に従う
+            * 制約を追加する際は `add_constraints_*` という命名規則に従い,
+                `@constraint` で登録する
             * 制約ごとに for文で回すと遅いと思うので, `add_constraint_*` という関数で
                 各変数ごとの制約を入れるようにする
             * `constraints` はイテレータで実装したほうが早い
@@ -88,89 +153,75 @@ class SolverOptimizer(OptimizerInterface, metaclass=ABCMeta):
         """制約の設定
 
         Note:
-            * `Optimizer` class で設定された `add_constraints_*` というメソッドを全て実行
+            * `@constraint` で登録されたメソッドを全て実行
         """
-        for func_name in dir(self):
-            if func_name.startswith("add_constraints_"):
-                eval(f"self.{func_name}()")
+        self.run_build_steps(kind_constraint)
 
-    # 求解 ####################################################################
-    @abstractmethod
-    def result_status(self) -> str:
-        """最適化の結果出力された状態
+    # ファイル ####################################################################
+    def export_model(self, path: str):
+        """構築したモデルを LP/MPS 形式のファイルに書き込む
 
-        使用するパッケージによって異なるため, 都度実装する
+        Args:
+            path: 書き込むファイル名. 拡張子 `.lp`, `.mps` で形式を決め,
+                さらに `.gz` で終われば gzip で圧縮する
         """
-        pass
+        write_model(self._model, path)
 
-    @abstractmethod
-    def is_opt(self) -> bool:
-        """出力された結果が最適解かを出力"""
-        pass
+    def import_model(self, path: str):
+        """LP/MPS 形式のファイルから読み込んだモデルに置き換える
 
-    @abstractmethod
-    def sol_objective(self) -> float:
-        """最適化の結果の目的関数値"""
-        pass
+        定数の設定から制約の設定までを行わずに, ファイルのモデルをそのまま求解できる
 
-    @abstractmethod
-    def make_result_objects(self) -> list:
-        """最適化の結果からクラスインスタンスのリストを作成し, 解とする"""
-        pass
-
-    @abstractmethod
-    def make_result(self, elapsed_time: float) -> OptimizedResult:
-        """最適化の結果を出力
-
-        最適解でなければ出力しない. 実行可能解でも出力したい場合は変更する
-
-        Args:
-            elapsed_time: 計算にかかった時間
+        Note:
+            * 変数は入力の要素をキーにした辞書として保持されないため,
+                求解した結果は状態と目的関数値のみ扱える
         """
-        if is_opt := self.is_opt():
-            result_objects = self.make_result_objects()
-        else:
-            result_objects = []
-
-        output = OptimizedResult(
-            self.result_status(),
-            is_opt,
-            elapsed_time,
-            self._constants,
-            self.sol_objective(),
-            result_objects
+        self._model = read_model(
+            self._parameters.SOLVER, path, name=self.model_name
         )
-        return output
+        self._model.set_parameters(self._parameters)
+        if self.convergence_history is not None:
+            self._model.record_progress(self.convergence_history)
 
-    @abstractmethod
+    # 求解 ####################################################################
     def solve(self):
         """求解してその結果を保持する
 
-        モデルによって行うことがことなるので `abstractmethod`. 必ず実装する
+        `logs/{ソルバー名}.log` というファイルにソルバーの計算結果が格納される
+
+        Attributes:
+            solution: 最適化の結果. 解が得られなければ None
+            result_status: 最適化問題を解いた結果、どのような結果になったかを表す変数
         """
-        pass
+        if self.convergence_history is not None:
+            self.convergence_history.clear()
+        log_file_path = f"logs/{self._model.log_file_name}.log"
+        with open(log_file_path, mode="a+") as f:
+            self.solution = self._model.solve(log_output=f)
+        self.result_status = self._model.solve_details.status
+        self._solution_values = {}
+
+    def solution_values(self, var_dict_name: str) -> dict:
+        """決定変数の辞書と同じキーで, 解の値をまとめて取得した辞書
+
+        変数ごとに `get_value` を呼ばず, 辞書ごとに1度だけ `get_value_dict` で取得する.
+        取得した値は次に求解するまで保持し, 結果の作成・表示で使い回す
+
+        Args:
+            var_dict_name: 決定変数の辞書の属性名
+        """
+        if var_dict_name not in self._solution_values:
+            self._solution_values[var_dict_name] = \
+                self.solution.get_value_dict(getattr(self, var_dict_name))
+        return self._solution_values[var_dict_name]
 
-    def run(self, constants: OptimizationConstants) -> OptimizedResult:
-        """全てを実行して最適化を行う関数
+    def is_opt_or_feasible(self) -> bool:
+        """出力された結果が最適解か実行可能解かを出力
 
-        あらかじめインスタンスの初期化を行い, パラメータを設定しておく必要がある
-        測定する計算時間は, 定数の設定開始~求解完了まで
+        結果の出力の際, 実行不可能であれば出力しない
         """
-        start_time = time.time()
-        # 定数, 変数, 目的関数, 制約条件のセット
-        self.set_constants(constants)
-        logger.info("Constants are set")
-        self.set_decision_variables()
-        logger.info("Decision variables are set")
-        self.set_objective_function()
-        logger.info("Objective function is set")
-        self.set_constraints()
-        logger.info("Constraints are set")
-        # 求解
-        logger.info("Start solving problem.")
-        self.solve()
-        logger.info("End solving problem.")
-        # 解の出力
-        output = self.make_result(time.time() - start_time)
-        output.display_result_solve()
-        return output
+        if self.solution is None:
+            return False
+        is_opt = "optimal" in self.result_status
+        is_feasible = "feasible" in self.result_status
+        return is_opt or is_feasible
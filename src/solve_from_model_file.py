@@ -0,0 +1,54 @@
+"""LP/MPS 形式のファイルに書き込まれたモデルを, グラフから構築せずに求解する
+
+`optimize_from_csv` で書き込んだモデルのように, 保存しておいた問題をそのまま再度解く.
+使用するソルバーやパラメータは `config_optimizer.ini` の設定に従う
+
+Example:
+    $ python -m src.solve_from_model_file data/result/model.lp.gz
+"""
+import os
+import sys
+import time
+
+from .logistics_planner.logistics_planner import LogisticsPlanner
+from .logger.logger import setup_logger
+
+
+def main():
+    # logger set up
+    logger = setup_logger(os.path.basename(__file__)[:-3])
+
+    # 開始通知
+    str_start = "Solving from model file start."
+    logger.info(str_start)
+
+    # 標準入力からモデルのファイル名を取得
+    path_model = sys.argv[1]
+
+    anOptimizer = LogisticsPlanner()
+    anOptimizer.import_model(path_model)
+    logger.info(f"Model is imported from {path_model}")
+    logger.info(
+        "Number of constraints and variables: {}, {}".format(
+            *anOptimizer.size_of_model()
+        )
+    )
+    anOptimizer.display_parameters(logger)
+
+    start = time.perf_counter()
+    anOptimizer.solve()
+    elapsed = time.perf_counter() - start
+    logger.info(f"Time of solving : {elapsed:.2f}s")
+    logger.info(f"Result status : {anOptimizer.result_status}")
+    if anOptimizer.is_opt_or_feasible():
+        logger.info(
+            f"Objective value : {anOptimizer.solution.get_objective_value()}"
+        )
+
+    # 完了通知
+    str_end = "Solving from model file end."
+    logger.info(str_end)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,117 @@
+"""min_cost_flow module test"""
+import os
+import math
+import dataclasses
+
+import pytest
+
+from src.utils.config_util import test_section
+from src.optimizer.optimization_parameters import OptimizationParameters
+from src.logistics_planner.logistics_planner import LogisticsPlanner
+from src.logistics_planner.min_cost_flow import (
+    MinCostFlowPlanner, MinCostFlowException, is_min_cost_flow,
+    status_infeasible
+)
+from src.input_data.graph import Graph, Base, Lane
+from src.input_data.array_graph import ArrayGraph
+from src.input_data.input_data_maker import ArrayInputDataMaker
+from src.logger.logger import setup_logger
+
+
+logger = setup_logger(os.path.basename(__file__)[:-3])
+
+
+def make_ArrayGraph(is_zero_opening_cost: bool) -> ArrayGraph:
+    """コストが全て凸関数のレーンからなるグラフ"""
+    aGraph = ArrayGraph()
+    columns_by_type = ArrayInputDataMaker(
+        8, random_seed=3, ratio_convex_lane=1
+    ).make_columns()
+    for component_type, columns in columns_by_type.items():
+        if is_zero_opening_cost and component_type in (Base, Lane):
+            columns["opening_cost"][:] = 0
+        aGraph.add_columns(component_type, **columns)
+    return aGraph
+
+
+def run_highs(aGraph) -> LogisticsPlanner:
+    pytest.importorskip("highspy")
+    anOptimizeParameters = dataclasses.replace(
+        OptimizationParameters.import_(test_section), SOLVER="highs"
+    )
+    anOptimizer = LogisticsPlanner(anOptimizeParameters)
+    _ = anOptimizer.run(aGraph, Graph(), logger)
+    assert "optimal" in anOptimizer.result_status
+    return anOptimizer
+
+
+def test_run():
+    """開設費がなければ, 混合整数計画問題と同じ目的関数値になるか
+
+    テスト項目:
+        * 目的関数値が `LogisticsPlanner` と一致する
+        * 出力したグラフのコストが目的関数値と一致する
+    """
+    aGraph = make_ArrayGraph(is_zero_opening_cost=True)
+    assert is_min_cost_flow(aGraph)
+
+    aMinCostFlowPlanner = MinCostFlowPlanner()
+    result = aMinCostFlowPlanner.run(aGraph, Graph(), logger)
+    assert aMinCostFlowPlanner.is_opt_or_feasible()
+    assert math.isclose(result.costs(), aMinCostFlowPlanner.objective_value)
+
+    anOptimizer = run_highs(aGraph)
+    assert math.isclose(
+        aMinCostFlowPlanner.objective_value,
+        anOptimizer.solution.get_objective_value(),
+        rel_tol=1e-4
+    )
+
+
+def test_solve_fixed_design():
+    """開設を固定すると, 開設費を含めた総コストが計算されるか
+
+    テスト項目:
+        * 開設費があれば `run` は例外を出す
+        * 混合整数計画問題の解の開設で計算した総コストが, その目的関数値と一致する
+    """
+    aGraph = make_ArrayGraph(is_zero_opening_cost=False)
+    assert not is_min_cost_flow(aGraph)
+    with pytest.raises(MinCostFlowException):
+        MinCostFlowPlanner().run(aGraph, Graph(), logger)
+
+    anOptimizer = run_highs(aGraph)
+    # 許容誤差内で0でない値の 0-1 変数も開設とならないよう, 丸めてから判定
+    open_base_ids, open_lane_ids = (
+        [
+            component.id_
+            for component, value in anOptimizer.solution_values(name).items()
+            if round(value)
+        ]
+        for name in ("var_bool_open_base", "var_bool_open_lane")
+    )
+    aMinCostFlowPlanner = MinCostFlowPlanner()
+    aMinCostFlowPlanner.set_constants(aGraph)
+    aMinCostFlowPlanner.solve(open_base_ids, open_lane_ids)
+    assert aMinCostFlowPlanner.is_opt_or_feasible()
+    assert math.isclose(
+        aMinCostFlowPlanner.objective_value,
+        anOptimizer.solution.get_objective_value(),
+        rel_tol=1e-4
+    )
+
+
+def test_solve_infeasible():
+    """需要を満たせなければ, 実行不能として入力をそのまま返すか"""
+    aGraph = Graph()
+    aGraph.add_many([
+        Graph.base(0, 0, 10), Graph.base(1, 0, 10, 5),
+        Graph.base_supply(0, 0, 1, 10),
+        Graph.lane(0, 0, 1, 1, 0, 3),
+    ])
+    aMinCostFlowPlanner = MinCostFlowPlanner()
+    aGraph_output = Graph()
+    result = aMinCostFlowPlanner.run(aGraph, aGraph_output, logger)
+    assert aMinCostFlowPlanner.result_status == status_infeasible
+    assert result is aGraph_output
+    assert not result.bases()
@@ -0,0 +1,166 @@
+"""presolve module test"""
+import os
+import math
+import dataclasses
+
+import pytest
+
+from src.utils.config_util import read_config, test_section
+from src.optimizer.optimization_parameters import OptimizationParameters
+from src.logistics_planner.logistics_planner import LogisticsPlanner
+from src.logistics_planner.presolve import (
+    presolve, tighten_bounds, CapacityBounds, convex_lane_ids
+)
+from src.input_data.graph import Graph
+from src.data_access.data_access import CsvHandler
+from src.logger.logger import setup_logger
+
+
+path_data = read_config(section=test_section).get("PATH_DATA")
+
+logger = setup_logger(os.path.basename(__file__)[:-3])
+
+
+@pytest.fixture
+def aGraph() -> Graph:
+    """除かれる拠点・レーンを含むグラフ
+
+    拠点:
+        * 0: 最低限5生産する生産拠点
+        * 1: 需要5の需要拠点
+        * 2: 中継する拠点
+        * 3: 物量上限が0の拠点
+        * 4: 生産拠点から到達できるが, 需要拠点に到達できない拠点
+        * 5: 需要拠点に到達できるが, 生産拠点から到達できない拠点
+    """
+    aGraph = Graph()
+    aGraph.add_many([
+        Graph.base(0, 1, 10), Graph.base(1, 1, 10, 5),
+        Graph.base(2, 1, 10), Graph.base(3, 1, 0),
+        Graph.base(4, 1, 10), Graph.base(5, 1, 10),
+        Graph.base_supply(0, 5, 1, 10),
+    ])
+    aGraph.add_many(
+        Graph.lane(id_, start, end, 1, 1, upper)
+        for id_, (start, end, upper) in enumerate([
+            (0, 2, 10), (2, 1, 10), (0, 1, 0), (0, 3, 10), (3, 1, 10),
+            (0, 4, 10), (5, 1, 10),
+        ])
+    )
+    aGraph.add_many([
+        Graph.lane_singular_point(1, 5, 1),
+        Graph.lane_singular_point(5, 5, 1),
+    ])
+    return aGraph
+
+
+def test_presolve(aGraph):
+    """除くべき拠点・レーンのみ除かれ, その内容が出力されるか
+
+    テスト項目:
+        * 物量上限が0のレーン, 拠点とそのレーン, 到達できない拠点・レーンが除かれる
+        * 除いたレーンのコスト変化点も除かれる
+        * 需要拠点と, 最低限生産する量がある生産拠点の開設が固定される
+        * 入力のグラフは変更されない
+    """
+    aGraph_presolved, aPresolveReport = presolve(aGraph)
+
+    assert {base.id_ for base in aGraph_presolved.bases()} == {0, 1, 2}
+    assert {lane.id_ for lane in aGraph_presolved.lanes()} == {0, 1}
+    assert len(aGraph_presolved.base_supplies()) == 1
+    assert {
+        lsp.lane_id for lsp in aGraph_presolved.lane_singular_points()
+    } == {1}
+
+    assert aPresolveReport.lane_ids_zero_upper == [2]
+    assert aPresolveReport.base_ids_zero_capacity == [3]
+    assert aPresolveReport.lane_ids_zero_capacity_base == [3, 4]
+    assert aPresolveReport.base_ids_unreachable == [4, 5]
+    assert aPresolveReport.lane_ids_unreachable == [5, 6]
+    assert aPresolveReport.num_removed_lane_singular_points == 1
+    assert aPresolveReport.base_ids_fixed_open == [0, 1]
+    assert aPresolveReport.num_removed_bases == 3
+    assert aPresolveReport.num_removed_lanes == 5
+
+    assert len(aGraph.bases()) == 6
+    assert len(aGraph.lanes()) == 7
+
+
+def test_tighten_bounds(aGraph):
+    """拠点・レーンの物量上限が, 総需要と隣接する上限まで小さくなるか
+
+    テスト項目:
+        * 拠点の上限が総需要以下になる
+        * 到着拠点・出発拠点の上限が0のレーンの上限が0になる
+        * 入ってくる物量がない拠点の上限が0になり, そこから出るレーンの上限も0になる
+    """
+    aCapacityBounds = tighten_bounds(aGraph)
+
+    assert aCapacityBounds.base == {0: 5, 1: 5, 2: 5, 3: 0, 4: 5, 5: 0}
+    assert aCapacityBounds.lane == {
+        0: 5, 1: 5, 2: 0, 3: 0, 4: 0, 5: 5, 6: 0
+    }
+    assert aCapacityBounds.num_tightened(
+        CapacityBounds.from_graph(aGraph)
+    ) == (5, 6)
+
+
+@pytest.mark.parametrize("is_tightening_bounds", [True, False])
+def test_run_tightened(is_tightening_bounds):
+    """物量上限を小さくしても, しない場合と同じ目的関数値になるか"""
+    pytest.importorskip("highspy")
+    aCsvHandler = CsvHandler(path_data)
+    aGraph = aCsvHandler.read_lane_singular_points(
+        aCsvHandler.read_constants(Graph())
+    )
+    anOptimizeParameters = dataclasses.replace(
+        OptimizationParameters.import_(test_section), SOLVER="highs"
+    )
+    anOptimizer = LogisticsPlanner(
+        anOptimizeParameters, is_tightening_bounds=is_tightening_bounds
+    )
+    _ = anOptimizer.run(aGraph, Graph(), logger)
+    assert "optimal" in anOptimizer.result_status
+    assert math.isclose(anOptimizer.solution.get_objective_value(), 25)
+
+
+def test_convex_lane_ids():
+    """コスト変化点区間のコストが単調非減少のレーンのみ判定されるか
+
+    テスト項目:
+        * コストが上がる, または変わらないレーンは対象となる
+        * コストが下がる区間があるレーン, コスト変化点がないレーンは対象外となる
+    """
+    aGraph = Graph()
+    aGraph.add_many(
+        Graph.lane(id_, 0, 1, cost, 0, 10)
+        for id_, cost in enumerate([1, 1, 1, 1])
+    )
+    aGraph.add_many([
+        Graph.lane_singular_point(0, 3, 2),
+        Graph.lane_singular_point(0, 6, 4),
+        Graph.lane_singular_point(1, 3, 1),
+        Graph.lane_singular_point(2, 3, 2),
+        Graph.lane_singular_point(2, 6, 1),
+    ])
+    aGraph.add_zero_flow()
+    assert convex_lane_ids(aGraph) == {0, 1}
+
+
+def test_run_presolved():
+    """前処理したグラフでも, 前処理しない場合と同じ目的関数値になるか"""
+    pytest.importorskip("highspy")
+    aCsvHandler = CsvHandler(path_data)
+    aGraph = aCsvHandler.read_lane_singular_points(
+        aCsvHandler.read_constants(Graph())
+    )
+    aGraph_presolved, aPresolveReport = presolve(aGraph)
+    aPresolveReport.display(logger)
+
+    anOptimizeParameters = dataclasses.replace(
+        OptimizationParameters.import_(test_section), SOLVER="highs"
+    )
+    anOptimizer = LogisticsPlanner(anOptimizeParameters)
+    _ = anOptimizer.run(aGraph_presolved, Graph(), logger)
+    assert "optimal" in anOptimizer.result_status
+    assert math.isclose(anOptimizer.solution.get_objective_value(), 25)
@@ -0,0 +1,70 @@
+import pytest
+
+from src.optimizer.build_step import (
+    BuildPipeline, decision_variable, constraint,
+    kind_variable, kind_constraint, resolve_build_steps
+)
+
+
+class Pipeline(BuildPipeline):
+    """行・列の数を数えるだけの構築手順を持つクラス"""
+    def __init__(self):
+        self.num_rows = 0
+        self.num_columns = 0
+
+    def size_of_model(self):
+        return self.num_rows, self.num_columns
+
+    @decision_variable
+    def set_var_b(self):
+        self.num_columns += 2
+
+    @decision_variable
+    def set_var_a(self):
+        self.num_columns += 1
+
+    @constraint
+    def add_constraints_a(self):
+        self.num_rows += 3
+
+    def add_constraints_not_registered(self):
+        self.num_rows += 100
+
+
+class SubPipeline(Pipeline):
+    @decision_variable
+    def set_var_b(self):
+        self.num_columns += 5
+
+    @constraint
+    def add_constraints_b(self):
+        self.num_rows += 1
+
+
+def test_resolve_build_steps():
+    """定義順に解決され, 上書きしたメソッドは親クラスの位置に置かれることを確認"""
+    assert resolve_build_steps(Pipeline, kind_variable) == \
+        ("set_var_b", "set_var_a")
+    assert resolve_build_steps(SubPipeline, kind_variable) == \
+        ("set_var_b", "set_var_a")
+    assert resolve_build_steps(SubPipeline, kind_constraint) == \
+        ("add_constraints_a", "add_constraints_b")
+
+
+def test_run_build_steps():
+    """登録された手順のみ実行され, 追加された行・列の数が記録されることを確認"""
+    aPipeline = SubPipeline()
+    aPipeline.set_disabled_steps({"add_constraints_a"})
+    aPipeline.run_build_steps(kind_variable)
+    aPipeline.run_build_steps(kind_constraint)
+
+    assert aPipeline.size_of_model() == (1, 6)
+    records = {r.name: r for r in aPipeline.build_step_records}
+    assert set(records) == {"set_var_a", "set_var_b", "add_constraints_b"}
+    assert records["set_var_b"].num_columns == 5
+    assert records["add_constraints_b"].num_rows == 1
+
+
+def test_set_disabled_steps_unknown():
+    with pytest.raises(ValueError):
+        Pipeline().set_disabled_steps({"add_constraints_not_registered"})
@@ -0,0 +1,53 @@
+import math
+
+import pytest
+
+from src.optimizer.convergence import ConvergenceHistory, ProgressRecord
+from src.optimizer.solver_backend import make_model, solver_highs
+
+
+def test_append_and_time_to_gap():
+    """暫定解か下界が変わった記録のみ残り, ギャップに達した時刻が取得できることを確認"""
+    aConvergenceHistory = ConvergenceHistory()
+    for record in [
+        ProgressRecord.make(0.1, math.inf, -math.inf, math.inf),
+        ProgressRecord.make(0.2, 20, 10, 0.5),
+        ProgressRecord.make(0.3, 20, 10, 0.5),
+        ProgressRecord.make(0.4, 20, 19, 0.05),
+        ProgressRecord.make(0.5, 19, 19, 0),
+    ]:
+        aConvergenceHistory.append(record)
+
+    assert [r.time for r in aConvergenceHistory.records] == [
+        0.1, 0.2, 0.4, 0.5
+    ]
+    first = aConvergenceHistory.records[0]
+    assert first.incumbent is None and first.gap is None
+    assert aConvergenceHistory.time_to_gap(0.1) == 0.4
+    assert aConvergenceHistory.time_to_gap(0) == 0.5
+    assert ConvergenceHistory().time_to_gap(0.1) is None
+
+    aConvergenceHistory.clear()
+    assert not aConvergenceHistory.records
+
+
+def test_record_progress_highs():
+    """HiGHS で求解した際に, 最適解に収束するまでの推移が記録されることを確認"""
+    pytest.importorskip("highspy")
+    model = make_model(solver_highs, name="test")
+    keys = range(8)
+    x = model.binary_var_dict(keys=keys, name="x")
+    model.add_constraints([
+        model.scal_prod([x[k] for k in keys], [3, 5, 7, 4, 6, 8, 2, 9]) <= 20
+    ])
+    model.minimize(
+        model.scal_prod([x[k] for k in keys], [-4, -6, -9, -5, -7, -8, -2, -9])
+    )
+    aConvergenceHistory = ConvergenceHistory()
+    model.record_progress(aConvergenceHistory)
+    solution = model.solve()
+
+    assert aConvergenceHistory.records
+    last = aConvergenceHistory.records[-1]
+    assert last.incumbent == pytest.approx(solution.get_objective_value())
+    assert aConvergenceHistory.time_to_gap(1e-4) is not None
@@ -0,0 +1,47 @@
+import math
+
+import numpy as np
+import pytest
+
+from src.optimizer.solver_backend import make_model, solver_highs
+
+pytest.importorskip("highspy")
+
+
+def make_model_highs():
+    return make_model(solver_highs, name="test")
+
+
+def test_constraint_moves_constant_to_rhs():
+    """式の定数が右辺に移され, 係数が変数ごとにまとめられることを確認"""
+    model = make_model_highs()
+    x = model.continuous_var_dict(keys=[0, 1], name="x")
+    ct = 2 * x[0] + x[1] + 3 <= x[1] / 2 + 1
+    assert ct.expr.coefs == {x[0].index: 2, x[1].index: 0.5}
+    assert ct.ub == -2
+    assert math.isinf(ct.lb)
+
+
+def test_solve():
+    """numpy の数値を係数にしても求解でき, 解の値が取得できることを確認"""
+    model = make_model_highs()
+    x = model.binary_var_dict(keys=[0], name="x")[0]
+    q = model.continuous_var_dict(
+        keys=[0], lb=lambda key: 0, ub=10, name="q"
+    )[0]
+    model.add_constraints([q <= np.int64(5) * x, q == 3])
+    model.minimize(model.scal_prod([x, q], [7, 2]))
+    solution = model.solve()
+
+    assert "optimal" in model.solve_details.status
+    assert solution.get_objective_value() == pytest.approx(13)
+    assert solution.get_value(x) == pytest.approx(1)
+    assert model.number_of_constraints == 2
+    assert solution.get_values([x, q]) == pytest.approx([1, 3])
+    assert solution.get_value_dict({"x": x, "q": q}) == \
+        pytest.approx({"x": 1, "q": 3})
+
+
+def test_unknown_solver():
+    with pytest.raises(ValueError):
+        make_model("unknown", name="test")
@@ -6,3 +6,7 @@ def test_import_():
     test_parameter = OptimizationParameters.import_(test_section)
 
     assert test_parameter.NUM_THREADS == 1
+    assert test_parameter.PARALLEL_MODE == 1
+    # TEST セクションにないパラメータは DEFAULT セクションの値
+    assert test_parameter.MAX_SECONDS == 1800
+    assert test_parameter.MIP_GAP == 1e-4
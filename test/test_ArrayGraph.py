@@ -0,0 +1,112 @@
+""""ArrayGraph module test"""
+import os
+
+import pytest
+import numpy as np
+
+from src.utils.config_util import read_config, test_section
+from src.input_data.graph import Graph, Lane
+from src.input_data.array_graph import ArrayGraph, ArrayGraphException
+from src.data_access.data_access import CsvHandler
+from src.logistics_planner.logistics_planner import LogisticsPlanner
+from src.logger.logger import setup_logger
+
+
+path_data = read_config(section=test_section).get("PATH_DATA")
+
+logger = setup_logger(os.path.basename(__file__)[:-3])
+
+
+def make_graph(aGraph):
+    """テストデータを読み込み, コスト変化点区間の物量まで追加したグラフを作成"""
+    aCsvHandler = CsvHandler(path_data)
+    aGraph = aCsvHandler.read_constants(aGraph)
+    aGraph = aCsvHandler.read_lane_singular_points(aGraph)
+    aGraph.add_zero_flow()
+    return aGraph
+
+
+def test_same_components_as_graph():
+    """`Graph` と同じ要素, 抽出結果が得られることを確認"""
+    aGraph = make_graph(Graph())
+    anArrayGraph = make_graph(ArrayGraph())
+
+    assert anArrayGraph.bases() == aGraph.bases()
+    assert anArrayGraph.lanes() == aGraph.lanes()
+    assert anArrayGraph.sorted_flows() == aGraph.sorted_flows()
+    assert anArrayGraph.lanes_same_start(0) == aGraph.lanes_same_start(0)
+    assert anArrayGraph.lanes_same_end(2) == aGraph.lanes_same_end(2)
+    assert anArrayGraph.flows_same_lane(0) == aGraph.flows_same_lane(0)
+    assert anArrayGraph.search_flow_by_end(0, 2) == \
+        aGraph.search_flow_by_end(0, 2)
+    assert anArrayGraph.costs() == aGraph.costs()
+
+
+def test_search_not_found():
+    """存在しない要素を検索すると KeyError となることを確認"""
+    anArrayGraph = make_graph(ArrayGraph())
+    with pytest.raises(KeyError):
+        anArrayGraph.search_lane(100)
+    with pytest.raises(KeyError):
+        anArrayGraph.search_flow_by_start(0, 3)
+
+
+def test_add_columns():
+    """列ごとにまとめて追加でき, 列が足りなければエラーとなることを確認"""
+    anArrayGraph = ArrayGraph()
+    anArrayGraph.add_columns(
+        Lane, id_=[0, 1], start_base_id=[0, 1], end_base_id=[1, 0],
+        cost_by_quantity=[1, 1], opening_cost=[1, 1], quantity_upper=[2, 3]
+    )
+    assert anArrayGraph.search_lane(1).quantity_upper == 3
+    with pytest.raises(ArrayGraphException):
+        anArrayGraph.add_columns(Lane, id_=[2])
+
+
+def test_add_out_of_range():
+    """整数の列に保持する型の範囲外の値を追加すると, 桁あふれせずエラーとなることを確認"""
+    anArrayGraph = ArrayGraph()
+    with pytest.raises(ArrayGraphException):
+        anArrayGraph.add_columns(
+            Lane, id_=[0], start_base_id=[0], end_base_id=[1],
+            cost_by_quantity=[1], opening_cost=np.array([3_000_000_000]),
+            quantity_upper=[1]
+        )
+
+
+def test_add_out_of_range_keeps_rows():
+    """範囲外の値の要素を追加するとその時点でエラーとなり, それまでの要素が残ることを確認"""
+    anArrayGraph = ArrayGraph()
+    aLane = Graph.lane(0, 0, 1, 1, 1, 5)
+    anArrayGraph.add(aLane)
+    with pytest.raises(ArrayGraphException):
+        anArrayGraph.add(Graph.lane(1, 0, 1, 1, 1, 2**40))
+    assert anArrayGraph.lanes() == {aLane}
+    assert anArrayGraph.lanes() == {aLane}
+    columns = anArrayGraph.columns_of(Lane)
+    assert {len(columns.column(name)) for name in columns.fields} == {1}
+    assert len(columns) == 1
+
+    # 物量は小数の列のため, 整数の型の範囲を超えても追加できる
+    anArrayGraph.add(Graph.flow(0, 0, 5, 1, 1e12))
+    assert [flow.quantity for flow in anArrayGraph.flows()] == [1e12]
+
+
+def test_from_graph():
+    aGraph = make_graph(Graph())
+    assert ArrayGraph.from_graph(aGraph).flows() == aGraph.flows()
+
+
+@pytest.mark.cplex
+def test_run():
+    """`Graph` と同じ最適値が得られることを確認"""
+    aCsvHandler = CsvHandler(path_data)
+    lst_objective = []
+    for aGraph in (Graph(), ArrayGraph()):
+        aGraph = aCsvHandler.read_lane_singular_points(
+            aCsvHandler.read_constants(aGraph)
+        )
+        anOptimizer = LogisticsPlanner()
+        anOptimizer.run(aGraph, Graph(), logger)
+        lst_objective.append(anOptimizer.solution.get_objective_value())
+    assert lst_objective[0] == pytest.approx(lst_objective[1])
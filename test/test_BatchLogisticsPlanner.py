@@ -0,0 +1,62 @@
+""""BatchLogisticsPlanner module test"""
+from collections import Counter
+
+from src.utils.config_util import read_config, test_section
+from src.logistics_planner.logistics_planner import LogisticsPlanner
+from src.logistics_planner.batch_logistics_planner import (
+    BatchLogisticsPlanner
+)
+from src.input_data.graph import Graph
+from src.data_access.data_access import CsvHandler
+
+
+path_data = read_config(section=test_section).get("PATH_DATA")
+
+
+def build(planner_class):
+    """テストデータからモデルを構築した planner を出力"""
+    aCsvHandler = CsvHandler(path_data)
+    aGraph = aCsvHandler.read_lane_singular_points(
+        aCsvHandler.read_constants(Graph())
+    )
+    aPlanner = planner_class()
+    aPlanner.set_constants(aGraph)
+    aPlanner.set_decision_variables()
+    aPlanner.set_objective_function()
+    aPlanner.set_constraints()
+    return aPlanner
+
+
+def canonical_expr(left, right=None):
+    """線形式 (left - right) を (変数名, 係数) の集合と定数に変換"""
+    coefs = Counter()
+    constant = 0
+    for expr, sign in ((left, 1), (right, -1)):
+        if expr is None:
+            continue
+        expr = expr.to_linear_expr()
+        for var, coef in expr.iter_terms():
+            coefs[var.name] += sign * coef
+        constant += sign * expr.constant
+    terms = frozenset((name, coef) for name, coef in coefs.items() if coef)
+    return terms, constant
+
+
+def canonical_model(model):
+    """モデルを制約の順序, 式中の項の順序に依存しない形に変換"""
+    constraints = Counter(
+        (ct.sense, canonical_expr(ct.left_expr, ct.right_expr))
+        for ct in model.iter_constraints()
+    )
+    variables = {
+        (var.name, var.vartype.short_name, var.lb, var.ub)
+        for var in model.iter_variables()
+    }
+    return variables, canonical_expr(model.objective_expr), constraints
+
+
+def test_same_model():
+    """`LogisticsPlanner` と同じモデルが構築されることを確認"""
+    expected = canonical_model(build(LogisticsPlanner)._model)
+    actual = canonical_model(build(BatchLogisticsPlanner)._model)
+    assert actual == expected
@@ -3,7 +3,7 @@ import unittest
 import os
 
 from src.utils.config_util import read_config, test_section
-from src.input_data.graph import Graph
+from src.input_data.graph import Graph, Flow
 from src.data_access.data_access import CsvHandler
 
 
@@ -27,6 +27,26 @@ class TestCsvHandler(unittest.TestCase):
             test_obj.search_lane_singular_point(0, 1).cost_by_quantity, 2
         )
 
+    def test_read_with_dtype(self):
+        """列の型を属性の型で固定し, 物量は小数のまま読み込めることを確認"""
+        aGraph = Graph()
+        aGraph.add(Graph.flow(0, 0, 1, 1, 0.5))
+        file_name = "result/test_dtype.csv"
+        self._aCsvHandler.write(list(aGraph.flows()), file_name)
+        test_obj = CsvHandler(self._path_data, is_progress=True).read_flows(
+            Graph(), file_name
+        )
+        os.remove(self._path_data + file_name)
+
+        flow = test_obj.search_flow_by_start(0, 0)
+        self.assertIs(type(flow.lane_id), int)
+        self.assertEqual(flow.quantity, 0.5)
+
+        lanes = self._aCsvHandler.read_lanes(Graph()).lanes()
+        self.assertTrue(
+            all(type(lane.quantity_upper) is int for lane in lanes)
+        )
+
     def test_write(self):
         """書き込みのテスト"""
         self._aGraph.add(Graph.flow(0, 0, 1, 1, 1))
@@ -40,6 +60,31 @@ class TestCsvHandler(unittest.TestCase):
         # テストが終わったらファイルを削除しておく
         os.remove(self._path_data + file_name)
 
+    def test_write_empty(self):
+        """要素が空でも, クラスを指定すれば列名のみのファイルが書き込まれることを確認"""
+        file_name = "result/test_empty.csv"
+        self._aCsvHandler.write([], file_name, component_type=Flow)
+        test_obj = self._aCsvHandler.read_flows(Graph(), file_name)
+        os.remove(self._path_data + file_name)
+        self.assertEqual(test_obj.flows(), set())
+
+        with self.assertRaises(ValueError):
+            self._aCsvHandler.write([], file_name)
+
+    def test_write_chunked(self):
+        """ジェネレータを分割して書き込み, 追記しても列名が重複しないことを確認"""
+        flows = [Graph.flow(lane_id, 0, 1, 1, 1) for lane_id in range(5)]
+        file_name = "result/test_chunked.csv"
+        aCsvHandler = CsvHandler(self._path_data)
+        aCsvHandler.chunk_size = 2
+        aCsvHandler.write((flow for flow in flows[:3]), file_name)
+        aCsvHandler.write(
+            (flow for flow in flows[3:]), file_name, is_truncate=False
+        )
+        test_obj = aCsvHandler.read_flows(Graph(), file_name)
+        os.remove(self._path_data + file_name)
+        self.assertEqual(test_obj.flows(), set(flows))
+
     def tearDown(self):
         pass
 
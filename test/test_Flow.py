@@ -25,6 +25,19 @@ class TestFlow(unittest.TestCase):
         self._aGraph.add(test_flow)
         self.assertEqual(self._aGraph.flows(), {self._aFlow, test_flow})
 
+    def test_search_flow(self):
+        """レーンID, コスト変化開始点・終了点から `Flow` インスタンスを取得できることを確認"""
+        test_flow = Graph.flow(self._lane_id, 2, 4, 3)
+        self._aGraph.add(test_flow)
+        self.assertEqual(
+            self._aGraph.search_flow_by_start(self._lane_id, 2), test_flow
+        )
+        self.assertEqual(
+            self._aGraph.search_flow_by_end(self._lane_id, 2), self._aFlow
+        )
+        with self.assertRaises(KeyError):
+            self._aGraph.search_flow_by_start(self._lane_id + 1, 2)
+
 
 if __name__ == "__main__":
     unittest.main()
@@ -9,8 +9,12 @@ path_data = read_config(section=test_section).get("PATH_DATA")
 
 
 def test_add_zero_flow():
-    """レーン,　コスト変化点情報をもとに物量情報がグラフに追加されることを確認"""
-    lane_id = 0
+    """レーン,　コスト変化点情報をもとに物量情報がグラフに追加されることを確認
+
+    Note:
+        * 同じIDのレーンは1つにまとめられるため, テストデータにないレーンIDを使用
+    """
+    lane_id = 3
     lane_upper = 2
     base_cost = 3
     aLane = Graph.lane(lane_id, 0, 1, base_cost, 0, lane_upper)
@@ -32,3 +36,42 @@ def test_add_zero_flow():
         lane_id, lane_upper
     )
     assert test_aFlow.cost_by_quantity == changed_cost
+
+
+def test_index_of_sub_graph():
+    """サブグラフを追加した場合も, その中の要素が索引から抽出できることを確認"""
+    aLane = Graph.lane(0, 0, 1, 1, 0, 2)
+    aFlow = Graph.flow(0, 0, 2, 1)
+    aSubGraph = Graph()
+    aSubGraph.add(aLane)
+    aSubGraph.add(aFlow)
+    aGraph = Graph()
+    aGraph.add(aSubGraph)
+
+    assert aGraph.lanes_same_start(0) == {aLane}
+    assert aGraph.lanes_same_end(1) == {aLane}
+    assert aGraph.flows_same_lane(0) == {aFlow}
+
+
+def test_add_many():
+    """`add_many` でまとめて追加した要素が, 読み込み後の追加も含めて反映されることを確認"""
+    aGraph = Graph()
+    aGraph.add(Graph.base(0, 1, 2))
+    assert len(aGraph.bases()) == 1
+
+    aGraph.add_many([Graph.base(1, 1, 2), Graph.lane(0, 0, 1, 1, 0, 2)])
+    assert {base.id_ for base in aGraph.bases()} == {0, 1}
+    assert aGraph.search_lane(0).end_base_id == 1
+    assert len(aGraph.graph_components) == 3
+
+
+def test_replace():
+    """同じIDの要素に入れ替えた場合, 集合・索引ともに変更後の要素になることを確認"""
+    aGraph = Graph()
+    aGraph.add(Graph.lane(0, 0, 1, 1, 0, 2))
+    aLane = Graph.lane(0, 0, 1, 5, 0, 2)
+    aGraph.replace(aGraph.search_lane(0), aLane)
+
+    assert aGraph.search_lane(0).cost_by_quantity == 5
+    assert next(iter(aGraph.lanes_same_start(0))).cost_by_quantity == 5
+    assert len(aGraph.graph_components) == 1
@@ -1,8 +1,17 @@
 """make_input_data module tests"""
+import dataclasses
+
 import pytest
+import numpy as np
 
-from src.input_data.graph import Graph
-from src.input_data.input_data_maker import InputDataMaker
+from src.input_data.graph import (
+    Graph, Base, BaseSupply, Lane, LaneSingularPoint
+)
+from src.input_data.input_data_maker import (
+    InputDataMaker, ArrayInputDataMaker, topology_knn, topology_hub,
+    topology_echelon
+)
+from src.data_access.data_access import CsvHandler
 
 
 num_base = 3
@@ -80,3 +89,142 @@ def test_add_lane_singular_points(aGraph):
         * コスト変化点が少なくとも1つ作成されていること
     """
     assert len(aGraph.lane_singular_points())
+
+
+@pytest.fixture
+def columns() -> dict:
+    """テストに使用する, `ArrayInputDataMaker` で作成した列"""
+    return ArrayInputDataMaker(10).make_columns()
+
+
+def test_make_columns_reproducible(columns):
+    """同じ種であれば同じ列, 異なる種であれば異なる列が作成されるか
+
+    テスト項目:
+        * 同じ種で作成し直した列は全て一致する
+        * 種を変えるとレーンの係数が変わる
+    """
+    for component_type, dct_column in ArrayInputDataMaker(10).make_columns(
+    ).items():
+        for name, array in dct_column.items():
+            np.testing.assert_array_equal(
+                array, columns[component_type][name]
+            )
+
+    other = ArrayInputDataMaker(10, random_seed=0).make_columns()
+    assert not np.array_equal(
+        other[Lane]["cost_by_quantity"], columns[Lane]["cost_by_quantity"]
+    )
+
+
+def test_make_columns(columns):
+    """列が `InputDataMaker` と同じ規則で作成されているか
+
+    テスト項目:
+        * 拠点は指定した数だけ作成され, 生産拠点と需要拠点は被らない
+        * レーンは完全グラフになっており, 出発地と到着地が同じレーンはない
+        * コスト変化点はレーンの物量上限より小さく, 同じレーン内で変化点は増加, コストは減少する
+    """
+    bases = columns[Base]
+    assert len(bases["id_"]) == 10
+    id_demand = bases["id_"][bases["quantity_demand"] > 0]
+    assert len(id_demand)
+    assert not set(id_demand) & set(columns[BaseSupply]["base_id"])
+
+    lanes = columns[Lane]
+    assert len(lanes["id_"]) == 10 * 9
+    assert not np.any(lanes["start_base_id"] == lanes["end_base_id"])
+    assert len(set(zip(lanes["start_base_id"], lanes["end_base_id"]))) \
+        == 10 * 9
+
+    points = columns[LaneSingularPoint]
+    assert len(points["lane_id"])
+    lane_id = points["lane_id"]
+    assert np.all(
+        points["singular_point"] < lanes["quantity_upper"][lane_id]
+    )
+    assert np.all(
+        points["cost_by_quantity"] <= lanes["cost_by_quantity"][lane_id]
+    )
+    is_same_lane = lane_id[1:] == lane_id[:-1]
+    assert np.all(np.diff(points["singular_point"])[is_same_lane] > 0)
+    assert np.all(np.diff(points["cost_by_quantity"])[is_same_lane] <= 0)
+
+
+def test_write_processed_columns(columns, tmp_path):
+    """列のまま書き込んだデータを読み込むと, 列から作成したグラフと一致するか"""
+    (tmp_path / "processed").mkdir()
+    aCsvHandler = CsvHandler(f"{tmp_path}/")
+    aCsvHandler.write_processed_columns(columns)
+
+    aGraph = aCsvHandler.read_constants(Graph())
+    aGraph = aCsvHandler.read_lane_singular_points(aGraph)
+    expected = ArrayInputDataMaker(10).run(Graph())
+    # 拠点・レーンは ID のみで比較されるため, 全ての属性の値で比較する
+    for name in (
+        "sorted_bases", "sorted_base_supplies", "sorted_lanes",
+        "sorted_lane_singular_points"
+    ):
+        actual_rows = map(dataclasses.astuple, getattr(aGraph, name)())
+        expected_rows = map(dataclasses.astuple, getattr(expected, name)())
+        assert list(actual_rows) == list(expected_rows)
+
+
+@pytest.mark.parametrize("topology", [
+    topology_knn, topology_hub, topology_echelon
+])
+def test_make_columns_sparse(topology):
+    """完全グラフ以外の張り方でレーンが期待通りに作成されているか
+
+    テスト項目:
+        * レーンは完全グラフより少なく, 重複も出発地と到着地が同じものもない
+        * 生産拠点から需要拠点へのレーンは全て作成されている
+        * 物量あたりコストは生産-需要拠点間のレーンを除き, 1以上最大値以下
+    """
+    num_base = 50
+    columns = ArrayInputDataMaker(
+        num_base, topology=topology, num_neighbors=3
+    ).make_columns()
+    lanes = columns[Lane]
+    pairs = set(zip(lanes["start_base_id"], lanes["end_base_id"]))
+    assert len(pairs) == len(lanes["id_"]) < num_base * (num_base-1)
+    assert not np.any(lanes["start_base_id"] == lanes["end_base_id"])
+
+    bases = columns[Base]
+    id_demand = bases["id_"][bases["quantity_demand"] > 0]
+    for id_supply in columns[BaseSupply]["base_id"]:
+        assert {(id_supply, id_) for id_ in id_demand} <= pairs
+
+    cost = lanes["cost_by_quantity"]
+    assert np.all((cost >= 1) & (cost <= 100))
+
+
+def test_make_columns_convex():
+    """指定した割合のレーンで, コスト変化点の後にコストが上がるか
+
+    テスト項目:
+        * 割合が1であれば全てのレーンで, 変化点ごとにコストが下がらない
+        * 割合が0であれば既定と同じ列となる
+    """
+    columns = ArrayInputDataMaker(10, ratio_convex_lane=1).make_columns()
+    points = columns[LaneSingularPoint]
+    lane_id = points["lane_id"]
+    assert np.all(
+        points["cost_by_quantity"]
+        >= columns[Lane]["cost_by_quantity"][lane_id]
+    )
+    is_same_lane = lane_id[1:] == lane_id[:-1]
+    assert np.all(np.diff(points["cost_by_quantity"])[is_same_lane] >= 0)
+
+    expected = ArrayInputDataMaker(10).make_columns()[LaneSingularPoint]
+    actual = ArrayInputDataMaker(
+        10, ratio_convex_lane=0
+    ).make_columns()[LaneSingularPoint]
+    for name, array in expected.items():
+        np.testing.assert_array_equal(actual[name], array)
+
+
+def test_unknown_topology():
+    """存在しない張り方を指定するとエラーとなるか"""
+    with pytest.raises(ValueError):
+        ArrayInputDataMaker(10, topology="ring")
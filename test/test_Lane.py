@@ -23,10 +23,33 @@ def test_lanes_same_start():
         0, start_base_id, 2, 1, 2, 3
     )
     aLane_2 = Graph.lane(
-        0, start_base_id, 3, 1, 2, 3
+        1, start_base_id, 3, 1, 2, 3
     )
     aGraph = Graph()
     aGraph.add(aLane_1)
     aGraph.add(aLane_2)
     test_set = aGraph.lanes_same_start(start_base_id)
     assert len(test_set) == 2
+
+
+def test_lanes_same_end():
+    """レーンの到着拠点IDが入力拠点IDと同じレーンの集合が出力されることを確認"""
+    end_base_id = 2
+    aLane_1 = Graph.lane(0, 0, end_base_id, 1, 2, 3)
+    aLane_2 = Graph.lane(1, 1, end_base_id, 1, 2, 3)
+    aLane_3 = Graph.lane(2, end_base_id, 0, 1, 2, 3)
+    aGraph = Graph()
+    for aLane in (aLane_1, aLane_2, aLane_3):
+        aGraph.add(aLane)
+    assert aGraph.lanes_same_end(end_base_id) == {aLane_1, aLane_2}
+    assert aGraph.lanes_same_end(end_base_id + 1) == set()
+
+
+def test_hash_consistent_with_eq():
+    """同じIDのレーンは属性が異なっても等しく, 集合では1つにまとめられることを確認"""
+    aLane_1 = Graph.lane(0, 0, 1, 1, 2, 3)
+    aLane_2 = Graph.lane(0, 0, 2, 4, 5, 6)
+    assert aLane_1 == aLane_2
+    assert hash(aLane_1) == hash(aLane_2)
+    assert len({aLane_1, aLane_2}) == 1
+    assert not hasattr(aLane_1, "__dict__")
@@ -0,0 +1,77 @@
+"""NpyHandler package tests"""
+import os
+
+import pytest
+import numpy as np
+
+from src.utils.config_util import read_config, test_section
+from src.input_data.graph import Graph, Lane
+from src.input_data.array_graph import ArrayGraph
+from src.data_access.data_access import CsvHandler
+from src.data_access.npy_handler import NpyHandler
+from src.logistics_planner.logistics_planner import LogisticsPlanner
+from src.logger.logger import setup_logger
+
+
+path_data = read_config(section=test_section).get("PATH_DATA")
+
+logger = setup_logger(os.path.basename(__file__)[:-3])
+
+
+def make_Graph():
+    aCsvHandler = CsvHandler(path_data)
+    aGraph = aCsvHandler.read_constants(Graph())
+    return aCsvHandler.read_lane_singular_points(aGraph)
+
+
+def read_all(aNpyHandler, aGraph):
+    aGraph = aNpyHandler.read_constants(aGraph)
+    return aNpyHandler.read_lane_singular_points(aGraph)
+
+
+@pytest.fixture
+def aNpyHandler(tmp_path):
+    output = NpyHandler(f"{tmp_path}/")
+    output.write_processed_data(make_Graph())
+    return output
+
+
+def test_read_into_array_graph(aNpyHandler):
+    """`ArrayGraph` にはメモリマップした配列がそのまま列となり, 同じ要素が得られることを確認"""
+    anArrayGraph = read_all(aNpyHandler, ArrayGraph())
+    # ファイルの内容を複製せず, 読み取り専用のメモリマップを参照している
+    column = anArrayGraph.column(Lane, "quantity_upper")
+    assert not column.flags.owndata
+    assert not column.flags.writeable
+
+    aGraph = make_Graph()
+    assert anArrayGraph.lanes() == aGraph.lanes()
+    assert anArrayGraph.lanes_same_start(0) == aGraph.lanes_same_start(0)
+    assert anArrayGraph.search_lane_singular_point(0, 1) == \
+        aGraph.search_lane_singular_point(0, 1)
+
+
+def test_read_into_graph(aNpyHandler):
+    """`Graph` には要素を作成して追加されることを確認"""
+    assert read_all(aNpyHandler, Graph()).lanes() == make_Graph().lanes()
+
+
+def test_overwrite_while_mapped(aNpyHandler):
+    """メモリマップしたまま書き込み直しても, 読み込み済みの配列は変わらないことを確認"""
+    mapped = aNpyHandler.read_columns("processed/lanes", Lane)
+    expected = np.array(mapped["id_"])
+    aNpyHandler.write([Graph.lane(9, 0, 1, 1, 1, 1)], "processed/lanes")
+    np.testing.assert_array_equal(mapped["id_"], expected)
+    assert aNpyHandler.read_columns("processed/lanes", Lane)["id_"].tolist() \
+        == [9]
+
+
+@pytest.mark.cplex
+def test_run(aNpyHandler):
+    """メモリマップした `ArrayGraph` から `Graph` と同じ最適値が得られることを確認"""
+    lst_objective = []
+    for aGraph in (make_Graph(), read_all(aNpyHandler, ArrayGraph())):
+        anOptimizer = LogisticsPlanner()
+        anOptimizer.run(aGraph, Graph(), logger)
+        lst_objective.append(anOptimizer.solution.get_objective_value())
+    assert lst_objective[0] == pytest.approx(lst_objective[1])
@@ -0,0 +1,73 @@
+"""NpzHandler package tests"""
+import pytest
+import numpy as np
+
+from src.utils.config_util import read_config, test_section
+from src.input_data.graph import Graph, Lane, Flow
+from src.data_access.data_access import CsvHandler
+from src.data_access.npz_handler import NpzHandler
+from src.data_access.data_handler import make_data_handler
+
+
+path_data = read_config(section=test_section).get("PATH_DATA")
+
+
+def make_Graph():
+    aCsvHandler = CsvHandler(path_data)
+    aGraph = aCsvHandler.read_constants(Graph())
+    return aCsvHandler.read_lane_singular_points(aGraph)
+
+
+@pytest.fixture
+def aNpzHandler(tmp_path):
+    (tmp_path / "processed").mkdir()
+    (tmp_path / "result").mkdir()
+    return NpzHandler(f"{tmp_path}/")
+
+
+def test_write_and_read_processed_data(aNpzHandler):
+    """csv ファイルから読み込んだグラフと同じものが, npz ファイルから読み込めることを確認"""
+    aGraph = make_Graph()
+    aNpzHandler.write_processed_data(aGraph)
+    test_obj = aNpzHandler.read_lane_singular_points(
+        aNpzHandler.read_constants(Graph())
+    )
+    assert test_obj.bases() == aGraph.bases()
+    assert test_obj.base_supplies() == aGraph.base_supplies()
+    assert test_obj.lanes() == aGraph.lanes()
+    assert test_obj.lane_singular_points() == aGraph.lane_singular_points()
+    assert type(test_obj.search_lane(2).quantity_upper) is int
+
+
+def test_read_columns(aNpzHandler):
+    """指定した列のみ, csv ファイルと同じ値で読み込めることを確認"""
+    aNpzHandler.write_processed_data(make_Graph())
+    columns = ["start_base_id", "quantity_upper"]
+    test_obj = aNpzHandler.read_columns("processed/lanes.csv", Lane, columns)
+    expected = CsvHandler(path_data).read_columns(
+        "processed/lanes.csv", Lane, columns
+    )
+    assert list(test_obj) == columns
+    for column in columns:
+        np.testing.assert_array_equal(test_obj[column], expected[column])
+
+
+def test_write_without_truncate(aNpzHandler):
+    """中身を綺麗にしない場合, 既存の要素の後ろに追加されることを確認"""
+    flows = [Graph.flow(0, 0, 1, 1, 0.5), Graph.flow(1, 0, 2, 1, 1)]
+    aNpzHandler.write(flows[:1], "result/sol_flows")
+    aNpzHandler.write(flows[1:], "result/sol_flows", is_truncate=False)
+    test_obj = aNpzHandler.read_flows(Graph(), "result/sol_flows")
+    assert test_obj.flows() == set(flows)
+
+
+def test_write_empty(aNpzHandler):
+    """要素が空でも, クラスを指定すれば書き込み・読み込みできることを確認"""
+    aNpzHandler.write(iter([]), "result/sol_flows", component_type=Flow)
+    assert aNpzHandler.read_flows(Graph(), "result/sol_flows").flows() == set()
+
+
+def test_make_data_handler():
+    assert type(make_data_handler(path_data, "npz")) is NpzHandler
+    with pytest.raises(ValueError):
+        make_data_handler(path_data, "xlsx")
@@ -1,12 +1,17 @@
 """"Optimizer module test"""
 import os
 import math
+import dataclasses
 
 import pytest
 
 from src.utils.config_util import read_config, test_section
-from src.logistics_planner.logistics_planner import LogisticsPlanner
-from src.input_data.graph import Graph
+from src.optimizer.optimization_parameters import OptimizationParameters
+from src.logistics_planner.logistics_planner import (
+    LogisticsPlanner, ModelUpdateException
+)
+from src.input_data.graph import Graph, Base, Lane
+from src.input_data.input_data_maker import ArrayInputDataMaker
 from src.data_access.data_access import CsvHandler
 from src.logger.logger import setup_logger
 
@@ -37,6 +42,172 @@ def str_opt():
     return "optimal"
 
 
+def test_disabled_steps():
+    """実行しないと指定した制約は追加されず, 構築手順ごとに記録が残ることを確認"""
+    disabled = "add_constraints_base_capacity"
+    lst_num_constraints = []
+    for disabled_steps in ((), (disabled,)):
+        anOptimizer = LogisticsPlanner(disabled_steps=disabled_steps)
+        anOptimizer.set_constants(make_Graph_no_singular())
+        anOptimizer.set_decision_variables()
+        anOptimizer.set_constraints()
+        lst_num_constraints.append(anOptimizer.size_of_model()[0])
+
+    num_bases = len(make_Graph_no_singular().bases())
+    assert lst_num_constraints[0] - lst_num_constraints[1] == num_bases
+    records = {r.name for r in anOptimizer.build_step_records}
+    assert disabled not in records
+    assert "add_constraints_flow_storage" in records
+
+
+def test_set_parameters():
+    """config ファイルのパラメータがモデルに設定されることを確認"""
+    anOptimizeParameters = OptimizationParameters.import_(test_section)
+    anOptimizer = LogisticsPlanner(anOptimizeParameters)
+    parameters = anOptimizer._model.parameters
+    assert parameters.threads.get() == anOptimizeParameters.NUM_THREADS
+    assert parameters.parallel.get() == anOptimizeParameters.PARALLEL_MODE
+    assert parameters.timelimit.get() == anOptimizeParameters.MAX_SECONDS
+
+
+def test_run_highs():
+    """HiGHS でもコスト変化点が存在する場合に最適解が出力されることを確認"""
+    pytest.importorskip("highspy")
+    aGraph = make_CsvHandler().read_lane_singular_points(
+        make_Graph_no_singular()
+    )
+    anOptimizeParameters = dataclasses.replace(
+        OptimizationParameters.import_(test_section), SOLVER="highs"
+    )
+    anOptimizer = LogisticsPlanner(anOptimizeParameters)
+    _ = anOptimizer.run(aGraph, Graph(), logger)
+    assert str_opt() in anOptimizer.result_status
+    assert math.isclose(anOptimizer.solution.get_objective_value(), 25)
+
+    with pytest.raises(ModelUpdateException):
+        anOptimizer.update([Graph.base(2, 0, 4, 3)])
+
+
+def test_run_convex_lanes():
+    """コストが凸関数のレーンの変数を省略しても, 同じ目的関数値になることを確認
+
+    テスト項目:
+        * コスト変化点に到達したか否かの変数は, 凸関数でないレーンのみに設定される
+        * 省略しない場合と目的関数値が一致する
+    """
+    pytest.importorskip("highspy")
+    aGraph = ArrayInputDataMaker(
+        8, random_seed=3, ratio_convex_lane=0.5
+    ).run(Graph())
+    anOptimizeParameters = dataclasses.replace(
+        OptimizationParameters.import_(test_section), SOLVER="highs"
+    )
+    objective_values = []
+    for is_detecting_convex_lanes in (True, False):
+        anOptimizer = LogisticsPlanner(
+            anOptimizeParameters,
+            is_detecting_convex_lanes=is_detecting_convex_lanes
+        )
+        _ = anOptimizer.run(aGraph, Graph(), logger)
+        assert str_opt() in anOptimizer.result_status
+        objective_values.append(anOptimizer.solution.get_objective_value())
+
+        num_convex = sum(
+            lsp.lane_id in anOptimizer.convex_lane_ids
+            for lsp in aGraph.lane_singular_points()
+        )
+        assert len(anOptimizer.var_bool_reached_singular_point) \
+            == len(aGraph.lane_singular_points()) - num_convex
+        assert bool(num_convex) == is_detecting_convex_lanes
+    assert math.isclose(*objective_values)
+
+
+@pytest.mark.cplex
+def test_run_benders():
+    """Benders 分解でも同じ最適解が出力され, 推移が記録されることを確認
+
+    テスト項目:
+        * 開設の変数がマスター問題, 物量の変数が部分問題に分割される
+        * 1つのモデルとして解いた場合と目的関数値が一致する
+        * 最後の記録のギャップが0になる
+    """
+    aGraph = make_CsvHandler().read_lane_singular_points(
+        make_Graph_no_singular()
+    )
+    anOptimizer = LogisticsPlanner(
+        OptimizationParameters.import_(test_section), is_benders=True
+    )
+    _ = anOptimizer.run(aGraph, Graph(), logger)
+    assert str_opt() in anOptimizer.result_status
+    assert math.isclose(anOptimizer.solution.get_objective_value(), 25)
+
+    model = anOptimizer._model
+    for var in anOptimizer.var_bool_open_lane.values():
+        assert model.get_benders_annotation(var) == 0
+    for var in anOptimizer.var_quantity_flow_by_singular_point.values():
+        assert model.get_benders_annotation(var) == 1
+    records = anOptimizer.convergence_history.records
+    assert records
+    assert records[-1].gap == pytest.approx(0, abs=1e-4)
+
+
+def test_benders_unsupported():
+    """CPLEX 以外で Benders 分解を指定するとエラーになることを確認"""
+    anOptimizeParameters = dataclasses.replace(
+        OptimizationParameters.import_(test_section), SOLVER="highs"
+    )
+    with pytest.raises(ValueError):
+        LogisticsPlanner(anOptimizeParameters, is_benders=True)
+
+
+def make_changes():
+    """差分更新のテストに使用する, 拠点・拠点生産量・レーンの変更"""
+    return [
+        Graph.base(1, 1, 4, 0),
+        Graph.base(2, 0, 4, 3),
+        Graph.base_supply(0, 1, 2, 4),
+        Graph.lane(2, 0, 2, 2, 1, 3),
+    ]
+
+
+def test_update_unsupported():
+    """モデルの構造が変わる変更はエラーになることを確認"""
+    anOptimizer = make_Optimizer()
+    anOptimizer.set_constants(make_Graph_no_singular())
+    anOptimizer.set_decision_variables()
+    anOptimizer.set_objective_function()
+    anOptimizer.set_constraints()
+    with pytest.raises(ModelUpdateException):
+        anOptimizer.update([Graph.base(99, 0, 4, 0)])
+    with pytest.raises(ModelUpdateException):
+        anOptimizer.update([Graph.lane(2, 0, 2, 10, 1, 5)])
+
+
+@pytest.mark.cplex
+def test_rerun():
+    """差分更新して再度解いた結果が, 変更後の入力から作り直したモデルの結果と一致することを確認"""
+    anOptimizer = make_Optimizer()
+    _ = anOptimizer.run(make_Graph_no_singular(), Graph(), logger)
+    _ = anOptimizer.rerun(make_changes(), Graph(), logger)
+    assert str_opt() in anOptimizer.result_status
+
+    aGraph = make_Graph_no_singular()
+    for gc in make_changes():
+        if isinstance(gc, Base):
+            old = aGraph.search_base(gc.id_)
+        elif isinstance(gc, Lane):
+            old = aGraph.search_lane(gc.id_)
+        else:
+            (old,) = aGraph.base_supplies_same_base(gc.base_id)
+        aGraph.replace(old, gc)
+    expected = make_Optimizer()
+    _ = expected.run(aGraph, Graph(), logger)
+    assert math.isclose(
+        anOptimizer.solution.get_objective_value(),
+        expected.solution.get_objective_value()
+    )
+
+
 @pytest.mark.cplex
 def test_run():
     """コスト変化点が存在しない場合に最適解が出力されることを確認"""
@@ -82,3 +253,92 @@ def test_run_with_sigularity():
     test_instance = aGraph.search_flow_by_start(0, 2)
     test_sol = anOptimizer.solution.get_value(dct_var[test_instance])
     assert test_sol < test_instance.upper
+
+
+@pytest.mark.cplex
+def test_run_with_mip_start():
+    """書き込んだ最適化の結果を読み込み, 初期解として使用できることを確認
+
+    テスト項目:
+        * 読み込んだ結果から作成した初期解に, 前回の物量が設定されていること
+        * 初期解を与えても同じ目的関数値の最適解が出力されること
+    """
+    def make_Graph():
+        return make_CsvHandler().read_lane_singular_points(
+            make_Graph_no_singular()
+        )
+
+    anOptimizer = make_Optimizer()
+    sol_aGraph = anOptimizer.run(make_Graph(), Graph(), logger)
+    make_CsvHandler().write_opt_solution(sol_aGraph)
+    aGraph_mip_start = make_CsvHandler().read_opt_solution(Graph())
+    for name in ("sol_bases", "sol_base_supplies", "sol_lanes", "sol_flows"):
+        os.remove(f"{path_data}result/{name}.csv")
+
+    warm_started = make_Optimizer()
+    _ = warm_started.run(
+        make_Graph(), Graph(), logger, aGraph_mip_start=aGraph_mip_start
+    )
+    assert str_opt() in warm_started.result_status
+    assert math.isclose(
+        warm_started.solution.get_objective_value(),
+        anOptimizer.solution.get_objective_value()
+    )
+
+    mip_start = warm_started.make_mip_start(aGraph_mip_start)
+    dct_var = warm_started.var_quantity_flow_by_singular_point
+    for flow in sol_aGraph.flows():
+        test_flow = warm_started._aGraph.search_flow_by_start(
+            flow.lane_id, flow.start_singular_point
+        )
+        assert mip_start.get_value(dct_var[test_flow]) == flow.quantity
+
+
+@pytest.mark.cplex
+def test_result_flows():
+    """結果のグラフを作成せずに, 同じ物量が出力・書き込まれることを確認"""
+    anOptimizer = make_Optimizer()
+    sol_aGraph = anOptimizer.run(
+        make_CsvHandler().read_lane_singular_points(make_Graph_no_singular()),
+        Graph(), logger
+    )
+    assert set(anOptimizer.result_flows()) == sol_aGraph.flows()
+
+    aCsvHandler = make_CsvHandler()
+    aCsvHandler.write_opt_solution(sol_aGraph, anOptimizer.result_flows())
+    test_obj = aCsvHandler.read_opt_solution(Graph())
+    for name in ("sol_bases", "sol_base_supplies", "sol_lanes", "sol_flows"):
+        os.remove(f"{path_data}result/{name}.csv")
+    assert test_obj.flows() == sol_aGraph.flows()
+
+
+@pytest.mark.parametrize("solver, file_name", [
+    pytest.param("cplex", "model.lp.gz", marks=pytest.mark.cplex),
+    pytest.param("cplex", "model.mps", marks=pytest.mark.cplex),
+    ("highs", "model.lp"),
+    ("highs", "model.mps.gz"),
+])
+def test_export_and_import_model(tmp_path, solver, file_name):
+    """書き込んだモデルを読み込み, グラフから構築せずに同じ最適解が得られることを確認"""
+    if solver == "highs":
+        pytest.importorskip("highspy")
+    anOptimizeParameters = dataclasses.replace(
+        OptimizationParameters.import_(test_section), SOLVER=solver
+    )
+    anOptimizer = LogisticsPlanner(anOptimizeParameters)
+    _ = anOptimizer.run(
+        make_CsvHandler().read_lane_singular_points(make_Graph_no_singular()),
+        Graph(), logger
+    )
+    path_model = str(tmp_path / file_name)
+    anOptimizer.export_model(path_model)
+
+    imported = LogisticsPlanner(anOptimizeParameters)
+    imported.import_model(path_model)
+    assert imported.size_of_model() == anOptimizer.size_of_model()
+    imported.solve()
+    assert str_opt() in imported.result_status
+    assert math.isclose(
+        imported.solution.get_objective_value(),
+        anOptimizer.solution.get_objective_value()
+    )